@@ -0,0 +1,96 @@
+"""
+Benchmark batch fitting against fitting each dataset separately.
+
+For each fitting function, generate a batch of small random datasets with the same x
+values, fit them once by :func:`batch_fit` and once by calling :func:`fit` for each
+dataset. Report the throughput of both and the largest difference between the fitted
+parameters, relative to their errors.
+
+Run with ``python benchmarks/batch_fitting_benchmark.py``.
+"""
+import time
+import warnings
+
+import numpy as np
+from prettytable import PrettyTable
+
+from eddington import FittingData, batch_fit, exponential, fit, linear, normal, sin
+
+BATCH_SIZES = [100, 1000, 10000]
+SIGMA = 0.05
+CASES = [
+    (linear, np.arange(10, dtype=float), np.array([1, 2])),
+    (exponential, np.linspace(0, 3, 20), np.array([2, 0.7, 1])),
+    (normal, np.linspace(-4, 4, 30), np.array([3, 0.5, 1.2, 1])),
+    (sin, np.linspace(0, 10, 40), np.array([2, 1.3, 0.4, 1])),
+]
+
+
+def fit_loop(func, x, y):
+    """
+    Fit each dataset separately.
+
+    :param func: Fitting function
+    :param x: Shared x values
+    :param y: Y values of all datasets
+    :return: fitted parameters of all datasets
+    """
+    xerr, yerr = np.full(x.size, 1e-10), np.full(x.size, SIGMA)
+    return np.stack(
+        [
+            fit(FittingData(dict(x=x, xerr=xerr, y=y_values, yerr=yerr)), func).a
+            for y_values in y
+        ]
+    )
+
+
+def measure(method, *args):
+    """
+    Measure the wall time of a method.
+
+    :param method: Method to measure
+    :param args: Arguments of the method
+    :return: method result and wall time
+    """
+    start = time.perf_counter()
+    result = method(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    """Run benchmark."""
+    warnings.simplefilter("ignore")
+    generator = np.random.default_rng(0)
+    table = PrettyTable(
+        [
+            "Function",
+            "Batch size",
+            "Fits/s (batch)",
+            "Fits/s (loop)",
+            "Speedup",
+            "Max difference [errors]",
+        ]
+    )
+    for func, x, a in CASES:
+        for batch_size in BATCH_SIZES:
+            y = func(a, x) + generator.normal(scale=SIGMA, size=(batch_size, x.size))
+            batch_result, batch_time = measure(
+                lambda y: batch_fit(func, x, y, yerr=SIGMA), y
+            )
+            loop_a, loop_time = measure(lambda y: fit_loop(func, x, y), y)
+            difference = np.max(np.abs(batch_result.a - loop_a) / batch_result.aerr)
+            table.add_row(
+                [
+                    func.name,
+                    batch_size,
+                    f"{batch_size / batch_time:.0f}",
+                    f"{batch_size / loop_time:.0f}",
+                    f"{loop_time / batch_time:.1f}",
+                    f"{difference:.1e}",
+                ]
+            )
+    print(table)
+
+
+if __name__ == "__main__":
+    main()
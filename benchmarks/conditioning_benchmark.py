@@ -0,0 +1,100 @@
+"""
+Benchmark conditioning of badly scaled data.
+
+For functions which support conditioning, fit data whose x values are far from zero
+or whose y values are tiny, once as is and once with ``condition=True``, starting
+from the default initial guess. Report the number of ODR iterations, whether the fit
+converged, the reduced chi squared and the largest pull of the parameters, which is
+the distance of a fitted parameter from the actual one in units of its error. A fit
+with a reliable covariance has pulls of a few units at most.
+
+Run with ``python benchmarks/conditioning_benchmark.py``.
+"""
+import warnings
+
+import numpy as np
+from prettytable import PrettyTable
+
+from eddington import (
+    FittingData,
+    exponential,
+    fit,
+    inverse_power,
+    linear,
+    polynomial,
+    straight_power,
+)
+
+RECORDS = 200
+RELATIVE_SIGMA = 0.01
+CASES = [
+    ("x around 1e6, y around 1e-9", linear, [1e-9, 1e-15], (1e6, 1e6 + 1e3)),
+    (
+        "x around 1e4",
+        polynomial(3),
+        np.array([1, -2, 3, -4]) / np.power(1e4, np.arange(4)),
+        (1e4, 1.1e4),
+    ),
+    (
+        "x around 1e4",
+        polynomial(6),
+        np.array([1, -2, 3, -4, 5, -6, 7]) / np.power(1e4, np.arange(7)),
+        (1e4, 1.1e4),
+    ),
+    ("x around 1e4, y around 1e-7", exponential, [2e-9, 3e-4, 1e-9], (1e4, 1.5e4)),
+    ("y around 1e-9", straight_power, [1e-9, 0.5, 1.5, 1e-10], (1, 10)),
+    ("y around 1e-9", inverse_power, [1e-9, 0.5, 2, 1e-10], (1, 10)),
+]
+
+
+def main():
+    """Run benchmark."""
+    warnings.simplefilter("ignore")
+    generator = np.random.default_rng(0)
+    table = PrettyTable(
+        [
+            "Function",
+            "Data",
+            "Conditioned",
+            "Iterations",
+            "Converged",
+            "Reduced chi2",
+            "Largest pull",
+        ]
+    )
+    for description, func, a, (x_min, x_max) in CASES:
+        a = np.asarray(a, dtype=float)
+        x = np.linspace(x_min, x_max, RECORDS)
+        y = func(a, x)
+        sigma = RELATIVE_SIGMA * np.std(y)
+        data = FittingData(
+            dict(
+                x=x,
+                y=y + generator.normal(scale=sigma, size=RECORDS),
+                yerr=np.full(RECORDS, sigma),
+            ),
+            x_column="x",
+            y_column="y",
+            yerr_column="yerr",
+            search=False,
+        )
+        for condition in [False, True]:
+            result = fit(data, func, condition=condition)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                pull = np.max(np.abs(result.a - a) / result.aerr)
+            table.add_row(
+                [
+                    func.name,
+                    description,
+                    "yes" if condition else "no",
+                    result.diagnostics.iterations,
+                    "yes" if result.diagnostics.converged else "no",
+                    f"{result.chi2_reduced:.3g}",
+                    f"{pull:.3g}",
+                ]
+            )
+    print(table)
+
+
+if __name__ == "__main__":
+    main()
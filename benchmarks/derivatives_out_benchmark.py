@@ -0,0 +1,150 @@
+"""
+Benchmark writing the a derivatives of fitting functions into an out array.
+
+For several out-of-the-box fitting functions, evaluate the a derivative as ODR does in
+each iteration:
+
+* As it was evaluated before, stacking a temporary array for each parameter.
+* Allocating a new array for the derivative.
+* Writing into an out array which is reused in each iteration.
+
+Report the peak memory traced by *tracemalloc* during a single evaluation, in units of
+the size of the x values, and the mean wall time.
+
+Run with ``python benchmarks/derivatives_out_benchmark.py``.
+"""
+import functools
+import time
+import tracemalloc
+
+import numpy as np
+from prettytable import PrettyTable
+
+from eddington import (
+    cos,
+    exponential,
+    hyperbolic,
+    inverse_power,
+    normal,
+    polynomial,
+    straight_power,
+)
+
+RECORDS = 10**5
+REPETITIONS = 20
+CASES = [
+    (
+        exponential,
+        np.array([2, 0.5, 1]),
+        lambda a, x: np.stack(
+            [np.exp(a[1] * x), a[0] * x * np.exp(a[1] * x), np.ones(np.shape(x))]
+        ),
+    ),
+    (
+        cos,
+        np.array([2, 1.5, 0.3, 0.5]),
+        lambda a, x: np.stack(
+            [
+                np.cos(a[1] * x + a[2]),
+                -a[0] * x * np.sin(a[1] * x + a[2]),
+                -a[0] * np.sin(a[1] * x + a[2]),
+                np.ones(shape=np.shape(x)),
+            ]
+        ),
+    ),
+    (
+        straight_power,
+        np.array([2, 0.5, 1.5, 1]),
+        lambda a, x: np.stack(
+            [
+                np.power(x + a[1], a[2]),
+                a[2] * a[0] * np.power(x + a[1], a[2] - 1),
+                a[0] * np.log(x + a[1]) * np.power(x + a[1], a[2]),
+                np.ones(shape=np.shape(x)),
+            ]
+        ),
+    ),
+    (
+        inverse_power,
+        np.array([2, 0.5, 1.5, 1]),
+        lambda a, x: np.stack(
+            [
+                1 / np.power(x + a[1], a[2]),
+                -a[2] * a[0] / np.power(x + a[1], a[2] + 1),
+                -a[0] * np.log(x + a[1]) / np.power(x + a[1], a[2]),
+                np.ones(shape=np.shape(x)),
+            ]
+        ),
+    ),
+    (
+        hyperbolic,
+        np.array([2, 0.5, 1]),
+        lambda a, x: np.stack(
+            [1 / (x + a[1]), -a[0] / ((x + a[1]) ** 2), np.ones(shape=np.shape(x))]
+        ),
+    ),
+    (
+        normal,
+        np.array([2, 5, 1.5, 1]),
+        lambda a, x: np.stack(
+            [
+                np.exp(-(((x - a[1]) / a[2]) ** 2)),
+                a[0]
+                * np.exp(-(((x - a[1]) / a[2]) ** 2))
+                * (2 * (x - a[1]) / (a[2] ** 2)),
+                a[0]
+                * np.exp(-(((x - a[1]) / a[2]) ** 2))
+                * (2 * (x - a[1]) ** 2 / (a[2] ** 3)),
+                np.ones(shape=np.shape(x)),
+            ]
+        ),
+    ),
+    (
+        polynomial(5),
+        np.array([1, 2, 3, 4, 5, 6]),
+        lambda a, x: np.stack([x**i for i in range(6)]),
+    ),
+]
+
+
+def measure(derivative, a, x):
+    """
+    Measure the peak memory and mean wall time of evaluating a derivative.
+
+    :param derivative: Callable evaluating the derivative
+    :param a: Parameters
+    :param x: X values
+    :return: peak memory in units of the size of x, and mean wall time
+    """
+    derivative(a, x)
+    tracemalloc.start()
+    derivative(a, x)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for _ in range(REPETITIONS):
+        derivative(a, x)
+    return peak / x.nbytes, (time.perf_counter() - start) / REPETITIONS
+
+
+def main():
+    """Run benchmark."""
+    x = np.linspace(1, 10, RECORDS)
+    table = PrettyTable(["Function", "Evaluation", "Peak [x arrays]", "Time [ms]"])
+    for func, a, stacked_derivative in CASES:
+        out = np.empty((func.n, RECORDS))
+        evaluations = [
+            ("Stacked", stacked_derivative),
+            ("Allocated", func.a_derivative),
+            ("Out array", functools.partial(func.a_derivative, out=out)),
+        ]
+        for evaluation, derivative in evaluations:
+            peak, mean_time = measure(derivative, a, x)
+            table.add_row(
+                [func.name, evaluation, f"{peak:.1f}", f"{mean_time * 1e3:.2f}"]
+            )
+    print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark the fitting engines against each other.
+
+For every function in the :class:`FittingFunctionsRegistry` and several numbers of
+records, fit random data with exact x values using each engine which supports the
+function, starting from the actual parameters so that the initial guess is not part of
+the measurement. Report the mean wall time of a fit, the number of function evaluations,
+whether the fit converged and the excess of its chi squared over the lowest chi squared
+reached by any engine.
+
+Run with ``python benchmarks/fitting_engines_benchmark.py``.
+"""
+import time
+import warnings
+
+import numpy as np
+from prettytable import PrettyTable
+
+from eddington import (
+    EddingtonException,
+    FittingFunctionsRegistry,
+    IncrementalLinearFit,
+    fit,
+    random_data,
+)
+
+RECORDS = [100, 1000, 10000]
+REPETITIONS = 5
+ENGINES = ["odr", "least_squares", "linear"]
+
+
+def run_engine(data, func, a0, engine):  # pylint: disable=invalid-name
+    """
+    Fit the data repeatedly with a single engine.
+
+    :param data: Fitting data
+    :param func: Fitting function
+    :param a0: Initial parameters
+    :param engine: Name of the engine
+    :return: mean wall time and the fitting result, or None if the fit failed
+    """
+    start = time.perf_counter()
+    try:
+        for _ in range(REPETITIONS):
+            result = fit(data, func, a0=a0, engine=engine)
+    except (EddingtonException, ArithmeticError, ValueError):
+        return None
+    return (time.perf_counter() - start) / REPETITIONS, result
+
+
+def main():
+    """Run benchmark."""
+    warnings.simplefilter("ignore")
+    np.random.seed(0)
+    table = PrettyTable(
+        [
+            "Function",
+            "Records",
+            "Engine",
+            "Time [ms]",
+            "Evaluations",
+            "Converged",
+            "Chi2 excess",
+        ]
+    )
+    for func in FittingFunctionsRegistry.all():
+        engines = [
+            engine
+            for engine in ENGINES
+            if engine != "linear" or IncrementalLinearFit.is_linear(func)
+        ]
+        for records in RECORDS:
+            a = np.random.uniform(1, 5, size=func.n)
+            x = np.random.uniform(1, 10, size=records)
+            data = random_data(func, x=x, a=a, xerr_column=None)
+            runs = {engine: run_engine(data, func, a, engine) for engine in engines}
+            best_chi2 = np.nanmin(
+                [run[1].chi2 for run in runs.values() if run is not None]
+            )
+            for engine, run in runs.items():
+                if run is None:
+                    table.add_row([func.name, records, engine, "-", "-", "failed", "-"])
+                    continue
+                mean_time, result = run
+                table.add_row(
+                    [
+                        func.name,
+                        records,
+                        engine,
+                        f"{mean_time * 1e3:.3f}",
+                        result.diagnostics.function_evaluations,
+                        "yes" if result.diagnostics.converged else "no",
+                        f"{result.chi2 / best_chi2 - 1:.1e}",
+                    ]
+                )
+    print(table)
+
+
+if __name__ == "__main__":
+    main()
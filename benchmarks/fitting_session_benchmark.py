@@ -0,0 +1,98 @@
+"""
+Benchmark refitting after toggling a single record.
+
+For each number of records, unselect records one by one and refit, once through a
+:class:`FittingSession` and once by calling :func:`fit` on the data. Report the mean
+time of a toggle for both.
+
+Run with ``python benchmarks/fitting_session_benchmark.py``.
+"""
+import time
+import warnings
+
+import numpy as np
+from prettytable import PrettyTable
+
+from eddington import FittingData, FittingSession, exponential, fit, polynomial
+
+RECORDS = [100, 1000, 10000]
+TOGGLES = 50
+SIGMA = 0.1
+CASES = [(polynomial(2), np.array([1, 2, -0.5])), (exponential, np.array([2, 0.7, 1]))]
+
+
+def build_data(func, a, records, generator):
+    """
+    Build fitting data with exact x values.
+
+    :param func: Fitting function
+    :param a: Actual parameters
+    :param records: Number of records
+    :param generator: Random generator
+    :return: fitting data
+    """
+    x = np.linspace(0, 3, records)
+    y = func(a, x) + generator.normal(scale=SIGMA, size=records)
+    return FittingData(
+        dict(x=x, y=y, yerr=np.full(records, SIGMA)),
+        x_column="x",
+        y_column="y",
+        yerr_column="yerr",
+        search=False,
+    )
+
+
+def toggle_time(data, toggle):
+    """
+    Measure the mean time of unselecting a record and refitting.
+
+    :param data: Fitting data
+    :param toggle: Method which unselects a record and refits
+    :return: mean wall time of a toggle
+    """
+    start = time.perf_counter()
+    for index in range(1, TOGGLES + 1):
+        toggle(index)
+    elapsed = time.perf_counter() - start
+    data.select_all_records()
+    return elapsed / TOGGLES
+
+
+def main():
+    """Run benchmark."""
+    warnings.simplefilter("ignore")
+    generator = np.random.default_rng(0)
+    table = PrettyTable(
+        ["Function", "Records", "Mode", "Session [ms]", "Full fit [ms]", "Speedup"]
+    )
+    for func, a in CASES:
+        for records in RECORDS:
+            data = build_data(func, a, records, generator)
+
+            def full_refit(index, data=data, func=func):
+                data.unselect_record(index)
+                return fit(data, func)
+
+            full_time = toggle_time(data, full_refit)
+            session = FittingSession(data, func)
+
+            def session_refit(index, session=session):
+                session.unselect_record(index)
+                return session.result
+
+            session_time = toggle_time(data, session_refit)
+            table.add_row(
+                [
+                    func.name,
+                    records,
+                    "linear" if session.linear else "warm start",
+                    f"{session_time * 1e3:.3f}",
+                    f"{full_time * 1e3:.3f}",
+                    f"{full_time / session_time:.1f}",
+                ]
+            )
+    print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark the initial guess estimators against the default initial guess.
+
+For each fitting function with an initial guess estimator, fit random data once with
+the estimated initial guess and once with the default initial guess (all ones).
+Report the number of function evaluations, wall time and the rate of fits which
+converged to a reasonable reduced chi squared.
+
+Run with ``python benchmarks/initial_guess_benchmark.py``.
+"""
+import time
+import warnings
+
+import numpy as np
+from prettytable import PrettyTable
+
+from eddington import (
+    FittingFunction,
+    cos,
+    exponential,
+    fit,
+    hyperbolic,
+    inverse_power,
+    normal,
+    poisson,
+    random_data,
+    sin,
+    straight_power,
+)
+
+REPETITIONS = 100
+CONVERGENCE_THRESHOLD = 3
+CASES = [
+    (exponential, np.linspace(0, 5, 30), [(1, 5), (-1, 1), (-5, 5)]),
+    (normal, np.linspace(-6, 6, 30), [(2, 10), (-2, 2), (0.5, 2), (-3, 3)]),
+    (poisson, np.arange(15, dtype=float), [(20, 100), (2, 8), (-1, 1)]),
+    (straight_power, np.linspace(0, 10, 30), [(1, 3), (0, 2), (1.5, 3), (-5, 5)]),
+    (inverse_power, np.linspace(0, 10, 30), [(5, 20), (0.5, 2), (1, 3), (-1, 1)]),
+    (hyperbolic, np.linspace(0, 10, 30), [(5, 20), (0.5, 2), (-3, 3)]),
+    (sin, np.linspace(0, 10, 60), [(1, 5), (0.5, 5), (-3, 3), (-3, 3)]),
+    (cos, np.sort(np.random.uniform(0, 10, 60)), [(1, 5), (0.5, 5), (-3, 3), (-3, 3)]),
+]
+
+
+def counting_function(func, counter):
+    """
+    Wrap fitting function so that every evaluation is counted.
+
+    :param func: Fitting function to wrap
+    :param counter: Single item list to count evaluations in
+    :return: counting fitting function
+    """
+
+    def counted_fit_func(a, x):
+        counter[0] += 1
+        return func.fit_func(a, x)
+
+    return FittingFunction(
+        fit_func=counted_fit_func,
+        n=func.n,
+        name=func.name,
+        initial_guess=func.initial_guess,
+        save=False,
+    )
+
+
+def measure(func, data, a0):
+    """
+    Fit data and measure its cost.
+
+    :param func: Fitting function
+    :param data: Data to fit
+    :param a0: Initial guess. If None, use the initial guess estimator
+    :return: evaluations, wall time and whether the fit converged
+    """
+    counter = [0]
+    start = time.perf_counter()
+    result = fit(data, counting_function(func, counter), a0=a0)
+    duration = time.perf_counter() - start
+    return counter[0], duration, result.chi2_reduced < CONVERGENCE_THRESHOLD
+
+
+def main():
+    """Run benchmark."""
+    warnings.simplefilter("ignore")
+    np.random.seed(0)
+    table = PrettyTable(
+        [
+            "Function",
+            "Evaluations (guess)",
+            "Evaluations (default)",
+            "Time [ms] (guess)",
+            "Time [ms] (default)",
+            "Converged (guess)",
+            "Converged (default)",
+        ]
+    )
+    for func, x, bounds in CASES:
+        guess_measurements, default_measurements = [], []
+        for _ in range(REPETITIONS):
+            a = np.array([np.random.uniform(*bound) for bound in bounds])
+            data = random_data(func, x=x, a=a, xsigma=0.01, ysigma=0.05)
+            guess_measurements.append(measure(func, data, a0=None))
+            default_measurements.append(measure(func, data, a0=np.ones(func.n)))
+        guess, default = np.mean(guess_measurements, axis=0), np.mean(
+            default_measurements, axis=0
+        )
+        table.add_row(
+            [
+                func.name,
+                f"{guess[0]:.1f}",
+                f"{default[0]:.1f}",
+                f"{guess[1] * 1e3:.2f}",
+                f"{default[1] * 1e3:.2f}",
+                f"{guess[2]:.0%}",
+                f"{default[2]:.0%}",
+            ]
+        )
+    print(table)
+
+
+if __name__ == "__main__":
+    main()
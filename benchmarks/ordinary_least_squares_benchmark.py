@@ -0,0 +1,169 @@
+"""
+Benchmark fitting data without x errors by ordinary least squares.
+
+When the data has no x errors and ``exact_x=True`` is passed, :func:`fit` runs ODR in
+ordinary least squares mode instead of solving for x deltas as well. For each
+integration test case, with its x errors removed, and for random data of growing
+sizes, run ODR once in full orthogonal distance regression mode, as :func:`fit` does
+by default, and once in ordinary least squares mode. Report the wall times, the
+speedup and the largest relative difference of the parameters of both modes, and of
+:func:`fit`, from *scipy*'s ``curve_fit``, which solves the least squares problem.
+
+Run with ``python benchmarks/ordinary_least_squares_benchmark.py``.
+"""
+import json
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+from prettytable import PrettyTable
+from scipy.odr import ODR, Model, RealData
+from scipy.optimize import curve_fit
+
+from eddington import (
+    FittingData,
+    FittingFunctionsRegistry,
+    exponential,
+    fit,
+    polynomial,
+)
+
+CASES_DIRECTORY = (
+    Path(__file__).parent.parent / "integration_tests" / "resources" / "cases"
+)
+RECORDS = [100, 1000, 10000, 100000]
+REPETITIONS = 20
+SIGMA = 0.1
+RANDOM_CASES = [
+    (polynomial(3), np.array([1, 2, -0.5, 0.1])),
+    (exponential, np.array([2, 0.7, 1])),
+]
+
+
+def integration_cases():
+    """
+    Load the integration test cases without their x errors.
+
+    :return: list of case name, fitting function, x, y, y errors and initial guess
+    """
+    cases = []
+    for case_path in sorted(CASES_DIRECTORY.glob("*.json")):
+        with open(case_path, mode="r", encoding="utf-8") as json_file:
+            json_obj = json.load(json_file)
+        if "fix" in json_obj:
+            continue
+        data = json_obj["data"]
+        cases.append(
+            (
+                case_path.stem,
+                FittingFunctionsRegistry.load(json_obj["fit_function"]),
+                np.array(data["x"], dtype=float),
+                np.array(data["y"], dtype=float),
+                None if "yerr" not in data else np.array(data["yerr"], dtype=float),
+                json_obj.get("a0", None),
+            )
+        )
+    return cases
+
+
+def random_cases(generator):
+    """
+    Build random data with exact x values.
+
+    :param generator: Random generator
+    :return: list of case name, fitting function, x, y, y errors and initial guess
+    """
+    cases = []
+    for func, a in RANDOM_CASES:
+        for records in RECORDS:
+            x = np.linspace(0, 3, records)
+            y = func(a, x) + generator.normal(scale=SIGMA, size=records)
+            cases.append(
+                (func.name, func, x, y, np.full(records, SIGMA), np.ones(func.n))
+            )
+    return cases
+
+
+def mean_time(method):
+    """
+    Measure the mean wall time of a method.
+
+    :param method: Method to measure
+    :return: mean wall time and the last returned value
+    """
+    start = time.perf_counter()
+    for _ in range(REPETITIONS):
+        value = method()
+    return (time.perf_counter() - start) / REPETITIONS, value
+
+
+def relative_difference(actual, expected):
+    """
+    Format the largest relative difference of parameters.
+
+    :param actual: Actual parameters
+    :param expected: Expected parameters
+    :return: formatted relative difference
+    """
+    return f"{np.max(np.abs(actual / expected - 1)):.1e}"
+
+
+def main():
+    """Run benchmark."""
+    warnings.simplefilter("ignore")
+    table = PrettyTable(
+        [
+            "Case",
+            "Records",
+            "ODR [ms]",
+            "OLS [ms]",
+            "Speedup",
+            "ODR vs curve_fit",
+            "OLS vs curve_fit",
+            "fit vs curve_fit",
+        ]
+    )
+    for name, func, x, y, yerr, a0 in integration_cases() + random_cases(
+        np.random.default_rng(0)
+    ):
+        data = FittingData(
+            dict(x=x, y=y, yerr=np.ones_like(y) if yerr is None else yerr),
+            x_column="x",
+            y_column="y",
+            yerr_column="yerr",
+            search=False,
+        )
+        result = fit(data, func, a0=a0, exact_x=True)
+
+        def run_odr(fit_type, data=data, func=func, a0=result.a0):
+            odr = ODR(RealData(x=data.x, y=data.y, sy=data.yerr), Model(func), beta0=a0)
+            odr.set_job(fit_type=fit_type)
+            return odr.run()
+
+        odr_time, odr_output = mean_time(lambda: run_odr(fit_type=0))
+        ols_time, ols_output = mean_time(lambda: run_odr(fit_type=2))
+        expected_a, _ = curve_fit(
+            lambda x, *a: func(np.array(a), x),
+            data.x,
+            data.y,
+            p0=result.a,
+            sigma=data.yerr,
+        )
+        table.add_row(
+            [
+                name,
+                len(x),
+                f"{odr_time * 1e3:.3f}",
+                f"{ols_time * 1e3:.3f}",
+                f"{odr_time / ols_time:.1f}",
+                relative_difference(odr_output.beta, expected_a),
+                relative_difference(ols_output.beta, expected_a),
+                relative_difference(result.a, expected_a),
+            ]
+        )
+    print(table)
+
+
+if __name__ == "__main__":
+    main()
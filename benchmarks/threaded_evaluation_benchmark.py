@@ -0,0 +1,70 @@
+"""
+Benchmark evaluating fitting functions in a pool of threads.
+
+For several out-of-the-box fitting functions and growing numbers of x values, evaluate
+the function and its a derivative, as ODR does in each iteration, with a growing
+number of threads. Report the mean wall time and the speedup over evaluating in the
+calling thread. The speedup is bounded by the number of cores, which is printed as
+well.
+
+Run with ``python benchmarks/threaded_evaluation_benchmark.py``.
+"""
+import os
+import time
+
+import numpy as np
+from prettytable import PrettyTable
+
+from eddington import exponential, sin, straight_power
+
+RECORDS = [10**5, 10**6, 10**7]
+THREADS = sorted({1, 2, 4, 8, os.cpu_count() or 1})
+REPETITIONS = 5
+CASES = [
+    (exponential, np.array([2, 0.5, 1])),
+    (sin, np.array([2, 1.5, 0.3, 0.5])),
+    (straight_power, np.array([2, 0.5, 1.5, 1])),
+]
+
+
+def mean_time(func, a, x):
+    """
+    Measure the mean wall time of evaluating a function and its a derivative.
+
+    :param func: Fitting function
+    :param a: Parameters
+    :param x: X values
+    :return: mean wall time
+    """
+    start = time.perf_counter()
+    for _ in range(REPETITIONS):
+        func(a, x)
+        func.a_derivative(a, x)
+    return (time.perf_counter() - start) / REPETITIONS
+
+
+def main():
+    """Run benchmark."""
+    print(f"Cores: {os.cpu_count()}")
+    table = PrettyTable(["Function", "Records", "Threads", "Time [ms]", "Speedup"])
+    for func, a in CASES:
+        for records in RECORDS:
+            x = np.linspace(1, 10, records)
+            serial_time = mean_time(func.set_threads(None), a, x)
+            for threads in THREADS:
+                threads_time = mean_time(func.set_threads(threads), a, x)
+                table.add_row(
+                    [
+                        func.name,
+                        records,
+                        threads,
+                        f"{threads_time * 1e3:.1f}",
+                        f"{serial_time / threads_time:.2f}",
+                    ]
+                )
+        func.set_threads(None)
+    print(table)
+
+
+if __name__ == "__main__":
+    main()
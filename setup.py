@@ -15,7 +15,11 @@
     "types-mock >= 4.0.15",
 ]
 
+extras_require = {"parquet": ["pyarrow >= 9.0.0"]}
+
 if os.environ.get("READTHEDOCS") == "True":
     install_requires = install_requires[:3]
 
-setup(version=version, install_requires=install_requires)
+setup(
+    version=version, install_requires=install_requires, extras_require=extras_require
+)
@@ -1,4 +1,10 @@
 """Core functionalities of the Eddington platform."""
+from eddington.batch_fitting import BatchFittingResult, batch_fit
+from eddington.bootstrap import BootstrapResult, bootstrap
+from eddington.chunked_fitting import chunked_fit
+from eddington.covariance import BandedCovariance, DenseCovariance, LowRankCovariance
+from eddington.cross_validation import CrossValidationResult, cross_validate
+from eddington.evaluation_cache import EvaluationCache
 from eddington.exceptions import (
     EddingtonException,
     FittingDataColumnExistenceError,
@@ -28,7 +34,19 @@
     straight_power,
 )
 from eddington.fitting_functions_registry import FittingFunctionsRegistry
-from eddington.fitting_result import FittingResult
+from eddington.fitting_result import FittingDiagnostics, FittingResult
+from eddington.fitting_session import FittingSession
+from eddington.global_fitting import GlobalFitResult, global_fit
+from eddington.incremental_fitting import IncrementalLinearFit
+from eddington.influence import InfluenceResult, influence
+from eddington.model_selection import FitAllResult, fit_all
+from eddington.multistart import MultistartResult, multistart_fit
+from eddington.parameter_scan import (
+    Chi2ScanResult,
+    ProfileLikelihoodResult,
+    chi2_scan,
+    profile_likelihood,
+)
 from eddington.plot.figure_builder import FigureBuilder
 from eddington.plot.plot_legacy import (
     add_errorbar,
@@ -46,6 +64,7 @@
 from eddington.plot.plot_util import build_repr_string, show_or_export
 from eddington.print_util import to_relevant_precision_string
 from eddington.random_util import random_data
+from eddington.sigma_clipping import ClippedFittingResult, SigmaClip
 
 __version__ = "0.0.24.dev2"
 
@@ -55,6 +74,7 @@
     "FittingFunction",
     "fitting_function",
     "FittingFunctionsRegistry",
+    "EvaluationCache",
     # Fitting functions
     "constant",
     "exponential",
@@ -70,6 +90,19 @@
     "poisson",
     # Fitting algorithm
     "fit",
+    "SigmaClip",
+    "IncrementalLinearFit",
+    "chunked_fit",
+    "FittingSession",
+    "multistart_fit",
+    "fit_all",
+    "cross_validate",
+    "bootstrap",
+    "batch_fit",
+    "chi2_scan",
+    "profile_likelihood",
+    "global_fit",
+    "influence",
     # Exceptions
     "EddingtonException",
     "FittingFunctionRuntimeError",
@@ -83,6 +116,20 @@
     # Data structures
     "FittingData",
     "FittingResult",
+    "FittingDiagnostics",
+    "MultistartResult",
+    "FitAllResult",
+    "CrossValidationResult",
+    "BootstrapResult",
+    "BatchFittingResult",
+    "Chi2ScanResult",
+    "ProfileLikelihoodResult",
+    "GlobalFitResult",
+    "InfluenceResult",
+    "ClippedFittingResult",
+    "DenseCovariance",
+    "BandedCovariance",
+    "LowRankCovariance",
     # Plot
     "FigureBuilder",
     "show_or_export",
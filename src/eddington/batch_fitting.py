@@ -0,0 +1,252 @@
+"""Vectorized fitting of many datasets of the same shape at once."""
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import numpy as np
+
+from eddington.exceptions import FittingError
+from eddington.fitting_function_class import FittingFunction
+from eddington.fitting_result import FittingResult
+
+DEFAULT_MAX_ITERATIONS = 100
+DEFAULT_TOLERANCE = 1e-10
+INITIAL_DAMPING = 1e-3
+DAMPING_FACTOR = 10.0
+MAX_DAMPING = 1e16
+MIN_CURVATURE = 1e-12
+
+
+@dataclass(repr=False)
+class BatchFittingResult:  # pylint: disable=too-many-instance-attributes
+    """
+    Result of fitting a batch of datasets.
+
+    Each array has the batch as its first axis.
+
+    :param a0: Initial guesses of the datasets, of shape (batch, parameters).
+    :type a0: np.ndarray
+    :param a: Fitted parameters of the datasets, of shape (batch, parameters).
+    :type a: np.ndarray
+    :param aerr: Estimated errors of a, of shape (batch, parameters).
+    :type aerr: np.ndarray
+    :param acov: Covariance matrices of a, of shape (batch, parameters, parameters).
+    :type acov: np.ndarray
+    :param degrees_of_freedom: How many degrees of freedom each fit has.
+    :type degrees_of_freedom: int
+    :param chi2: Chi squared of the datasets, of shape (batch,).
+    :type chi2: np.ndarray
+    :param converged: Whether the fit of each dataset converged, of shape (batch,).
+    :type converged: np.ndarray
+    :param iterations: Number of iterations of each dataset, of shape (batch,).
+    :type iterations: np.ndarray
+    """
+
+    a0: np.ndarray  # pylint: disable=invalid-name
+    a: np.ndarray
+    aerr: np.ndarray
+    acov: np.ndarray
+    degrees_of_freedom: int
+    chi2: np.ndarray
+    converged: np.ndarray
+    iterations: np.ndarray
+
+    @property
+    def chi2_reduced(self) -> np.ndarray:
+        """
+        Reduced chi squared of the datasets.
+
+        :return: reduced chi squared of shape (batch,)
+        :rtype: np.ndarray
+        """
+        return self.chi2 / self.degrees_of_freedom
+
+    def __len__(self) -> int:
+        """
+        Number of datasets in the batch.
+
+        :return: batch size
+        :rtype: int
+        """
+        return len(self.a)
+
+    def __getitem__(self, index: int) -> FittingResult:
+        """
+        Fitting result of a single dataset.
+
+        :param index: Index of the dataset in the batch
+        :type index: int
+        :return: fitting result of the dataset
+        :rtype: FittingResult
+        """
+        return FittingResult(
+            a0=self.a0[index],
+            a=self.a[index],
+            aerr=self.aerr[index],
+            acov=self.acov[index],
+            degrees_of_freedom=self.degrees_of_freedom,
+            chi2=self.chi2[index],
+        )
+
+    @property
+    def pretty_string(self) -> str:
+        """
+        Pretty representation string.
+
+        :return: self representing pretty string
+        :rtype: str
+        """
+        return (
+            f"Batch of {len(self)} fits: {np.count_nonzero(self.converged)} "
+            f"converged, median chi2 reduced {np.median(self.chi2_reduced):.4g}\n"
+        )
+
+    def __repr__(self) -> str:
+        """
+        Representation string.
+
+        :return: self representing pretty string
+        :rtype: str
+        """
+        return self.pretty_string
+
+
+def batch_fit(  # pylint: disable=invalid-name,too-many-arguments,too-many-locals
+    func: FittingFunction,
+    x: np.ndarray,
+    y: np.ndarray,
+    yerr: Optional[Union[np.ndarray, float]] = None,
+    a0: Optional[np.ndarray] = None,
+    max_iterations: int = DEFAULT_MAX_ITERATIONS,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> BatchFittingResult:
+    """
+    Fit many datasets with the same number of records at once.
+
+    The datasets are stacked into arrays of shape (batch, records) and fitted together
+    by a Levenberg-Marquardt least squares algorithm written in pure NumPy. The
+    function and its a derivative are evaluated on the whole batch at once by
+    :meth:`FittingFunction.evaluate_batch` and
+    :meth:`FittingFunction.a_derivative_batch`, and the linear systems of all the
+    datasets are solved together. Datasets which converged are dropped from the
+    following iterations.
+
+    Unlike :func:`fit`, the x values are assumed to be exact. Hence, the result is
+    comparable to fitting data without x errors by ordinary least squares.
+
+    :param func: a function to fit the data according to. Should have an a
+        derivative.
+    :type func: FittingFunction
+    :param x: X values, of shape (records,) shared by all datasets, or of shape
+        (batch, records).
+    :type x: np.ndarray
+    :param y: Y values, of shape (batch, records).
+    :type y: np.ndarray
+    :param yerr: Optional. Y errors, broadcastable to the shape of y. If None, all
+        records have the same weight.
+    :type yerr: np.ndarray or float
+    :param a0: Optional. Initial guess, of shape (parameters,) shared by all datasets,
+        or of shape (batch, parameters). If None, use the initial guess estimator of
+        the fitting function for each dataset, if it has one.
+    :type a0: np.ndarray
+    :param max_iterations: Maximum number of iterations for each dataset.
+    :type max_iterations: int
+    :param tolerance: Relative tolerance of chi squared and of the parameters for
+        convergence.
+    :type tolerance: float
+    :return: fitting results of all datasets
+    :rtype: BatchFittingResult
+    :raises FittingError: Raised when the function has no a derivative.
+    """
+    if func.a_derivative is None:
+        raise FittingError(f'Cannot batch fit "{func.name}" without an a derivative')
+    y = np.atleast_2d(np.asarray(y, dtype=float))
+    batch_size = y.shape[0]
+    x = np.broadcast_to(np.asarray(x, dtype=float), y.shape)
+    weights = np.broadcast_to(
+        1.0 if yerr is None else 1 / np.asarray(yerr, dtype=float), y.shape
+    )
+    a0 = _batch_a0(func, x, y, a0)
+    a = a0.copy()
+    # The Jacobian of each iteration is evaluated for the parameters of the residuals
+    # of the previous one, so intermediate values are shared through a cache.
+    with func.evaluation_cache():
+        residuals = (y - func.evaluate_batch(a, x)) * weights
+        chi2 = np.sum(residuals**2, axis=1)
+        damping = np.full(batch_size, INITIAL_DAMPING)
+        converged = np.zeros(batch_size, dtype=bool)
+        iterations = np.zeros(batch_size, dtype=int)
+        active = np.arange(batch_size)
+        for _ in range(max_iterations):
+            if active.size == 0:
+                break
+            jacobian = _jacobian(func, a[active], x[active]) * weights[active, :, None]
+            hessian = np.einsum("bki,bkj->bij", jacobian, jacobian)
+            gradient = np.einsum("bki,bk->bi", jacobian, residuals[active])
+            curvature = np.maximum(
+                np.diagonal(hessian, axis1=1, axis2=2), MIN_CURVATURE
+            )
+            system = hessian + damping[active, None, None] * _diagonal_matrices(
+                curvature
+            )
+            step = np.linalg.solve(system, gradient[..., None])[..., 0]
+            new_a = a[active] + step
+            new_residuals = (
+                y[active] - func.evaluate_batch(new_a, x[active])
+            ) * weights[active]
+            new_chi2 = np.sum(new_residuals**2, axis=1)
+            improved = np.isfinite(new_chi2) & (new_chi2 <= chi2[active])
+            decrease = chi2[active] - new_chi2
+            small_step = np.linalg.norm(step, axis=1) <= tolerance * (
+                np.linalg.norm(a[active], axis=1) + tolerance
+            )
+            accepted = active[improved]
+            a[accepted] = new_a[improved]
+            residuals[accepted] = new_residuals[improved]
+            chi2[accepted] = new_chi2[improved]
+            iterations[active] += 1
+            damping[active] = np.where(
+                improved,
+                damping[active] / DAMPING_FACTOR,
+                damping[active] * DAMPING_FACTOR,
+            )
+            done = small_step | (improved & (decrease <= tolerance * new_chi2))
+            converged[active[done]] = True
+            active = active[~done & (damping[active] < MAX_DAMPING)]
+        jacobian = _jacobian(func, a, x) * weights[..., None]
+        acov = np.linalg.pinv(np.einsum("bki,bkj->bij", jacobian, jacobian))
+    degrees_of_freedom = y.shape[1] - func.active_parameters
+    aerr = np.sqrt(
+        np.diagonal(acov, axis1=1, axis2=2) * (chi2 / degrees_of_freedom)[:, None]
+    )
+    return BatchFittingResult(
+        a0=a0,
+        a=a,
+        aerr=aerr,
+        acov=acov,
+        degrees_of_freedom=degrees_of_freedom,
+        chi2=chi2,
+        converged=converged,
+        iterations=iterations,
+    )
+
+
+def _batch_a0(func, x, y, a0) -> np.ndarray:  # pylint: disable=invalid-name
+    shape = (y.shape[0], func.active_parameters)
+    if a0 is not None:
+        return np.array(np.broadcast_to(np.asarray(a0, dtype=float), shape))
+    batch_a0 = np.ones(shape)
+    if func.initial_guess is None:
+        return batch_a0
+    for i, (x_values, y_values) in enumerate(zip(x, y)):
+        guess = func.initial_guess(x_values, y_values)
+        if np.all(np.isfinite(guess)):
+            batch_a0[i] = guess
+    return batch_a0
+
+
+def _jacobian(func, a, x) -> np.ndarray:
+    return np.swapaxes(func.a_derivative_batch(a, x), 1, 2)
+
+
+def _diagonal_matrices(diagonals) -> np.ndarray:
+    return diagonals[..., None] * np.eye(diagonals.shape[-1])
@@ -0,0 +1,224 @@
+"""Bootstrap estimation of the fitting parameters uncertainties."""
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from eddington.exceptions import EddingtonException, FittingError
+from eddington.fitting import _fit_arrays, fit
+from eddington.fitting_data import FittingData
+from eddington.fitting_function_class import FittingFunction
+from eddington.fitting_result import FittingResult
+from eddington.parallel_util import get_executor
+from eddington.print_util import to_relevant_precision_string
+
+RESAMPLES_CHUNK_SIZE = 100
+
+
+@dataclass(repr=False)
+class BootstrapResult:  # pylint: disable=too-many-instance-attributes
+    """
+    Result of a bootstrap estimation.
+
+    :param result: Fitting result of the full data.
+    :type result: FittingResult
+    :param samples: Fitted parameters of each successful resample, of shape
+        (number of samples, number of parameters).
+    :type samples: np.ndarray
+    :param level: Confidence level of the percentile intervals.
+    :type level: float
+    :param failed: Number of resamples which could not be fitted.
+    :type failed: int
+    :param lower: Lower bounds of the percentile intervals.
+    :type lower: np.ndarray
+    :param upper: Upper bounds of the percentile intervals.
+    :type upper: np.ndarray
+    :param acov: Bootstrap covariance matrix of the parameters.
+    :type acov: np.ndarray
+    :param aerr: Bootstrap standard errors of the parameters.
+    :type aerr: np.ndarray
+    """
+
+    result: FittingResult
+    samples: np.ndarray
+    level: float
+    failed: int = field(default=0)
+    lower: np.ndarray = field(init=False)
+    upper: np.ndarray = field(init=False)
+    acov: np.ndarray = field(init=False)
+    aerr: np.ndarray = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Post init methods."""
+        tail = 50 * (1 - self.level)
+        self.lower, self.upper = np.percentile(self.samples, [tail, 100 - tail], axis=0)
+        self.acov = np.atleast_2d(np.cov(self.samples, rowvar=False))
+        self.aerr = np.sqrt(np.diag(self.acov))
+
+    @property
+    def pretty_string(self) -> str:
+        """
+        Pretty representation string.
+
+        :return: self representing pretty string
+        :rtype: str
+        """
+        precision = self.result.precision
+        old_precision = np.get_printoptions()["precision"]
+        np.set_printoptions(precision=precision)
+        level_string = to_relevant_precision_string(self.level * 100, precision)
+        intervals_string = "\n".join(
+            f"\ta[{i}] = {to_relevant_precision_string(a, precision)} "
+            f"\u00B1 {to_relevant_precision_string(aerr, precision)} "
+            f"({level_string}% interval: "
+            f"{to_relevant_precision_string(lower, precision)} to "
+            f"{to_relevant_precision_string(upper, precision)})"
+            for i, (a, aerr, lower, upper) in enumerate(
+                zip(self.result.a, self.aerr, self.lower, self.upper)
+            )
+        )
+        repr_string = f"""Bootstrap results:
+==================
+
+Resamples: {len(self.samples)} ({self.failed} failed)
+Parameters' values:
+{intervals_string}
+Bootstrap covariance:
+{self.acov}
+"""
+        np.set_printoptions(precision=old_precision)
+        return repr_string
+
+    def __repr__(self) -> str:
+        """
+        Representation string.
+
+        :return: self representing pretty string
+        :rtype: str
+        """
+        return self.pretty_string
+
+
+def bootstrap(  # pylint: disable=invalid-name,too-many-arguments,too-many-locals
+    data: FittingData,
+    func: FittingFunction,
+    n_resamples: int = 1000,
+    workers: Optional[int] = None,
+    level: float = 0.95,
+    seed: Optional[int] = None,
+    a0: Optional[np.ndarray] = None,
+    use_x_derivative: bool = True,
+    use_a_derivative: bool = True,
+) -> BootstrapResult:
+    """
+    Estimate the uncertainties of the fitting parameters by bootstrap.
+
+    The records of the data are resampled with replacement and each resample is
+    fitted, starting from the parameters fitted to the full data. Resamples are fitted
+    in chunks, each with its own random stream spawned from a single
+    :class:`numpy.random.SeedSequence`. Hence, the result depends only on the seed and
+    not on the number of workers.
+
+    :param data: Fitting data to optimize
+    :type data: FittingData
+    :param func: a function to fit the data according to.
+    :type func: FittingFunction
+    :param n_resamples: Number of resamples.
+    :type n_resamples: int
+    :param workers: Number of worker processes. If None, fit in the calling process.
+    :type workers: int
+    :param level: Confidence level of the percentile intervals.
+    :type level: float
+    :param seed: Seed of the resampling.
+    :type seed: int
+    :param a0: initial guess for the fit of the full data.
+    :type a0: np.ndarray
+    :param use_x_derivative: indicates whether to use x derivative or not.
+    :type use_x_derivative: bool
+    :param use_a_derivative: indicates whether to use a derivative or not.
+    :type use_a_derivative: bool
+    :return: fitting result of the full data with bootstrap intervals and covariance
+    :rtype: BootstrapResult
+    :raises FittingError: Raised when the number of resamples or the confidence level
+        are invalid, or when no resample could be fitted.
+    """
+    if n_resamples <= 1:
+        raise FittingError(
+            f"Number of resamples should be greater than 1, got {n_resamples}"
+        )
+    if not 0 < level < 1:
+        raise FittingError(f"Confidence level should be between 0 and 1, got {level}")
+    result = fit(
+        data,
+        func,
+        a0=a0,
+        use_x_derivative=use_x_derivative,
+        use_a_derivative=use_a_derivative,
+    )
+    arrays = (data.x, data.xerr, data.y, data.yerr)
+    chunk_sizes = [
+        min(RESAMPLES_CHUNK_SIZE, n_resamples - start)
+        for start in range(0, n_resamples, RESAMPLES_CHUNK_SIZE)
+    ]
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    with get_executor(workers) as executor:
+        futures = [
+            executor.submit(
+                _fit_resamples,
+                func,
+                arrays,
+                size,
+                seed_sequence,
+                result.a,
+                use_x_derivative,
+                use_a_derivative,
+            )
+            for size, seed_sequence in zip(chunk_sizes, seed_sequences)
+        ]
+        samples: List[np.ndarray] = []
+        for future in futures:
+            samples.extend(future.result())
+    if len(samples) <= 1:
+        raise FittingError("Could not fit enough resamples")
+    return BootstrapResult(
+        result=result,
+        samples=np.stack(samples),
+        level=level,
+        failed=n_resamples - len(samples),
+    )
+
+
+def _fit_resamples(  # pylint: disable=invalid-name,too-many-arguments,too-many-locals
+    func: FittingFunction,
+    arrays: Tuple[Optional[np.ndarray], ...],
+    size: int,
+    seed_sequence: np.random.SeedSequence,
+    a0: np.ndarray,
+    use_x_derivative: bool,
+    use_a_derivative: bool,
+) -> List[np.ndarray]:
+    number_of_records = len(arrays[0])  # type: ignore
+    indices = np.random.default_rng(seed_sequence).integers(
+        number_of_records, size=(size, number_of_records)
+    )
+    samples = []
+    for resample_indices in indices:
+        x, xerr, y, yerr = [
+            None if array is None else array[resample_indices] for array in arrays
+        ]
+        try:
+            resample_result = _fit_arrays(
+                func=func,
+                x=x,  # type: ignore
+                y=y,  # type: ignore
+                xerr=xerr,
+                yerr=yerr,
+                a0=a0,
+                use_x_derivative=use_x_derivative,
+                use_a_derivative=use_a_derivative,
+            )
+        except (EddingtonException, ArithmeticError, ValueError):
+            continue
+        if np.all(np.isfinite(resample_result.a)):
+            samples.append(resample_result.a)
+    return samples
@@ -0,0 +1,179 @@
+"""Out-of-core fitting of large files by streaming them in chunks."""
+import csv
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+import numpy as np
+
+from eddington.exceptions import FittingDataColumnExistenceError, FittingDataInvalidFile
+from eddington.fitting_function_class import FittingFunction
+from eddington.fitting_result import FittingResult
+from eddington.incremental_fitting import IncrementalLinearFit
+from eddington.parallel_util import get_executor
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def chunked_fit(  # pylint: disable=too-many-arguments
+    filepath: Union[str, Path],
+    func: FittingFunction,
+    x_column: str,
+    y_column: str,
+    yerr_column: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None,
+) -> FittingResult:
+    """
+    Fit a linear-in-parameters function to a file without loading it into memory.
+
+    The file is read in chunks of records, and each chunk is added to an
+    :class:`IncrementalLinearFit`. Hence, memory usage depends on the chunk size only
+    and not on the size of the file. When workers are given, the file is split into
+    ranges (byte ranges of csv files, row groups of parquet files), each range is
+    fitted by a separate process and the partial QR factorizations are merged at the
+    end (TSQR).
+
+    Csv files should have a header row with the columns names. Parquet files require
+    `pyarrow <https://arrow.apache.org/docs/python/>`_ to be installed.
+
+    :param filepath: Path of a ``.csv`` or ``.parquet`` file.
+    :type filepath: str or Path
+    :param func: Linear-in-parameters fitting function, such as :func:`polynomial`.
+    :type func: FittingFunction
+    :param x_column: Name of the x column.
+    :type x_column: str
+    :param y_column: Name of the y column.
+    :type y_column: str
+    :param yerr_column: Optional. Name of the y errors column. If None, all records
+        are weighted equally.
+    :type yerr_column: str
+    :param chunk_size: Number of records to read at once.
+    :type chunk_size: int
+    :param workers: Optional. Number of worker processes. If None or 1, the file is
+        read serially in the calling process.
+    :type workers: int
+    :return: fitting result of all records in the file
+    :rtype: FittingResult
+    :raises FittingDataInvalidFile: Raised when the file type is not supported.
+    """
+    filepath = Path(filepath)
+    columns = [x_column, y_column] + ([] if yerr_column is None else [yerr_column])
+    if filepath.suffix == ".csv":
+        ranges = _csv_ranges(filepath, columns, workers)
+        fit_range = _fit_csv_range
+    elif filepath.suffix == ".parquet":
+        ranges = _parquet_ranges(filepath, columns, workers)
+        fit_range = _fit_parquet_range
+    else:
+        raise FittingDataInvalidFile(
+            f'Cannot fit file of type "{filepath.suffix}". '
+            "Supported types are .csv and .parquet"
+        )
+    with get_executor(workers) as executor:
+        futures = [
+            executor.submit(fit_range, filepath, func, columns, chunk_size, **bounds)
+            for bounds in ranges
+        ]
+        incremental_fit = IncrementalLinearFit(func)
+        for future in futures:
+            incremental_fit.merge(future.result())
+    return incremental_fit.result()
+
+
+def _csv_ranges(filepath, columns, workers) -> List[Dict[str, int]]:
+    with open(filepath, mode="rb") as csv_file:
+        header = next(csv.reader([csv_file.readline().decode("utf-8")]), [])
+        start = csv_file.tell()
+    for column in columns:
+        if column not in header:
+            raise FittingDataColumnExistenceError(column)
+    size = os.path.getsize(filepath)
+    number_of_ranges = max(1, workers or 1)
+    bounds = np.linspace(start, size, number_of_ranges + 1).astype(int)
+    return [
+        dict(start=int(range_start), stop=int(range_stop))
+        for range_start, range_stop in zip(bounds[:-1], bounds[1:])
+    ]
+
+
+def _fit_csv_range(  # pylint: disable=too-many-arguments
+    filepath, func, columns, chunk_size, start, stop
+) -> IncrementalLinearFit:
+    incremental_fit = IncrementalLinearFit(func)
+    with open(filepath, mode="rb") as csv_file:
+        header = next(csv.reader([csv_file.readline().decode("utf-8")]))
+        indices = [header.index(column) for column in columns]
+        rows = csv.reader(
+            line.decode("utf-8") for line in _lines(csv_file, start, stop)
+        )
+        chunk: List[List[str]] = []
+        for row in rows:
+            if len(row) == 0:
+                continue
+            chunk.append([row[i] for i in indices])
+            if len(chunk) == chunk_size:
+                _update(incremental_fit, np.array(chunk, dtype=float).T)
+                chunk = []
+        if len(chunk) != 0:
+            _update(incremental_fit, np.array(chunk, dtype=float).T)
+    return incremental_fit
+
+
+def _lines(csv_file, start, stop) -> Iterator[bytes]:
+    # A line belongs to the range in which it starts. The line which contains the
+    # byte before the range start belongs to the previous range.
+    csv_file.seek(start - 1)
+    csv_file.readline()
+    while csv_file.tell() < stop:
+        yield csv_file.readline()
+
+
+def _parquet_ranges(filepath, columns, workers) -> List[Dict[str, List[int]]]:
+    parquet_file = _parquet_file(filepath)
+    for column in columns:
+        if column not in parquet_file.schema_arrow.names:
+            raise FittingDataColumnExistenceError(column)
+    row_groups = np.arange(parquet_file.num_row_groups)
+    return [
+        dict(row_groups=[int(i) for i in part])
+        for part in np.array_split(row_groups, max(1, workers or 1))
+        if len(part) != 0
+    ]
+
+
+def _fit_parquet_range(
+    filepath, func, columns, chunk_size, row_groups
+) -> IncrementalLinearFit:
+    incremental_fit = IncrementalLinearFit(func)
+    batches = _parquet_file(filepath).iter_batches(
+        batch_size=chunk_size, row_groups=row_groups, columns=columns
+    )
+    for batch in batches:
+        _update(
+            incremental_fit,
+            np.stack(
+                [
+                    np.asarray(batch.column(column).to_numpy(), dtype=float)
+                    for column in columns
+                ]
+            ),
+        )
+    return incremental_fit
+
+
+def _parquet_file(filepath):
+    try:
+        from pyarrow import parquet  # pylint: disable=import-outside-toplevel
+    except ImportError as error:
+        raise FittingDataInvalidFile(
+            "Reading parquet files requires pyarrow. "
+            "Install it with `pip install eddington[parquet]`"
+        ) from error
+    return parquet.ParquetFile(filepath)
+
+
+def _update(incremental_fit, values):
+    incremental_fit.update(
+        x=values[0], y=values[1], yerr=values[2] if len(values) > 2 else None
+    )
@@ -1,6 +1,6 @@
 """Fit CLI method."""
 from pathlib import Path
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
 
 import click
 
@@ -31,13 +31,17 @@
     load_fitting_function,
 )
 from eddington.consts import PLOT_DOMAIN_MULTIPLIER
+from eddington.exceptions import EddingtonCLIError
 from eddington.fitting import fit
+from eddington.fitting_data import FittingData
+from eddington.fitting_function_class import FittingFunction
 from eddington.fitting_result import FittingResult
+from eddington.model_selection import CRITERIA, fit_all
 from eddington.plot.figure_builder import FigureBuilder
 from eddington.plot.line_style import LineStyle
 from eddington.plot.plot_util import build_repr_string, show_or_export
 
-# pylint: disable=invalid-name,too-many-arguments,too-many-locals
+# pylint: disable=invalid-name,too-many-arguments,too-many-locals,too-many-branches
 
 
 @eddington_cli.command("fit")
@@ -51,6 +55,37 @@
         "Should be given as floating point numbers separated by commas"
     ),
 )
+@click.option(
+    "--all",
+    "fit_all_functions",
+    is_flag=True,
+    default=False,
+    help=(
+        "Fit all the functions in the registry, rank them and continue with the best "
+        "one."
+    ),
+)
+@click.option(
+    "--criterion",
+    type=click.Choice(CRITERIA),
+    default="aic",
+    help="Criterion to rank the functions by when fitting all of them.",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=int,
+    help="Number of worker processes when fitting all the functions.",
+)
+@click.option(
+    "--timeout",
+    type=float,
+    help=(
+        "Maximum time in seconds for fitting each function. A fit which is stopped "
+        "by the timeout is reported as not converged, and dropped when fitting all "
+        "functions."
+    ),
+)
 @data_file_option
 @sheet_option
 @x_column_option
@@ -103,6 +138,10 @@ def fit_cli(
     fitting_function_name: Optional[str],
     polynomial_degree: Optional[int],
     a0: Optional[str],
+    fit_all_functions: bool,
+    criterion: str,
+    workers: Optional[int],
+    timeout: Optional[float],
     data_file: Union[str, Path],
     sheet: Optional[str],
     x_column: Optional[str],
@@ -137,13 +176,27 @@ def fit_cli(
         yerr_column=yerr_column,
         search=search,
     )
-    func = load_fitting_function(
-        func_name=fitting_function_name, polynomial_degree=polynomial_degree
-    )
     if output_dir is not None:
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
-    result = fit(data, func, a0=extract_array_from_string(a0))
+    if fit_all_functions:
+        if fitting_function_name or polynomial_degree is not None or a0 is not None:
+            raise EddingtonCLIError(
+                "Cannot accept a fitting function or an initial guess "
+                "when fitting all functions"
+            )
+        func, result = __fit_and_rank_all(
+            data,
+            workers=workers,
+            timeout=timeout,
+            criterion=criterion,
+            output_dir=output_dir,
+        )
+    else:
+        func = load_fitting_function(
+            func_name=fitting_function_name, polynomial_degree=polynomial_degree
+        )
+        result = fit(data, func, a0=extract_array_from_string(a0), timeout=timeout)
     write_and_export_result(
         result, func_name=func.name, output_dir=output_dir, is_json=json
     )
@@ -251,6 +304,36 @@ def write_and_export_result(
         result.save_txt(output_dir / f"{func_name}_result.txt")
 
 
+def __fit_and_rank_all(
+    data: FittingData,
+    workers: Optional[int],
+    timeout: Optional[float],
+    criterion: str,
+    output_dir: Optional[Path],
+) -> Tuple[FittingFunction, FittingResult]:
+    """
+    Fit all the functions, write their ranking to console and to file if specified.
+
+    :param data: Fitting data
+    :type data: FittingData
+    :param workers: Number of worker processes
+    :type workers: Optional[int]
+    :param timeout: Maximum time in seconds for fitting each function
+    :type timeout: Optional[float]
+    :param criterion: Criterion to rank the functions by
+    :type criterion: str
+    :param output_dir: Optional output directory to save the ranking in.
+    :type output_dir: Optional[Path]
+    :return: The best function and its fitting result
+    :rtype: Tuple[FittingFunction, FittingResult]
+    """
+    ranking = fit_all(data, workers=workers, timeout=timeout, criterion=criterion)
+    click.echo(ranking.pretty_string)
+    if output_dir is not None:
+        (output_dir / "ranking.txt").write_text(ranking.pretty_string, encoding="utf-8")
+    return ranking.best.func, ranking.best.result
+
+
 def __optional_path(directory: Optional[Path], file_name: str):
     if directory is None:
         return None
@@ -11,3 +11,4 @@
 DEFAULT_MAX_STRING_LENGTH = 6
 PLOT_DOMAIN_MULTIPLIER = 1.1
 DEFAULT_TICKS = 1000
+DEFAULT_BAND_ALPHA = 0.3
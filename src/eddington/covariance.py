@@ -0,0 +1,204 @@
+"""Covariance matrices of correlated y errors."""
+from dataclasses import dataclass, field
+from typing import Union
+
+import numpy as np
+from scipy.linalg import cholesky, cholesky_banded, solve_banded, solve_triangular
+
+from eddington.exceptions import FittingError
+
+
+@dataclass
+class DenseCovariance:
+    """
+    Dense covariance matrix of the y values.
+
+    Whitening costs O(N^2) per vector after an O(N^3) Cholesky factorization, hence
+    it is suitable for moderate numbers of records only.
+
+    :param matrix: Symmetric positive definite matrix of shape (N, N).
+    :type matrix: np.ndarray
+    """
+
+    matrix: np.ndarray
+    _cholesky: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """
+        Post init methods.
+
+        :raises FittingError: Raised when the matrix is not positive definite.
+        """
+        self.matrix = np.asarray(self.matrix, dtype=float)
+        try:
+            self._cholesky = cholesky(self.matrix, lower=True)
+        except np.linalg.LinAlgError as error:
+            raise FittingError("Covariance matrix is not positive definite") from error
+
+    @property
+    def size(self) -> int:
+        """
+        Number of records the covariance refers to.
+
+        :return: number of records
+        :rtype: int
+        """
+        return self.matrix.shape[0]
+
+    def whiten(self, values: np.ndarray) -> np.ndarray:
+        """
+        Transform values such that their covariance becomes the identity.
+
+        :param values: Values of shape (..., N).
+        :type values: np.ndarray
+        :return: whitened values of the same shape
+        :rtype: np.ndarray
+        """
+        return solve_triangular(self._cholesky, np.transpose(values), lower=True).T
+
+
+@dataclass
+class BandedCovariance:
+    """
+    Banded covariance matrix of the y values.
+
+    The matrix is given by its diagonal and lower bands, in the lower form of
+    :func:`scipy.linalg.cholesky_banded`: ``bands[k, j]`` is the entry at row
+    ``j + k`` and column ``j``. The Cholesky factor keeps the same bandwidth, so
+    whitening costs O(N * bandwidth) instead of O(N^3).
+
+    :param bands: Bands of shape (bandwidth + 1, N). The last k entries of band k are
+        ignored.
+    :type bands: np.ndarray
+    """
+
+    bands: np.ndarray
+    _cholesky: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """
+        Post init methods.
+
+        :raises FittingError: Raised when the matrix is not positive definite.
+        """
+        self.bands = np.atleast_2d(np.asarray(self.bands, dtype=float))
+        try:
+            self._cholesky = cholesky_banded(self.bands, lower=True)
+        except np.linalg.LinAlgError as error:
+            raise FittingError("Covariance matrix is not positive definite") from error
+
+    @classmethod
+    def from_matrix(cls, matrix: np.ndarray, bandwidth: int) -> "BandedCovariance":
+        """
+        Extract the bands of a dense covariance matrix.
+
+        :param matrix: Symmetric matrix of shape (N, N).
+        :type matrix: np.ndarray
+        :param bandwidth: Number of bands below the diagonal to keep.
+        :type bandwidth: int
+        :return: banded covariance
+        :rtype: BandedCovariance
+        """
+        matrix = np.asarray(matrix, dtype=float)
+        bands = np.zeros((bandwidth + 1, matrix.shape[0]))
+        for k in range(bandwidth + 1):
+            bands[k, : matrix.shape[0] - k] = np.diagonal(matrix, offset=-k)
+        return cls(bands=bands)
+
+    @property
+    def bandwidth(self) -> int:
+        """
+        Number of bands below the diagonal.
+
+        :return: bandwidth
+        :rtype: int
+        """
+        return self.bands.shape[0] - 1
+
+    @property
+    def size(self) -> int:
+        """
+        Number of records the covariance refers to.
+
+        :return: number of records
+        :rtype: int
+        """
+        return self.bands.shape[1]
+
+    def whiten(self, values: np.ndarray) -> np.ndarray:
+        """
+        Transform values such that their covariance becomes the identity.
+
+        :param values: Values of shape (..., N).
+        :type values: np.ndarray
+        :return: whitened values of the same shape
+        :rtype: np.ndarray
+        """
+        return solve_banded((self.bandwidth, 0), self._cholesky, np.transpose(values)).T
+
+
+@dataclass
+class LowRankCovariance:
+    """
+    Covariance matrix of the y values made of a diagonal and a low rank term.
+
+    The matrix is ``diag(diagonal) + factor @ factor.T``, which describes independent
+    errors combined with a few correlated systematic errors. Instead of a Cholesky
+    factor, whitening uses the inverse square root of the matrix, which is calculated
+    from a thin SVD of the scaled low rank factor. It costs O(N * rank) per vector
+    after an O(N * rank^2) setup.
+
+    :param diagonal: Independent variances of shape (N,).
+    :type diagonal: np.ndarray
+    :param factor: Low rank factor of shape (N, rank).
+    :type factor: np.ndarray
+    """
+
+    diagonal: np.ndarray
+    factor: np.ndarray
+    _scale: np.ndarray = field(init=False, repr=False)
+    _basis: np.ndarray = field(init=False, repr=False)
+    _shrinkage: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """
+        Post init methods.
+
+        :raises FittingError: Raised when the matrix is not positive definite.
+        """
+        self.diagonal = np.asarray(self.diagonal, dtype=float)
+        self.factor = np.reshape(
+            np.asarray(self.factor, dtype=float), (self.diagonal.shape[0], -1)
+        )
+        if np.any(self.diagonal <= 0):
+            raise FittingError("Covariance matrix is not positive definite")
+        self._scale = 1 / np.sqrt(self.diagonal)
+        self._basis, singular_values, _ = np.linalg.svd(
+            self.factor * self._scale[:, None], full_matrices=False
+        )
+        self._shrinkage = 1 / np.sqrt(1 + np.square(singular_values)) - 1
+
+    @property
+    def size(self) -> int:
+        """
+        Number of records the covariance refers to.
+
+        :return: number of records
+        :rtype: int
+        """
+        return self.diagonal.shape[0]
+
+    def whiten(self, values: np.ndarray) -> np.ndarray:
+        """
+        Transform values such that their covariance becomes the identity.
+
+        :param values: Values of shape (..., N).
+        :type values: np.ndarray
+        :return: whitened values of the same shape
+        :rtype: np.ndarray
+        """
+        scaled = np.asarray(values, dtype=float) * self._scale
+        return scaled + ((scaled @ self._basis) * self._shrinkage) @ self._basis.T
+
+
+YCovariance = Union[DenseCovariance, BandedCovariance, LowRankCovariance]
@@ -0,0 +1,177 @@
+"""K-fold cross-validation of fitting functions."""
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+from prettytable import PrettyTable
+
+from eddington.exceptions import EddingtonException, FittingError
+from eddington.fitting import _effective_variance, _fit_arrays
+from eddington.fitting_data import FittingData
+from eddington.fitting_function_class import FittingFunction
+from eddington.parallel_util import get_executor
+from eddington.print_util import to_relevant_precision_string
+
+DEFAULT_FOLDS = 5
+
+
+@dataclass(repr=False)
+class CrossValidationResult:
+    """
+    Held-out errors of a fitting function over the folds of the data.
+
+    :param name: Name of the fitting function.
+    :type name: str
+    :param folds: Fold of each selected record, of shape (records,). Pass it to
+        :func:`cross_validate` in order to validate other functions on the same folds.
+    :type folds: np.ndarray
+    :param scores: Mean squared normalized residual of the held-out records of each
+        fold, of shape (folds,). Folds which could not be fitted are NaN.
+    :type scores: np.ndarray
+    :param a: Fitted parameters of each fold, of shape (folds, parameters). Folds
+        which could not be fitted are NaN.
+    :type a: np.ndarray
+    """
+
+    name: str
+    folds: np.ndarray
+    scores: np.ndarray
+    a: np.ndarray
+
+    @property
+    def mean_score(self) -> float:
+        """
+        Mean held-out score over the folds which were fitted.
+
+        :return: mean score
+        :rtype: float
+        """
+        return float(np.nanmean(self.scores))
+
+    @property
+    def score_error(self) -> float:
+        """
+        Standard error of the mean held-out score.
+
+        :return: standard error
+        :rtype: float
+        """
+        fitted = np.count_nonzero(np.isfinite(self.scores))
+        return float(np.nanstd(self.scores, ddof=1) / np.sqrt(fitted))
+
+    @property
+    def pretty_string(self) -> str:
+        """
+        Pretty representation string.
+
+        :return: self representing pretty string
+        :rtype: str
+        """
+        table = PrettyTable(field_names=["Fold", "Held-out records", "Score"])
+        for i, score in enumerate(self.scores):
+            table.add_row(
+                [
+                    i + 1,
+                    np.count_nonzero(self.folds == i),
+                    to_relevant_precision_string(score, 4),
+                ]
+            )
+        return (
+            f'Cross-validation of "{self.name}":\n{table}\n'
+            f"Mean score: {to_relevant_precision_string(self.mean_score, 4)} "
+            f"± {to_relevant_precision_string(self.score_error, 4)}\n"
+        )
+
+    def __repr__(self) -> str:
+        """
+        Representation string.
+
+        :return: self representing pretty string
+        :rtype: str
+        """
+        return self.pretty_string
+
+
+def cross_validate(  # pylint: disable=too-many-arguments
+    data: FittingData,
+    func: FittingFunction,
+    k: int = DEFAULT_FOLDS,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    folds: Optional[np.ndarray] = None,
+) -> CrossValidationResult:
+    """
+    Estimate the predictive error of a fitting function by k-fold cross-validation.
+
+    The selected records are randomly split into k folds of (almost) equal sizes.
+    Each fold is held out in turn, the function is fitted to the rest of the records
+    and scored by the mean squared normalized residual of the held-out records. The
+    residuals are normalized by the y errors, including propagated x errors, if the
+    data has them. Folds are selection masks over the arrays of the data, which are
+    extracted once, and they are fitted in parallel when workers are given.
+
+    In order to compare several functions, validate all of them on the same folds by
+    passing the folds of the first result.
+
+    :param data: Fitting data to validate on.
+    :type data: FittingData
+    :param func: The fitting function.
+    :type func: FittingFunction
+    :param k: Number of folds. Ignored if folds are given.
+    :type k: int
+    :param workers: Number of worker processes. If None, fit in the calling process.
+    :type workers: int
+    :param seed: Seed of the random split into folds.
+    :type seed: int
+    :param folds: Optional. Fold of each selected record, as returned in
+        :attr:`CrossValidationResult.folds`.
+    :type folds: np.ndarray
+    :return: held-out scores of the folds
+    :rtype: CrossValidationResult
+    :raises FittingError: Raised when the folds are invalid or missing information
+        for the fitting algorithm.
+    """
+    if data.x is None:
+        raise FittingError("Cannot fit data without x values")
+    if data.y is None:
+        raise FittingError("Cannot fit data without y values")
+    arrays = (data.x, data.xerr, data.y, data.yerr)
+    number_of_records = len(data.x)
+    if folds is None:
+        if not 2 <= k <= number_of_records:
+            raise FittingError(
+                f"Number of folds should be between 2 and {number_of_records}, got {k}"
+            )
+        folds = np.empty(number_of_records, dtype=int)
+        folds[np.random.default_rng(seed).permutation(number_of_records)] = (
+            np.arange(number_of_records) % k
+        )
+    folds = np.asarray(folds, dtype=int)
+    if folds.shape != (number_of_records,):
+        raise FittingError(
+            f"Expected folds of {number_of_records} records, got {folds.size}"
+        )
+    with get_executor(workers) as executor:
+        futures = [
+            executor.submit(_validate_fold, func, arrays, folds == fold)
+            for fold in range(int(np.max(folds)) + 1)
+        ]
+        scores, a = zip(*[future.result() for future in futures])
+    return CrossValidationResult(
+        name=func.name, folds=folds, scores=np.array(scores), a=np.stack(a)
+    )
+
+
+def _validate_fold(
+    func: FittingFunction,
+    arrays: Tuple[Optional[np.ndarray], ...],
+    held_out: np.ndarray,
+) -> Tuple[float, np.ndarray]:
+    x, xerr, y, yerr = [None if array is None else array[~held_out] for array in arrays]
+    try:
+        a = _fit_arrays(func=func, x=x, y=y, xerr=xerr, yerr=yerr).a  # type: ignore
+    except (EddingtonException, ArithmeticError, ValueError):
+        return np.nan, np.full(func.active_parameters, np.nan)
+    x, xerr, y, yerr = [None if array is None else array[held_out] for array in arrays]
+    variance = _effective_variance(func, a, x, xerr, yerr)  # type: ignore
+    return float(np.mean(np.square(y - func(a, x)) / variance)), a
@@ -0,0 +1,107 @@
+"""Cache of intermediate values shared by a fitting function and its derivatives."""
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Tuple
+
+import numpy as np
+
+# ODR evaluates the function and its derivatives for the same parameters before
+# moving on, so only the most recent values are worth keeping.
+DEFAULT_EVALUATION_CACHE_SIZE = 4
+
+
+@dataclass
+class EvaluationCache:
+    """
+    Cache of intermediate values of a fitting function.
+
+    Fitting algorithms evaluate a function and then its derivatives for the same
+    parameters and x values. Intermediate values which are common to them, such as
+    powers and exponents of x, are computed once and reused. Values are keyed by their
+    name and by the contents of the parameters and the x values, since fitting
+    algorithms may write new values into the same arrays. A copy of the parameters and
+    the x values is kept only when a value is computed, and they are compared with
+    the requested ones element by element.
+
+    :param size: Maximal number of values kept. The least recently used value is
+        dropped first.
+    :type size: int
+    :param hits: Number of values which were found in the cache.
+    :type hits: int
+    :param misses: Number of values which were computed.
+    :type misses: int
+    """
+
+    size: int = DEFAULT_EVALUATION_CACHE_SIZE
+    hits: int = 0
+    misses: int = 0
+    _entries: List[Tuple[str, np.ndarray, np.ndarray, Any]] = field(
+        default_factory=list, init=False, repr=False
+    )
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Fraction of the values which were found in the cache.
+
+        :return: hit rate, or 0 when no value was requested
+        :rtype: float
+        """
+        requests = self.hits + self.misses
+        return self.hits / requests if requests > 0 else 0.0
+
+    def get(
+        self,
+        name: str,
+        a: np.ndarray,
+        x: np.ndarray,
+        compute: Callable[[np.ndarray, np.ndarray], Any],
+    ) -> Any:
+        """
+        Get an intermediate value, computing it if it is not cached.
+
+        Cached values are shared, so they should not be changed in place.
+
+        :param name: Name of the intermediate value
+        :type name: str
+        :param a: Parameters of the function
+        :type a: np.ndarray
+        :param x: X values
+        :type x: np.ndarray
+        :param compute: Callable computing the value from the parameters and the x
+            values
+        :type compute: callable
+        :return: the intermediate value
+        """
+        for i, (entry_name, entry_a, entry_x, value) in enumerate(self._entries):
+            if (
+                entry_name == name
+                and self.__equal(entry_a, a, equal_nan=True)
+                and self.__equal(entry_x, x, equal_nan=False)
+            ):
+                self.hits += 1
+                self._entries.append(self._entries.pop(i))
+                return value
+        self.misses += 1
+        value = compute(a, x)
+        self._entries.append((name, np.array(a), np.array(x), value))
+        if len(self._entries) > self.size:
+            self._entries.pop(0)
+        return value
+
+    def clear(self):
+        """Drop all cached values and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def __equal(cached, values, equal_nan):
+        # Compare the cheap attributes first, so arrays of other shapes or types are
+        # never compared element by element. Comparing NaN values copies the arrays,
+        # so it is done only for the parameters, which are small.
+        values = np.asarray(values)
+        return (
+            cached.shape == values.shape
+            and cached.dtype == values.dtype
+            and np.array_equal(cached, values, equal_nan=equal_nan)
+        )
@@ -1,21 +1,43 @@
 """Implementation of the fitting algorithm."""
-from typing import Any, Dict, Optional
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, Optional, Tuple, Union
 
 import numpy as np
-from scipy.odr import ODR, Model, RealData
+from scipy.odr import ODR, Data, Model, RealData
 
+from eddington.covariance import DenseCovariance, YCovariance
+from eddington.evaluation_cache import EvaluationCache
 from eddington.exceptions import FittingError
 from eddington.fitting_data import FittingData
+from eddington.fitting_engines import _fit_least_squares, _fit_linear, _reuse_out
 from eddington.fitting_function_class import FittingFunction
-from eddington.fitting_result import FittingResult
+from eddington.fitting_result import FittingDiagnostics, FittingResult
+from eddington.incremental_fitting import IncrementalLinearFit
+from eddington.sigma_clipping import ClippedFittingResult, SigmaClip
 
+ENGINES = ["odr", "least_squares", "linear", "auto"]
+DEFAULT_MAX_ITERATIONS = 50
+DEADLINE_CHECK_ITERATIONS = 5
+# ODRPACK keeps the number of iterations, function evaluations and Jacobian
+# evaluations at a fixed offset from the end of its integer work array.
+ODR_COUNTERS_OFFSET = 6
 
-def fit(  # pylint: disable=invalid-name
+
+def fit(  # pylint: disable=invalid-name,too-many-arguments
     data: FittingData,
     func: FittingFunction,
     a0: np.ndarray = None,
     use_x_derivative: bool = True,
     use_a_derivative: bool = True,
+    max_iterations: Optional[int] = None,
+    timeout: Optional[float] = None,
+    ycov: Optional[Union[YCovariance, np.ndarray]] = None,
+    clip: Optional[SigmaClip] = None,
+    tolerance: Optional[float] = None,
+    engine: str = "odr",
+    condition: bool = False,
+    exact_x: bool = False,
 ) -> FittingResult:
     """
     Implementation of the fitting algorithm.
@@ -27,34 +49,230 @@ def fit(  # pylint: disable=invalid-name
     :type data: FittingData
     :param func: a function to fit the data according to.
     :type func: FittingFunction
-    :param a0: initial guess for the parameters
+    :param a0: initial guess for the parameters. If None, use the initial guess
+        estimator of the fitting function, if it has one.
     :type a0: np.ndarray
     :param use_x_derivative: indicates whether to use x derivative or not.
     :type use_x_derivative: bool
     :param use_a_derivative: indicates whether to use a derivative or not.
     :type use_a_derivative: bool
-    :returns: FittingResult
-    :raises FittingError: Raised when missing information for the fitting algorithm.
+    :param max_iterations: Optional. Maximum number of iterations of the fitting
+        algorithm. If None, use the default of ODR.
+    :type max_iterations: int
+    :param timeout: Optional. Maximum wall time in seconds of the fit, measured from
+        the call in the process which fits, so it applies to each fit separately
+        when fitting in worker processes. The time is checked every few iterations.
+        If the algorithm did not converge in time, no error is raised. The
+        parameters of the last iteration are returned and the diagnostics of the
+        result are marked as timed out and not converged.
+    :type timeout: float
+    :param ycov: Optional. Covariance of the y values of the selected records, for
+        correlated y errors. Either a :class:`DenseCovariance`,
+        :class:`BandedCovariance`, :class:`LowRankCovariance` or a dense matrix. The
+        residuals and the derivatives are whitened by the covariance, and the x values
+        are treated as exact. The y errors of the data are ignored in that case.
+    :type ycov: DenseCovariance, BandedCovariance, LowRankCovariance or np.ndarray
+    :param clip: Optional. Sigma clipping configuration. If given, records whose
+        normalized residuals are larger than ``clip.k`` are unselected from the data
+        and the rest are refitted, starting from the previous parameters, until the
+        selection does not change. The residuals are normalized by the y errors,
+        including propagated x errors, or by their root mean square if the data has
+        no y errors. Rejected records may be selected back in later iterations. The
+        timeout applies to all the refits together.
+    :type clip: SigmaClip
+    :param tolerance: Optional. Relative tolerance of chi squared and of the
+        parameters for convergence. If None, use the defaults of ODR.
+    :type tolerance: float
+    :param engine: The fitting algorithm. One of:
+
+        * "odr": *scipy*'s ODR, the default.
+        * "least_squares": *scipy*'s trust region reflective ``least_squares``.
+          Sparse a derivatives are supported.
+        * "linear": Closed-form weighted least squares, for functions which are
+          linear in their parameters, such as :func:`polynomial`. The y covariance is
+          not supported.
+        * "auto": ODR unless the x values are treated as exact by it, that is, when
+          the data has no x errors and ``exact_x`` is set or there is a y
+          covariance. Otherwise, the linear engine for functions which are declared
+          linear in their parameters, such as :func:`polynomial`, and least squares
+          for the rest.
+
+        All engines other than ODR treat the x values as exact, as if ``exact_x``
+        was set, and ignore the x errors. The maximum number of iterations bounds
+        the number of function evaluations of least squares.
+    :type engine: str
+    :param condition: Whether to fit in a frame where the x and y values are centred
+        by their means and scaled by their standard deviations. Use it when the
+        values are very large or very small, e.g. polynomials of x around 1e4. The
+        parameters and their covariance are mapped back exactly, so the result is
+        the same as without conditioning, up to the convergence of the algorithm.
+        Supported by functions with a rescaling, such as :func:`polynomial`,
+        :func:`exponential` and the power functions, without fixed parameters or y
+        covariance.
+    :type condition: bool
+    :param exact_x: Whether to treat the x values as exact when the data has no x
+        errors, and run ODR in ordinary least squares mode. It is faster, but the
+        result may differ from the default, in which the x values of data without x
+        errors are given unit errors.
+    :type exact_x: bool
+    :returns: FittingResult. When clipping, a :class:`ClippedFittingResult` with the
+        indices of the rejected records.
+    :raises FittingError: Raised when missing information for the fitting
+        algorithm, when the covariance does not match the data, when the engine is
+        unknown or cannot fit the data or when the fit cannot be conditioned.
     """
-    if data.x is None:
+    x, y = data.x, data.y
+    if x is None:
         raise FittingError("Cannot fit data without x values")
-    if data.y is None:
+    if y is None:
         raise FittingError("Cannot fit data without y values")
-    model = Model(
-        **__get_odr_model_kwargs(
-            func,
+    if clip is not None:
+        if ycov is not None:
+            raise FittingError("Cannot clip records of data with y covariance")
+        return __fit_with_clipping(
+            data=data,
+            func=func,
+            clip=clip,
+            a0=a0,
             use_x_derivative=use_x_derivative,
             use_a_derivative=use_a_derivative,
+            max_iterations=max_iterations,
+            timeout=timeout,
+            tolerance=tolerance,
+            engine=engine,
+            condition=condition,
+            exact_x=exact_x,
         )
+    return _fit_arrays(
+        func=func,
+        x=x,
+        y=y,
+        xerr=data.xerr,
+        yerr=data.yerr,
+        a0=a0,
+        use_x_derivative=use_x_derivative,
+        use_a_derivative=use_a_derivative,
+        max_iterations=max_iterations,
+        timeout=timeout,
+        ycov=ycov,
+        tolerance=tolerance,
+        engine=engine,
+        condition=condition,
+        exact_x=exact_x,
     )
-    a0 = __get_a0(n=func.active_parameters, a0=a0)
-    real_data = RealData(x=data.x, y=data.y, sx=data.xerr, sy=data.yerr)
-    odr = ODR(data=real_data, model=model, beta0=a0)
-    output = odr.run()
+
+
+def _fit_arrays(  # pylint: disable=invalid-name,too-many-arguments,too-many-locals
+    func: FittingFunction,
+    x: np.ndarray,
+    y: np.ndarray,
+    xerr: Optional[np.ndarray] = None,
+    yerr: Optional[np.ndarray] = None,
+    a0: Optional[np.ndarray] = None,
+    use_x_derivative: bool = True,
+    use_a_derivative: bool = True,
+    max_iterations: Optional[int] = None,
+    timeout: Optional[float] = None,
+    ycov: Optional[Union[YCovariance, np.ndarray]] = None,
+    tolerance: Optional[float] = None,
+    engine: str = "odr",
+    condition: bool = False,
+    exact_x: bool = False,
+    normalized: bool = False,
+) -> FittingResult:
+    # Fit raw arrays, for callers which already extracted the data from a
+    # FittingData instance and fit it repeatedly. Normalized parameters are of order
+    # 1, as they are after conditioning, so ODR should not scale them by their
+    # initial values, which may be almost 0.
+    start_time = time.perf_counter()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    if isinstance(ycov, np.ndarray):
+        ycov = DenseCovariance(ycov)
+    if ycov is not None and ycov.size != len(y):
+        raise FittingError(f"Expected covariance of {len(y)} records, got {ycov.size}")
+    if condition:
+        return __fit_conditioned(
+            func=func,
+            x=x,
+            y=y,
+            xerr=xerr,
+            yerr=yerr,
+            a0=a0,
+            ycov=ycov,
+            start_time=start_time,
+            use_x_derivative=use_x_derivative,
+            use_a_derivative=use_a_derivative,
+            max_iterations=max_iterations,
+            timeout=timeout,
+            tolerance=tolerance,
+            engine=engine,
+            exact_x=exact_x,
+        )
+    engine = __select_engine(engine, func=func, xerr=xerr, ycov=ycov, exact_x=exact_x)
+    if engine == "linear":
+        return _fit_linear(func=func, x=x, y=y, yerr=yerr, start_time=start_time)
+    a0 = __get_a0(func=func, x=x, y=y, a0=a0)
+    if engine == "least_squares":
+        return _fit_least_squares(
+            func=func,
+            x=x,
+            y=y,
+            yerr=yerr,
+            a0=a0,
+            use_a_derivative=use_a_derivative,
+            max_iterations=max_iterations,
+            tolerance=tolerance,
+            deadline=deadline,
+            ycov=ycov,
+            start_time=start_time,
+        )
+    model_kwargs = __get_odr_model_kwargs(
+        func,
+        use_x_derivative=use_x_derivative,
+        use_a_derivative=use_a_derivative,
+        reuse_out=normalized,
+    )
+    if ycov is None:
+        data = RealData(x=x, y=y, sx=xerr, sy=yerr)
+    else:
+        model_kwargs = __whiten_odr_model_kwargs(model_kwargs, ycov)
+        data = Data(x=x, y=ycov.whiten(y))
+    odr_kwargs = __get_odr_kwargs(
+        max_iterations=max_iterations,
+        tolerance=tolerance,
+        parameters=len(a0) if normalized else None,
+    )
+    ordinary_least_squares = ycov is not None or (exact_x and xerr is None)
+    if normalized and ordinary_least_squares and "fjacb" in model_kwargs:
+        # ODR takes derivatives only in pairs, and does not use the x derivative
+        # in ordinary least squares.
+        model_kwargs.setdefault("fjacd", __zero_x_derivative)
+    odr = ODR(data=data, model=Model(**model_kwargs), beta0=a0, **odr_kwargs)
+    if ordinary_least_squares:
+        # With exact x values there are no x deltas to solve for, so use ordinary
+        # least squares.
+        odr.set_job(fit_type=2)
+    use_derivatives = normalized and "fjacb" in model_kwargs and "fjacd" in model_kwargs
+    if use_derivatives:
+        # Finite differences of ODR are not accurate enough to map the covariance
+        # of conditioned fits back, so they use the derivatives.
+        odr.set_job(deriv=3)
+    run_start_time = time.perf_counter()
+    timed_out = False
+    # Only derivatives are evaluated for the same parameters as the function, so
+    # finite differences would not gain from an evaluation cache.
+    with (
+        func.evaluation_cache() if use_derivatives else nullcontext(EvaluationCache())
+    ) as cache:
+        if deadline is None:
+            output = odr.run()
+        else:
+            output, timed_out = __run_with_deadline(odr, deadline=deadline)
+    post_processing_start_time = time.perf_counter()
     a = output.beta
-    chi2 = output.sum_square  # pylint: disable=no-member
-    degrees_of_freedom = len(data.x) - func.active_parameters
-    return FittingResult(
+    chi2 = output.sum_square
+    degrees_of_freedom = len(x) - func.active_parameters
+    result = FittingResult(
         a0=a0,
         a=a,
         aerr=output.sd_beta,
@@ -62,31 +280,366 @@ def fit(  # pylint: disable=invalid-name
         degrees_of_freedom=degrees_of_freedom,
         chi2=chi2,
     )
+    iterations, function_evaluations, jacobian_evaluations = output.iwork[
+        -ODR_COUNTERS_OFFSET : -ODR_COUNTERS_OFFSET + 3
+    ]
+    result.diagnostics = FittingDiagnostics(
+        iterations=int(iterations),
+        function_evaluations=int(function_evaluations),
+        jacobian_evaluations=int(jacobian_evaluations),
+        info=int(output.info),
+        stop_reason=list(output.stopreason),
+        timed_out=timed_out,
+        cache_hits=cache.hits,
+        cache_misses=cache.misses,
+        setup_time=run_start_time - start_time,
+        run_time=post_processing_start_time - run_start_time,
+        post_processing_time=time.perf_counter() - post_processing_start_time,
+    )
+    return result
+
+
+def _effective_variance(  # pylint: disable=too-many-arguments
+    func: FittingFunction,
+    a: np.ndarray,
+    x: np.ndarray,
+    xerr: Optional[np.ndarray],
+    yerr: Optional[np.ndarray],
+    batch: bool = False,
+) -> np.ndarray:
+    # Variance of the y residuals with the x errors propagated through the x
+    # derivative, if there is one. Records without errors have unit variance. In a
+    # batch, each row of the parameters gives a row of variances.
+    variance = np.ones(np.shape(x)) if yerr is None else np.square(yerr)
+    if xerr is not None and func.x_derivative is not None:
+        x_derivative = (
+            func.x_derivative_batch(a, x) if batch else func.x_derivative(a, x)
+        )
+        variance = variance + np.square(x_derivative * xerr)
+    return variance
+
+
+def __fit_with_clipping(  # pylint: disable=invalid-name,too-many-locals
+    data: FittingData,
+    func: FittingFunction,
+    clip: SigmaClip,
+    a0: Optional[np.ndarray],
+    timeout: Optional[float] = None,
+    **kwargs,
+) -> ClippedFittingResult:
+    # Work on arrays of all records and a boolean mask, and update the selection of
+    # the data only once at the end. The timeout is shared by all the refits.
+    deadline = None if timeout is None else time.monotonic() + timeout
+    x, xerr, y, yerr = [
+        None if column is None else data.column_data(column, only_selected=False)
+        for column in (data.x_column, data.xerr_column, data.y_column, data.yerr_column)
+    ]
+    selected = np.array(data.records_indices, dtype=bool)
+    mask = selected
+
+    def fit_mask(mask, initial_a):
+        return _fit_arrays(
+            func=func,
+            x=x[mask],  # type: ignore
+            y=y[mask],  # type: ignore
+            xerr=None if xerr is None else xerr[mask],
+            yerr=None if yerr is None else yerr[mask],
+            a0=initial_a,
+            timeout=None if deadline is None else deadline - time.monotonic(),
+            **kwargs,
+        )
+
+    result = fit_mask(mask, a0)
+    iteration = 0
+    while iteration < clip.max_iterations and not result.diagnostics.timed_out:
+        variance = _effective_variance(func, result.a, x, xerr, yerr)
+        normalized_residuals = np.abs(y - func(result.a, x)) / np.sqrt(variance)
+        if yerr is None:
+            normalized_residuals /= np.sqrt(result.chi2_reduced)
+        new_mask = selected & (normalized_residuals <= clip.k)
+        if np.array_equal(new_mask, mask) or (
+            np.count_nonzero(new_mask) <= func.active_parameters
+        ):
+            break
+        mask = new_mask
+        result = fit_mask(mask, result.a)
+        iteration += 1
+    data.records_indices = mask.tolist()
+    return ClippedFittingResult(
+        a0=result.a0,
+        a=result.a,
+        aerr=result.aerr,
+        acov=result.acov,
+        degrees_of_freedom=result.degrees_of_freedom,
+        chi2=result.chi2,
+        diagnostics=result.diagnostics,
+        rejected=np.flatnonzero(selected & ~mask) + 1,
+        clip_iterations=iteration,
+    )
+
+
+def __fit_conditioned(  # pylint: disable=too-many-arguments,too-many-locals
+    func: FittingFunction,
+    x: np.ndarray,
+    y: np.ndarray,
+    xerr: Optional[np.ndarray],
+    yerr: Optional[np.ndarray],
+    a0: Optional[np.ndarray],  # pylint: disable=invalid-name
+    ycov: Optional[YCovariance],
+    start_time: float,
+    **kwargs,
+) -> FittingResult:
+    """
+    Fit centred and scaled values and map the result back to the original values.
+
+    The function is fitted to :math:`X = (x - x_{shift}) / x_{scale}` and
+    :math:`Y = (y - y_{shift}) / y_{scale}`, with errors scaled accordingly. Records
+    without errors get unit errors, scaled as well, so chi squared is unchanged.
+    X values which are treated as exact stay without errors.
+    The parameters are mapped back by the rescaling of the function, and the
+    covariance by its derivative.
+
+    :param func: The fitted function
+    :param x: X values of the fitted data
+    :param y: Y values of the fitted data
+    :param xerr: X errors of the fitted data
+    :param yerr: Y errors of the fitted data
+    :param a0: Initial parameters value. Optional
+    :param ycov: Covariance of y
+    :param start_time: Start time of the fit
+    :param kwargs: Arguments of the fitting algorithm
+    :return: FittingResult
+    :raises FittingError: Raised when the fit cannot be conditioned
+    """
+    if func.rescale is None:
+        raise FittingError(f'Cannot condition "{func.name}" since it has no rescaling')
+    if len(func.fixed) != 0:
+        raise FittingError(f'Cannot condition "{func.name}" with fixed parameters')
+    if ycov is not None:
+        raise FittingError("Cannot condition data with y covariance")
+    x_shift, x_scale = __center_and_scale(x)
+    y_shift, y_scale = __center_and_scale(y)
+    inverse = (-x_shift / x_scale, 1 / x_scale, -y_shift / y_scale, 1 / y_scale)
+    run_start_time = time.perf_counter()
+    scaled_result = _fit_arrays(
+        func=func,
+        x=(x - x_shift) / x_scale,
+        y=(y - y_shift) / y_scale,
+        xerr=(
+            None
+            if xerr is None and kwargs.get("exact_x", False)
+            else (np.ones(np.shape(x)) if xerr is None else xerr) / x_scale
+        ),
+        yerr=(np.ones(np.shape(y)) if yerr is None else yerr) / y_scale,
+        a0=(
+            None
+            if a0 is None
+            else func.rescale(a0, x_shift, x_scale, y_shift, y_scale)[0]
+        ),
+        normalized=True,
+        **kwargs,
+    )
+    post_processing_start_time = time.perf_counter()
+    a, jacobian = func.rescale(scaled_result.a, *inverse)
+    acov = jacobian @ scaled_result.acov @ jacobian.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        aerr = np.sqrt(
+            np.diag(acov) * scaled_result.chi2 / scaled_result.degrees_of_freedom
+        )
+    result = FittingResult(
+        a0=func.rescale(scaled_result.a0, *inverse)[0] if a0 is None else a0,
+        a=a,
+        aerr=aerr,
+        acov=acov,
+        degrees_of_freedom=scaled_result.degrees_of_freedom,
+        chi2=scaled_result.chi2,
+    )
+    result.diagnostics = scaled_result.diagnostics
+    result.diagnostics.setup_time += run_start_time - start_time
+    result.diagnostics.post_processing_time += (
+        time.perf_counter() - post_processing_start_time
+    )
+    return result
+
+
+def __center_and_scale(values: np.ndarray) -> Tuple[float, float]:
+    """
+    Mean and standard deviation of values, for conditioning.
+
+    :param values: Values to center and scale
+    :return: shift and scale. The scale is 1 if all values are equal.
+    """
+    scale = float(np.std(values))
+    return float(np.mean(values)), scale if scale > 0 else 1.0
+
+
+def __select_engine(
+    engine: str,
+    func: FittingFunction,
+    xerr: Optional[np.ndarray],
+    ycov: Optional[YCovariance],
+    exact_x: bool,
+) -> str:
+    """
+    Validate the requested engine and resolve "auto" into a specific engine.
+
+    :param engine: Requested engine
+    :param func: The fitted function
+    :param xerr: X errors of the fitted data
+    :param ycov: Covariance of y
+    :param exact_x: Whether to treat the x values as exact when there are no x errors
+    :return: str
+    :raises FittingError: Raised when the engine is unknown or cannot fit the data
+    """
+    if engine not in ENGINES:
+        raise FittingError(
+            f'Unknown engine "{engine}". Should be one of {", ".join(ENGINES)}'
+        )
+    if engine == "linear":
+        if ycov is not None:
+            raise FittingError(
+                "Cannot fit data with y covariance using the linear engine"
+            )
+        if not IncrementalLinearFit.is_linear(func):
+            raise FittingError(
+                f'Cannot fit "{func.name}" using the linear engine '
+                "since it is not linear in its parameters"
+            )
+    if engine != "auto":
+        return engine
+    # The other engines treat the x values as exact, which ODR does only without x
+    # errors when asked to, or when fitting with a y covariance.
+    if xerr is not None or not (exact_x or ycov is not None):
+        return "odr"
+    if (
+        ycov is None
+        and func.linear_in_parameters
+        and IncrementalLinearFit.is_linear(func)
+    ):
+        return "linear"
+    return "least_squares"
 
 
 def __get_odr_model_kwargs(
     func: FittingFunction,
     use_x_derivative: bool = True,
     use_a_derivative: bool = True,
+    reuse_out: bool = False,
 ) -> Dict[str, Any]:
+    # ODR evaluates the derivatives in each iteration only in conditioned fits.
+    # Otherwise they are evaluated once, to check their shapes.
+    reuse_out = reuse_out and func.derivatives_out
     kwargs: Dict[str, Any] = dict(fcn=func)
     if use_a_derivative and func.a_derivative is not None:
         kwargs["fjacb"] = func.a_derivative
+        if reuse_out:
+            kwargs["fjacb"] = _reuse_out(func.a_derivative, func.active_parameters)
     if use_x_derivative and func.x_derivative is not None:
         kwargs["fjacd"] = func.x_derivative
+        if reuse_out:
+            kwargs["fjacd"] = _reuse_out(func.x_derivative)
     return kwargs
 
 
+def __get_odr_kwargs(
+    max_iterations: Optional[int],
+    tolerance: Optional[float],
+    parameters: Optional[int],
+) -> Dict[str, Any]:
+    """
+    Keyword arguments of ODR which control convergence.
+
+    :param max_iterations: Maximum number of iterations. Optional
+    :param tolerance: Relative tolerance of chi squared and of the parameters.
+        Optional
+    :param parameters: Number of normalized parameters, which are scaled by 1
+        instead of by their initial values. Optional
+    :return: dict
+    """
+    odr_kwargs: Dict[str, Any] = {}
+    if max_iterations is not None:
+        odr_kwargs["maxit"] = max_iterations
+    if tolerance is not None:
+        odr_kwargs["sstol"] = tolerance
+        odr_kwargs["partol"] = tolerance
+    if parameters is not None:
+        odr_kwargs["sclb"] = np.ones(parameters)
+    return odr_kwargs
+
+
+def __zero_x_derivative(  # pylint: disable=unused-argument
+    a: np.ndarray, x: np.ndarray
+) -> np.ndarray:
+    """
+    X derivative placeholder for ordinary least squares.
+
+    :param a: Parameters
+    :param x: X values
+    :return: np.ndarray
+    """
+    return np.zeros(np.shape(x))
+
+
+def __whiten_odr_model_kwargs(
+    kwargs: Dict[str, Any], ycov: YCovariance
+) -> Dict[str, Any]:
+    """
+    Whiten the model and its a derivative by the covariance of y.
+
+    The x derivative is dropped since x values are treated as exact.
+
+    :param kwargs: ODR model keyword arguments
+    :param ycov: Covariance of y
+    :return: dict
+    """
+    fcn, fjacb = kwargs["fcn"], kwargs.get("fjacb")
+    whitened_kwargs: Dict[str, Any] = dict(fcn=lambda a, x: ycov.whiten(fcn(a, x)))
+    if fjacb is not None:
+        whitened_kwargs["fjacb"] = lambda a, x: ycov.whiten(fjacb(a, x))
+    return whitened_kwargs
+
+
 def __get_a0(  # pylint: disable=invalid-name
-    n: int, a0: Optional[np.ndarray] = None
+    func: FittingFunction,
+    x: np.ndarray,
+    y: np.ndarray,
+    a0: Optional[np.ndarray] = None,
 ) -> np.ndarray:
     """
     Returns initial parameters for fitting algorithm.
 
-    :param n: Number of parameters
+    :param func: The fitted function
+    :param x: X values of the fitted data
+    :param y: Y values of the fitted data
     :param a0: Initial parameters value. Optional
     :return: nd.array
     """
     if a0 is not None:
         return a0
-    return np.full(shape=n, fill_value=1.0)
+    if func.initial_guess is not None:
+        guess = func.initial_guess(x, y)
+        if np.all(np.isfinite(guess)):
+            return guess
+    return np.full(shape=func.active_parameters, fill_value=1.0)
+
+
+def __run_with_deadline(odr: ODR, deadline: float):
+    """
+    Run ODR in chunks of iterations, checking the deadline between them.
+
+    :param odr: ODR instance to run
+    :param deadline: Deadline, in terms of :func:`time.monotonic`
+    :return: ODR output of the last iteration, and whether the deadline passed
+        before convergence.
+    """
+    remaining = DEFAULT_MAX_ITERATIONS if odr.maxit is None else odr.maxit
+    odr.maxit = min(remaining, DEADLINE_CHECK_ITERATIONS)
+    output = odr.run()
+    remaining -= odr.maxit
+    while output.info % 10 == 4 and remaining > 0:
+        if time.monotonic() > deadline:
+            return output, True
+        iterations = min(remaining, DEADLINE_CHECK_ITERATIONS)
+        output = odr.restart(iter=iterations)
+        remaining -= iterations
+    return output, False
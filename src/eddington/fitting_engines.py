@@ -0,0 +1,206 @@
+"""Fitting engines which are alternatives to ODR, sharing its result fields."""
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from scipy.optimize import approx_fprime, least_squares
+
+from eddington.covariance import YCovariance
+from eddington.fitting_function_class import FittingFunction
+from eddington.fitting_result import FittingDiagnostics, FittingResult
+from eddington.incremental_fitting import IncrementalLinearFit
+
+# Termination codes of least_squares, mapped to the termination codes of ODR, so that
+# the diagnostics of all engines are interpreted the same way.
+LEAST_SQUARES_INFO = {-1: 5, 0: 4, 1: 1, 2: 1, 3: 2, 4: 3}
+
+
+class _DeadlineExceeded(Exception):
+    """Raised by the residuals of least_squares when the deadline passes."""
+
+
+def _reuse_out(derivative: Callable, rows: Optional[int] = None) -> Callable:
+    """
+    Evaluate a derivative into the same out array in each iteration.
+
+    The fitting algorithms copy or whiten the values returned by the derivatives, so
+    the array is not allocated again in each iteration.
+
+    :param derivative: A derivative of the fitting function which accepts an out
+        array
+    :param rows: Number of rows of the derivative. None for the x derivative
+    :return: callable
+    """
+    buffers: Dict[Tuple[int, ...], np.ndarray] = {}
+
+    def derivative_into_buffer(a, x):
+        shape = np.shape(x) if rows is None else (rows, *np.shape(x))
+        if shape not in buffers:
+            buffers[shape] = np.empty(shape)
+        return derivative(a, x, out=buffers[shape])
+
+    return derivative_into_buffer
+
+
+def _fit_least_squares(  # pylint: disable=too-many-arguments,too-many-locals
+    func: FittingFunction,
+    x: np.ndarray,
+    y: np.ndarray,
+    yerr: Optional[np.ndarray],
+    a0: np.ndarray,  # pylint: disable=invalid-name
+    use_a_derivative: bool,
+    max_iterations: Optional[int],
+    tolerance: Optional[float],
+    deadline: Optional[float],
+    ycov: Optional[YCovariance],
+    start_time: float,
+) -> FittingResult:
+    # Trust region reflective least squares. X values are treated as exact. Sparse
+    # a derivatives are passed on as sparse Jacobians, which least_squares solves
+    # iteratively.
+    if ycov is None:
+        weights = sparse.diags(np.ones(len(y)) if yerr is None else 1 / yerr)
+
+        def whiten(values):
+            return weights @ values
+
+    else:
+
+        def whiten(values):
+            return ycov.whiten(values.T).T
+
+    best = dict(cost=np.inf, a=np.asarray(a0, dtype=float))
+
+    def weighted_residuals(a):
+        return whiten(func(a, x) - y)
+
+    def residuals(a):
+        if deadline is not None and time.monotonic() > deadline:
+            raise _DeadlineExceeded()
+        values = weighted_residuals(a)
+        cost = 0.5 * float(np.dot(values, values))
+        if cost < best["cost"]:
+            best.update(cost=cost, a=a.copy())
+        return values
+
+    a_derivative = func.a_derivative
+    if func.derivatives_out:
+        a_derivative = _reuse_out(func.a_derivative, func.active_parameters)
+
+    def jacobian(a):
+        derivative = a_derivative(a, x)
+        if not sparse.issparse(derivative):
+            derivative = np.reshape(derivative, (len(a), -1))
+        return whiten(derivative.T)
+
+    has_jacobian = use_a_derivative and func.a_derivative is not None
+    options = {}
+    if tolerance is not None:
+        options.update(ftol=tolerance, xtol=tolerance)
+    run_start_time = time.perf_counter()
+    with func.evaluation_cache() as cache:
+        try:
+            output = least_squares(
+                residuals,
+                best["a"],
+                jac=jacobian if has_jacobian else "2-point",
+                method="trf",
+                max_nfev=max_iterations,
+                **options,
+            )
+        except _DeadlineExceeded:
+            output = None
+    post_processing_start_time = time.perf_counter()
+    if output is None:
+        a = best["a"]
+        jacobian_matrix = (
+            jacobian(a) if has_jacobian else approx_fprime(a, weighted_residuals)
+        )
+        chi2 = float(np.sum(np.square(weighted_residuals(a))))
+        diagnostics = dict(
+            iterations=0,
+            function_evaluations=0,
+            jacobian_evaluations=0,
+            info=4,
+            stop_reason=["Deadline exceeded"],
+            timed_out=True,
+        )
+    else:
+        a, jacobian_matrix, chi2 = output.x, output.jac, 2 * float(output.cost)
+        diagnostics = dict(
+            iterations=int(output.njev),
+            function_evaluations=int(output.nfev),
+            jacobian_evaluations=int(output.njev) if has_jacobian else 0,
+            info=LEAST_SQUARES_INFO[output.status],
+            stop_reason=[output.message],
+            timed_out=False,
+        )
+    result = _weighted_least_squares_result(
+        a0=a0,
+        a=a,
+        jacobian=jacobian_matrix,
+        chi2=chi2,
+        degrees_of_freedom=len(x) - func.active_parameters,
+    )
+    result.diagnostics = FittingDiagnostics(
+        cache_hits=cache.hits,
+        cache_misses=cache.misses,
+        setup_time=run_start_time - start_time,
+        run_time=post_processing_start_time - run_start_time,
+        post_processing_time=time.perf_counter() - post_processing_start_time,
+        **diagnostics,
+    )
+    return result
+
+
+def _fit_linear(
+    func: FittingFunction,
+    x: np.ndarray,
+    y: np.ndarray,
+    yerr: Optional[np.ndarray],
+    start_time: float,
+) -> FittingResult:
+    # Closed-form weighted least squares of a linear-in-parameters function. X
+    # values are treated as exact.
+    incremental_fit = IncrementalLinearFit(func)
+    run_start_time = time.perf_counter()
+    incremental_fit.update(x=x, y=y, yerr=yerr)
+    post_processing_start_time = time.perf_counter()
+    result = incremental_fit.result()
+    result.diagnostics = FittingDiagnostics(
+        iterations=1,
+        function_evaluations=1,
+        jacobian_evaluations=1,
+        info=1,
+        stop_reason=["Closed-form solution"],
+        setup_time=run_start_time - start_time,
+        run_time=post_processing_start_time - run_start_time,
+        post_processing_time=time.perf_counter() - post_processing_start_time,
+    )
+    return result
+
+
+def _weighted_least_squares_result(  # pylint: disable=invalid-name
+    a0: np.ndarray,
+    a: np.ndarray,
+    jacobian,
+    chi2: float,
+    degrees_of_freedom: int,
+) -> FittingResult:
+    # The covariance is the inverse of the Fisher information, and the errors are
+    # scaled by the reduced chi squared, as ODR does.
+    fisher = jacobian.T @ jacobian
+    if sparse.issparse(fisher):
+        fisher = fisher.toarray()
+    acov = np.linalg.pinv(np.asarray(fisher))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        aerr = np.sqrt(np.diag(acov) * chi2 / degrees_of_freedom)
+    return FittingResult(
+        a0=a0,
+        a=a,
+        aerr=aerr,
+        acov=acov,
+        degrees_of_freedom=degrees_of_freedom,
+        chi2=chi2,
+    )
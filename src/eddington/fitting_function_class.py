@@ -1,16 +1,23 @@
 """Fitting function to evaluate with the fitting algorithm."""
+import contextlib
 import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import InitVar, dataclass, field
-from typing import Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 
+from eddington.evaluation_cache import DEFAULT_EVALUATION_CACHE_SIZE, EvaluationCache
 from eddington.exceptions import FittingFunctionRuntimeError
 from eddington.fitting_functions_registry import FittingFunctionsRegistry
 
+# 64K float64 values, 512KB per block, which fits in the cache of a core.
+DEFAULT_THREADS_CHUNK_SIZE = 2**16
+
 
 @dataclass(unsafe_hash=True)
-class FittingFunction:
+class FittingFunction:  # pylint: disable=too-many-instance-attributes
     """
     Fitting function class.
 
@@ -36,6 +43,26 @@ class FittingFunction:
     :param x_derivative: a function representing the derivative of fit_func according
         to x
     :type x_derivative: callable
+    :param initial_guess: a function estimating the parameters of fit_func from x and
+        y values. Used by the fitting algorithm when no initial guess is given.
+    :type initial_guess: callable
+    :param rescale: a function mapping the parameters of fit_func to the parameters
+        of the same function of centred and scaled x and y values, together with its
+        derivative. Used by the fitting algorithm for conditioning. See
+        :mod:`eddington.rescaling`.
+    :type rescale: callable
+    :param vectorized: Do fit_func and its derivatives broadcast when each parameter
+        is given as a column. If so, they are evaluated for many parameter vectors at
+        once by a single call.
+    :type vectorized: bool
+    :param derivatives_out: Do the derivatives accept an ``out`` keyword argument, an
+        array into which they write their values instead of allocating a new one. If
+        not, values are copied into the ``out`` array given to the derivatives.
+    :type derivatives_out: bool
+    :param linear_in_parameters: Is the function linear in its parameters, with an a
+        derivative which does not depend on them. If so, it is fitted in closed form
+        when the fitting engine is chosen automatically.
+    :type linear_in_parameters: bool
     :param save: Should this function be saved in the :class:`FittingFunctionsRegistry`
     :type save: bool
     """
@@ -46,7 +73,25 @@ class FittingFunction:
     syntax: Optional[str] = field(default=None)
     a_derivative: Optional[Callable] = field(default=None, repr=False)
     x_derivative: Optional[Callable] = field(default=None, repr=False)
+    initial_guess: Optional[Callable] = field(default=None, repr=False)
+    rescale: Optional[Callable] = field(default=None, repr=False)
+    vectorized: bool = field(default=False, repr=False)
+    derivatives_out: bool = field(default=False, repr=False)
+    linear_in_parameters: bool = field(default=False, repr=False)
     fixed: Dict[int, float] = field(init=False, repr=False, default_factory=dict)
+    _factory: Optional[Tuple[Callable, Tuple[Any, ...]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    threads: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    threads_chunk_size: int = field(
+        default=DEFAULT_THREADS_CHUNK_SIZE, init=False, repr=False, compare=False
+    )
+    _executor: Optional[ThreadPoolExecutor] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _local: threading.local = field(
+        default_factory=threading.local, init=False, repr=False, compare=False
+    )
     save: InitVar[bool] = True
 
     def __post_init__(self, save):
@@ -59,6 +104,7 @@ def __post_init__(self, save):
         """
         self.x_derivative = self.__wrap_x_derivative(self.x_derivative)
         self.a_derivative = self.__wrap_a_derivative(self.a_derivative)
+        self.initial_guess = self.__wrap_initial_guess(self.initial_guess)
         if save:
             FittingFunctionsRegistry.add(self)
 
@@ -72,6 +118,37 @@ def title_name(self):
         """
         return self.name.title().replace("_", " ")
 
+    def __reduce__(self):
+        """
+        Reduce the fitting function in order to pickle it.
+
+        The wrapped callables of the function cannot be pickled. Instead, the function
+        is rebuilt by the factory which generated it, or loaded by name from the
+        registry, and then its fixed parameters and threads are restored.
+
+        :return: Callable rebuilding the function and its arguments
+        :rtype: tuple
+        :raises FittingFunctionRuntimeError: Raised when the function can neither be
+            rebuilt nor loaded from the registry.
+        """
+        factory = self._factory
+        if (
+            factory is None
+            and FittingFunctionsRegistry.exists(self.name)
+            and FittingFunctionsRegistry.load(self.name) is self
+        ):
+            factory = (FittingFunctionsRegistry.load, (self.name,))
+        if factory is None:
+            raise FittingFunctionRuntimeError(
+                f'Cannot pickle "{self.name}" since it is not saved in the registry'
+            )
+        return _rebuild_fitting_function, (
+            *factory,
+            dict(self.fixed),
+            self.threads,
+            self.threads_chunk_size,
+        )
+
     def __validate_parameters_number(self, a):
         a_length = len(a)
         if a_length != self.n:
@@ -90,7 +167,60 @@ def __call__(self, *args):
         """
         a, x = self.__extract_a_and_x(args)
         self.__validate_parameters_number(a)
-        return self.fit_func(a, x)
+        return self.__evaluate(self.fit_func, a, x)
+
+    def evaluate_batch(self, a: np.ndarray, x: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the function for many parameter vectors at once.
+
+        :param a: Parameter vectors of shape (k, active parameters).
+        :type a: np.ndarray
+        :param x: Values of shape (records,) shared by all vectors, or of shape
+            (k, records).
+        :type x: np.ndarray
+        :return: evaluation values of shape (k, records)
+        :rtype: np.ndarray
+        """
+        a, x, shape = self.__batch_arguments(a, x)
+        return self.__call_batch(self, a, x, shape)
+
+    def a_derivative_batch(self, a: np.ndarray, x: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the a derivative for many parameter vectors at once.
+
+        :param a: Parameter vectors of shape (k, active parameters).
+        :type a: np.ndarray
+        :param x: Values of shape (records,) shared by all vectors, or of shape
+            (k, records).
+        :type x: np.ndarray
+        :return: derivatives of shape (k, active parameters, records)
+        :rtype: np.ndarray
+        :raises FittingFunctionRuntimeError: Raised when the function has no a
+            derivative.
+        """
+        if self.a_derivative is None:
+            raise FittingFunctionRuntimeError(f'"{self.name}" has no a derivative')
+        a, x, shape = self.__batch_arguments(a, x)
+        return np.moveaxis(self.__call_batch(self.a_derivative, a, x, shape), 0, 1)
+
+    def x_derivative_batch(self, a: np.ndarray, x: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the x derivative for many parameter vectors at once.
+
+        :param a: Parameter vectors of shape (k, active parameters).
+        :type a: np.ndarray
+        :param x: Values of shape (records,) shared by all vectors, or of shape
+            (k, records).
+        :type x: np.ndarray
+        :return: derivatives of shape (k, records)
+        :rtype: np.ndarray
+        :raises FittingFunctionRuntimeError: Raised when the function has no x
+            derivative.
+        """
+        if self.x_derivative is None:
+            raise FittingFunctionRuntimeError(f'"{self.name}" has no x derivative')
+        a, x, shape = self.__batch_arguments(a, x)
+        return self.__call_batch(self.x_derivative, a, x, shape)
 
     def assign(self, a: Union[List[float], np.ndarray]) -> "FittingFunction":
         """
@@ -137,6 +267,126 @@ def unfix(self, index):
         del self.fixed[index]
         return self
 
+    def set_threads(
+        self,
+        threads: Optional[int],
+        chunk_size: int = DEFAULT_THREADS_CHUNK_SIZE,
+    ) -> "FittingFunction":
+        """
+        Evaluate the function and its derivatives in a pool of threads.
+
+        Arrays of x values longer than the chunk size are split into chunks which
+        are evaluated concurrently, and their values are written into a single
+        preallocated output array. Since *numpy* releases the GIL in its array
+        operations, large evaluations scale with the number of cores. The function
+        and its derivatives should evaluate each x value independently of the others,
+        as all the out-of-the-box fitting functions do.
+
+        :param threads: Number of threads. If None or 1, evaluate in the calling
+            thread.
+        :type threads: int
+        :param chunk_size: Number of x values evaluated by a single task.
+        :type chunk_size: int
+        :return: self
+        :rtype: FittingFunction
+        :raises FittingFunctionRuntimeError: Raised when the chunk size is not
+            positive.
+        """
+        if chunk_size <= 0:
+            raise FittingFunctionRuntimeError(
+                f"Chunk size should be positive, got {chunk_size}"
+            )
+        self.close()
+        self.threads = threads if threads is not None and threads > 1 else None
+        self.threads_chunk_size = chunk_size
+        return self
+
+    def close(self):
+        """
+        Shut down the pool of threads of the function and wait for its threads.
+
+        The number of threads is kept, so a later evaluation starts a new pool. The
+        function can also be used as a context manager, which closes it on exit.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "FittingFunction":
+        """
+        Enter the context of the function.
+
+        :return: self
+        :rtype: FittingFunction
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Close the function on exit of its context.
+
+        :param exc_type: Type of the raised exception, if any
+        :param exc_val: The raised exception, if any
+        :param exc_tb: Traceback of the raised exception, if any
+        """
+        self.close()
+
+    @contextlib.contextmanager
+    def evaluation_cache(
+        self, size: int = DEFAULT_EVALUATION_CACHE_SIZE
+    ) -> Iterator[EvaluationCache]:
+        """
+        Share intermediate values between the function and its derivatives.
+
+        While in this context, intermediate values which the function and its
+        derivatives get by :meth:`intermediate` are computed once for the same
+        parameters and x values. The fitting algorithm uses a new cache in each fit.
+        The cache is used only by the calling thread, so chunks of x values which are
+        evaluated on worker threads, see :meth:`set_threads`, compute their
+        intermediate values in each call.
+
+        :param size: Maximal number of values kept in the cache.
+        :type size: int
+        :yield: The cache, which counts its hits and misses
+        :ytype: EvaluationCache
+        """
+        previous_cache = getattr(self._local, "cache", None)
+        cache = EvaluationCache(size=size)
+        self._local.cache = cache
+        try:
+            yield cache
+        finally:
+            self._local.cache = previous_cache
+
+    def intermediate(
+        self,
+        name: str,
+        a: np.ndarray,
+        x: Union[np.ndarray, float],
+        compute: Callable[[np.ndarray, Union[np.ndarray, float]], Any],
+    ) -> Any:
+        """
+        Get an intermediate value which is shared by the function and its derivatives.
+
+        The value is taken from the evaluation cache if there is one. Otherwise, it is
+        computed. Since the value may be shared, it should not be changed in place.
+
+        :param name: Name of the intermediate value
+        :type name: str
+        :param a: Parameters of the function, including the fixed ones
+        :type a: np.ndarray
+        :param x: X values
+        :type x: float or np.ndarray
+        :param compute: Callable computing the value from the parameters and the x
+            values
+        :type compute: callable
+        :return: the intermediate value
+        """
+        cache = getattr(self._local, "cache", None)
+        if cache is None:
+            return compute(a, x)
+        return cache.get(name, a, x, compute)
+
     def clear_fixed(self) -> "FittingFunction":
         """
         Clear all fixed parameters.
@@ -161,11 +411,13 @@ def __wrap_x_derivative(self, method):
         if method is None:
             return None
 
+        method = self.__accept_out(method)
+
         @functools.wraps(method)
-        def wrapper(*args):
+        def wrapper(*args, out=None):
             a, x = self.__extract_a_and_x(args)
             self.__validate_parameters_number(a)
-            return method(a, x)
+            return self.__evaluate(method, a, x, out=out)
 
         return wrapper
 
@@ -173,14 +425,44 @@ def __wrap_a_derivative(self, method):
         if method is None:
             return None
 
+        method = self.__accept_out(method)
+
         @functools.wraps(method)
-        def wrapper(*args):
+        def wrapper(*args, out=None):
             a, x = self.__extract_a_and_x(args)
             self.__validate_parameters_number(a)
+            if len(self.fixed) == 0:
+                return self.__evaluate(method, a, x, out=out)
+            result = self.__evaluate(method, a, x)
+            active = [i for i in range(self.n) if i not in self.fixed]
+            return np.take(result, active, axis=0, out=out)
+
+        return wrapper
+
+    def __accept_out(self, method):
+        if self.derivatives_out:
+            return method
+
+        @functools.wraps(method)
+        def wrapper(a, x, out=None):
             result = method(a, x)
+            if out is None:
+                return result
+            out[...] = result
+            return out
+
+        return wrapper
+
+    def __wrap_initial_guess(self, method):
+        if method is None:
+            return None
+
+        @functools.wraps(method)
+        def wrapper(x, y):
+            result = np.asarray(method(x, y), dtype=float)
             if len(self.fixed) == 0:
                 return result
-            return np.delete(result, list(self.fixed.keys()), axis=0)
+            return np.delete(result, list(self.fixed.keys()))
 
         return wrapper
 
@@ -197,12 +479,70 @@ def __extract_a_and_x(self, args):
             x = args[1]
         return a, x
 
+    def __evaluate(self, method, a, x, out=None):
+        # The out array is only given to the derivatives, which accept it.
+        kwargs = {} if out is None else dict(out=out)
+        chunk_size = self.threads_chunk_size
+        if self.threads is None or np.ndim(x) != 1 or len(x) <= chunk_size:
+            return method(a, x, **kwargs)
+        write_in_place = out is not None
+        if write_in_place:
+            method(a, x[:chunk_size], out=out[..., :chunk_size])
+        else:
+            first = method(a, x[:chunk_size])
+            if not isinstance(first, np.ndarray) or first.shape[-1:] != (chunk_size,):
+                # Values which do not follow the x values, such as sparse
+                # derivatives, cannot be assembled from chunks.
+                return method(a, x)
+            out = np.empty(first.shape[:-1] + (len(x),), dtype=first.dtype)
+            out[..., :chunk_size] = first
+
+        def fill(start):
+            chunk = slice(start, start + chunk_size)
+            if write_in_place:
+                method(a, x[chunk], out=out[..., chunk])
+            else:
+                out[..., chunk] = method(a, x[chunk])
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.threads, thread_name_prefix=f"eddington-{self.name}"
+            )
+        for _ in self._executor.map(fill, range(chunk_size, len(x), chunk_size)):
+            pass
+        return out
+
+    def __batch_arguments(self, a, x):
+        a = np.asarray(a, dtype=float)
+        if a.ndim != 2 or a.shape[1] != self.active_parameters:
+            raise FittingFunctionRuntimeError(
+                f"Input shape should be (k, {self.active_parameters}), got {a.shape}"
+            )
+        x = np.atleast_1d(np.asarray(x, dtype=float))
+        return a, x, np.broadcast_shapes((a.shape[0], 1), x.shape)
+
+    def __call_batch(self, method, a, x, shape):
+        x_rows = np.broadcast_to(x, shape)
+        if self.vectorized:
+            return method(a.T[..., None], x_rows)
+        return np.stack(
+            [method(a_row, x_row) for a_row, x_row in zip(a, x_rows)], axis=-2
+        )
+
     def __add_fixed_values(self, a):
         for i in sorted(self.fixed.keys()):
-            a = np.insert(a, i, self.fixed[i])
+            a = np.insert(a, i, self.fixed[i], axis=0)
         return a
 
 
+def _rebuild_fitting_function(
+    factory, args, fixed, threads=None, threads_chunk_size=DEFAULT_THREADS_CHUNK_SIZE
+):
+    func = factory(*args)
+    func.fixed = fixed
+    return func.set_threads(threads, chunk_size=threads_chunk_size)
+
+
 def fitting_function(  # pylint: disable=too-many-arguments
     n: int,
     name: Optional[str] = None,
@@ -213,6 +553,15 @@ def fitting_function(  # pylint: disable=too-many-arguments
     x_derivative: Optional[
         Callable[[np.ndarray, Union[np.ndarray, float]], Union[np.ndarray, float]]
     ] = None,
+    initial_guess: Optional[Callable[[np.ndarray, np.ndarray], np.ndarray]] = None,
+    rescale: Optional[
+        Callable[
+            [np.ndarray, float, float, float, float], Tuple[np.ndarray, np.ndarray]
+        ]
+    ] = None,
+    vectorized: bool = False,
+    derivatives_out: bool = False,
+    linear_in_parameters: bool = False,
     save: bool = True,
 ) -> Callable[
     [Callable[[np.ndarray, Union[np.ndarray, float]], Union[np.ndarray, float]]],
@@ -233,6 +582,21 @@ def fitting_function(  # pylint: disable=too-many-arguments
     :type a_derivative: callable
     :param x_derivative: a function representing the derivative of the fitting function
         according to x
+    :param initial_guess: a function estimating the parameters of the fitting
+        function from x and y values
+    :type initial_guess: callable
+    :param rescale: a function mapping the parameters of the fitting function to the
+        parameters of the same function of centred and scaled x and y values, together
+        with its derivative
+    :type rescale: callable
+    :param vectorized: Do the fitting function and its derivatives broadcast when each
+        parameter is given as a column.
+    :type vectorized: bool
+    :param derivatives_out: Do the derivatives accept an ``out`` keyword argument, an
+        array into which they write their values.
+    :type derivatives_out: bool
+    :param linear_in_parameters: Is the fitting function linear in its parameters.
+    :type linear_in_parameters: bool
     :param save: Should this function be saved in the
         :class:`FittingFunctionsRegistry`
     :type save: bool
@@ -262,6 +626,11 @@ def wrapper(func):
                 syntax=syntax,
                 a_derivative=a_derivative,
                 x_derivative=x_derivative,
+                initial_guess=initial_guess,
+                rescale=rescale,
+                vectorized=vectorized,
+                derivatives_out=derivatives_out,
+                linear_in_parameters=linear_in_parameters,
                 save=save,
             )
         )
@@ -4,7 +4,7 @@
 from typing import Dict, Union
 
 import numpy as np
-from sympy import Expr, Symbol, diff
+from sympy import Expr, Symbol, diff, lambdify
 from sympy.parsing import parse_expr
 
 from eddington.exceptions import FittingFunctionParsingError
@@ -50,14 +50,20 @@ def parse_fitting_function(
         )
         for i in range(n)
     ]
-    return fitting_function(
+    func = fitting_function(
         n=n,
         name=name,
         syntax=syntax,
         a_derivative=lambda a, x: np.stack([a_der(a, x) for a_der in a_derivatives]),
         x_derivative=x_derivative,
+        vectorized=True,
         save=save,
     )(actual_func)
+    func._factory = (  # pylint: disable=protected-access
+        parse_fitting_function,
+        (name, syntax, False),
+    )
+    return func
 
 
 def _validate_variables(variable_names, n):
@@ -92,13 +98,15 @@ def _validate_variables(variable_names, n):
 
 
 def _make_function(expr: Expr, x_var: Symbol, variables_map: Dict[str, Symbol]):
+    a_vars = [variables_map[f"a{i}"] for i in range(len(variables_map))]
+    numeric_function = lambdify([x_var, *a_vars], expr, modules=["numpy", "scipy"])
+
     def returned_function(
         a: np.ndarray, x: Union[float, np.ndarray]
     ) -> Union[float, np.ndarray]:
-        subs = [(variables_map[f"a{i}"], a_val) for i, a_val in enumerate(a)]
-        x_expr = expr.subs(subs)
+        result = numeric_function(x, *a)
         if isinstance(x, Number):
-            return float(x_expr.subs([(x_var, x)]))
-        return np.vectorize(lambda x_val: x_expr.subs([(x_var, x_val)]))(x)
+            return float(result)
+        return np.broadcast_to(result, np.broadcast(x, *a).shape).astype(float)
 
     return returned_function
@@ -6,13 +6,60 @@
 
 from eddington.exceptions import FittingFunctionLoadError
 from eddington.fitting_function_class import FittingFunction, fitting_function
+from eddington.initial_guess import (
+    cos_initial_guess,
+    exponential_initial_guess,
+    hyperbolic_initial_guess,
+    inverse_power_initial_guess,
+    normal_initial_guess,
+    poisson_initial_guess,
+    sin_initial_guess,
+    straight_power_initial_guess,
+)
+from eddington.rescaling import (
+    exponential_rescale,
+    hyperbolic_rescale,
+    inverse_power_rescale,
+    polynomial_rescale,
+    straight_power_rescale,
+)
+
+# The derivatives below write their values into an out array, which is allocated
+# when not given. Rows of the out array are taken as out[i, ...], which is a view
+# even when x is a single value, so that numpy functions can write into it.
+
+
+def _derivative_out(out, a, x, rows=None):
+    # Each parameter may be a column which broadcasts with x, as in batch
+    # evaluation.
+    if out is not None:
+        return out
+    shape = np.broadcast_shapes(np.shape(x), *(np.shape(value) for value in a))
+    return np.empty(shape if rows is None else (rows,) + shape)
+
+
+def _linear_x_derivative(a, x, out=None):
+    out = _derivative_out(out, a, x)
+    out[...] = a[1]
+    return out
+
+
+def _linear_a_derivative(a, x, out=None):
+    out = _derivative_out(out, a, x, rows=2)
+    out[0] = 1
+    out[1] = x
+    return out
 
 
 @fitting_function(
     n=2,
     syntax="a[0] + a[1] * x",
-    x_derivative=lambda a, x: np.full(shape=np.shape(x), fill_value=a[1]),
-    a_derivative=lambda a, x: np.stack([np.ones(shape=np.shape(x)), x]),
+    rescale=polynomial_rescale,
+    x_derivative=_linear_x_derivative,
+    a_derivative=_linear_a_derivative,
+    vectorized=True,
+    derivatives_out=True,
+    linear_in_parameters=True,
 )
 def linear(a: np.ndarray, x: Union[np.ndarray, float]) -> Union[np.ndarray, float]:
     """
@@ -28,11 +75,27 @@ def linear(a: np.ndarray, x: Union[np.ndarray, float]) -> Union[np.ndarray, floa
     return a[0] + a[1] * x
 
 
+def _constant_x_derivative(a, x, out=None):
+    out = _derivative_out(out, a, x)
+    out[...] = 0
+    return out
+
+
+def _constant_a_derivative(a, x, out=None):
+    out = _derivative_out(out, a, x, rows=1)
+    out[0] = 1
+    return out
+
+
 @fitting_function(
     n=1,
     syntax="a[0]",
-    x_derivative=lambda a, x: np.zeros(shape=np.shape(x)),
-    a_derivative=lambda a, x: np.stack([np.ones(shape=np.shape(x))]),
+    rescale=polynomial_rescale,
+    x_derivative=_constant_x_derivative,
+    a_derivative=_constant_a_derivative,
+    vectorized=True,
+    derivatives_out=True,
+    linear_in_parameters=True,
 )
 def constant(a: np.ndarray, x: Union[np.ndarray, float]) -> Union[np.ndarray, float]:
     """
@@ -48,11 +111,30 @@ def constant(a: np.ndarray, x: Union[np.ndarray, float]) -> Union[np.ndarray, fl
     return np.full(fill_value=a[0], shape=np.shape(x))
 
 
+def _parabolic_x_derivative(a, x, out=None):
+    out = _derivative_out(out, a, x)
+    np.multiply(2 * a[2], x, out=out)
+    out += a[1]
+    return out
+
+
+def _parabolic_a_derivative(a, x, out=None):
+    out = _derivative_out(out, a, x, rows=3)
+    out[0] = 1
+    out[1] = x
+    np.square(x, out=out[2, ...])
+    return out
+
+
 @fitting_function(
     n=3,
     syntax="a[0] + a[1] * x + a[2] * x ^ 2",
-    x_derivative=lambda a, x: a[1] + 2 * a[2] * x,
-    a_derivative=lambda a, x: np.stack([np.ones(shape=np.shape(x)), x, x**2]),
+    rescale=polynomial_rescale,
+    x_derivative=_parabolic_x_derivative,
+    a_derivative=_parabolic_a_derivative,
+    vectorized=True,
+    derivatives_out=True,
+    linear_in_parameters=True,
 )
 def parabolic(a: np.ndarray, x: Union[np.ndarray, float]) -> Union[np.ndarray, float]:
     """
@@ -68,18 +150,46 @@ def parabolic(a: np.ndarray, x: Union[np.ndarray, float]) -> Union[np.ndarray, f
     return a[0] + a[1] * x + a[2] * x**2
 
 
+def _shifted_power(a, x):
+    # (x + a[1]) ^ a[2], which is shared by the power functions and their
+    # derivatives through the evaluation cache.
+    return np.power(x + a[1], a[2])
+
+
+def _straight_power_x_derivative(a, x, out=None):
+    power = straight_power.intermediate("power", a, x, _shifted_power)
+    out = _derivative_out(out, a, x)
+    np.add(x, a[1], out=out)
+    np.divide(power, out, out=out)
+    out *= a[2] * a[0]
+    return out
+
+
+def _straight_power_a_derivative(a, x, out=None):
+    power = straight_power.intermediate("power", a, x, _shifted_power)
+    out = _derivative_out(out, a, x, rows=4)
+    base = out[1, ...]
+    np.add(x, a[1], out=base)
+    np.log(base, out=out[2, ...])
+    out[2] *= power
+    out[2] *= a[0]
+    # (x + a[1]) ^ (a[2] - 1) is the power divided by the base.
+    np.divide(power, base, out=base)
+    out[1] *= a[2] * a[0]
+    out[0] = power
+    out[3] = 1
+    return out
+
+
 @fitting_function(
     n=4,
     syntax="a[0] * (x + a[1]) ^ a[2] + a[3]",
-    x_derivative=lambda a, x: a[2] * a[0] * (x + a[1]) ** (a[2] - 1),
-    a_derivative=lambda a, x: np.stack(
-        [
-            np.power(x + a[1], a[2]),
-            a[2] * a[0] * np.power(x + a[1], a[2] - 1),
-            a[0] * np.log(x + a[1]) * np.power(x + a[1], a[2]),
-            np.ones(shape=np.shape(x)),
-        ]
-    ),
+    initial_guess=straight_power_initial_guess,
+    rescale=straight_power_rescale,
+    x_derivative=_straight_power_x_derivative,
+    a_derivative=_straight_power_a_derivative,
+    vectorized=True,
+    derivatives_out=True,
 )
 def straight_power(
     a: np.ndarray, x: Union[np.ndarray, float]
@@ -94,21 +204,43 @@ def straight_power(
     :return: evaluation value or values
     :rtype: float or np.ndarray
     """
-    return a[0] * np.power(x + a[1], a[2]) + a[3]
+    return a[0] * straight_power.intermediate("power", a, x, _shifted_power) + a[3]
+
+
+def _inverse_power_x_derivative(a, x, out=None):
+    power = inverse_power.intermediate("power", a, x, _shifted_power)
+    out = _derivative_out(out, a, x)
+    np.add(x, a[1], out=out)
+    out *= power
+    np.divide(-a[2] * a[0], out, out=out)
+    return out
+
+
+def _inverse_power_a_derivative(a, x, out=None):
+    power = inverse_power.intermediate("power", a, x, _shifted_power)
+    out = _derivative_out(out, a, x, rows=4)
+    base = out[1, ...]
+    np.add(x, a[1], out=base)
+    np.log(base, out=out[2, ...])
+    out[2] /= power
+    out[2] *= -a[0]
+    # (x + a[1]) ^ (a[2] + 1) is the power multiplied by the base.
+    base *= power
+    np.divide(-a[2] * a[0], base, out=base)
+    np.divide(1, power, out=out[0, ...])
+    out[3] = 1
+    return out
 
 
 @fitting_function(
     n=4,
     syntax="a[0] / (x + a[1]) ^ a[2] + a[3]",
-    x_derivative=lambda a, x: -a[2] * a[0] / np.power(x + a[1], a[2] + 1),
-    a_derivative=lambda a, x: np.stack(
-        [
-            1 / np.power(x + a[1], a[2]),
-            -a[2] * a[0] / np.power(x + a[1], a[2] + 1),
-            -a[0] * np.log(x + a[1]) * np.power(x + a[1], a[2]),
-            np.ones(shape=np.shape(x)),
-        ]
-    ),
+    initial_guess=inverse_power_initial_guess,
+    rescale=inverse_power_rescale,
+    x_derivative=_inverse_power_x_derivative,
+    a_derivative=_inverse_power_a_derivative,
+    vectorized=True,
+    derivatives_out=True,
 )
 def inverse_power(
     a: np.ndarray, x: Union[np.ndarray, float]
@@ -123,16 +255,37 @@ def inverse_power(
     :return: evaluation value or values
     :rtype: float or np.ndarray
     """
-    return a[0] / np.power(x + a[1], a[2]) + a[3]
+    return a[0] / inverse_power.intermediate("power", a, x, _shifted_power) + a[3]
+
+
+def _hyperbolic_x_derivative(a, x, out=None):
+    out = _derivative_out(out, a, x)
+    np.add(x, a[1], out=out)
+    np.square(out, out=out)
+    np.divide(-a[0], out, out=out)
+    return out
+
+
+def _hyperbolic_a_derivative(a, x, out=None):
+    out = _derivative_out(out, a, x, rows=3)
+    inverse = out[0, ...]
+    np.add(x, a[1], out=inverse)
+    np.reciprocal(inverse, out=inverse)
+    np.square(inverse, out=out[1, ...])
+    out[1] *= -a[0]
+    out[2] = 1
+    return out
 
 
 @fitting_function(
     n=3,
     syntax="a[0] / (x + a[1]) + a[2]",
-    x_derivative=lambda a, x: -a[0] / ((x + a[1]) ** 2),
-    a_derivative=lambda a, x: np.stack(
-        [1 / (x + a[1]), -a[0] / ((x + a[1]) ** 2), np.ones(shape=np.shape(x))]
-    ),
+    initial_guess=hyperbolic_initial_guess,
+    rescale=hyperbolic_rescale,
+    x_derivative=_hyperbolic_x_derivative,
+    a_derivative=_hyperbolic_a_derivative,
+    vectorized=True,
+    derivatives_out=True,
 )
 def hyperbolic(a: np.ndarray, x: Union[np.ndarray, float]) -> Union[np.ndarray, float]:
     """
@@ -148,13 +301,34 @@ def hyperbolic(a: np.ndarray, x: Union[np.ndarray, float]) -> Union[np.ndarray,
     return a[0] / (x + a[1]) + a[2]
 
 
+def _exponential_x_derivative(a, x, out=None):
+    out = _derivative_out(out, a, x)
+    np.multiply(a[1], x, out=out)
+    np.exp(out, out=out)
+    out *= a[0] * a[1]
+    return out
+
+
+def _exponential_a_derivative(a, x, out=None):
+    out = _derivative_out(out, a, x, rows=3)
+    growth = out[0, ...]
+    np.multiply(a[1], x, out=growth)
+    np.exp(growth, out=growth)
+    np.multiply(growth, x, out=out[1, ...])
+    out[1] *= a[0]
+    out[2] = 1
+    return out
+
+
 @fitting_function(
     n=3,
     syntax="a[0] * exp(a[1] * x) + a[2]",
-    x_derivative=lambda a, x: a[0] * a[1] * np.exp(a[1] * x),
-    a_derivative=lambda a, x: np.stack(
-        [np.exp(a[1] * x), a[0] * x * np.exp(a[1] * x), np.ones(np.shape(x))]
-    ),
+    initial_guess=exponential_initial_guess,
+    rescale=exponential_rescale,
+    x_derivative=_exponential_x_derivative,
+    a_derivative=_exponential_a_derivative,
+    vectorized=True,
+    derivatives_out=True,
 )
 def exponential(a: np.ndarray, x: Union[np.ndarray, float]) -> Union[np.ndarray, float]:
     """
@@ -170,18 +344,36 @@ def exponential(a: np.ndarray, x: Union[np.ndarray, float]) -> Union[np.ndarray,
     return a[0] * np.exp(a[1] * x) + a[2]
 
 
+def _cos_x_derivative(a, x, out=None):
+    out = _derivative_out(out, a, x)
+    np.multiply(a[1], x, out=out)
+    out += a[2]
+    np.sin(out, out=out)
+    out *= -a[0] * a[1]
+    return out
+
+
+def _cos_a_derivative(a, x, out=None):
+    out = _derivative_out(out, a, x, rows=4)
+    phase = out[2, ...]
+    np.multiply(a[1], x, out=phase)
+    phase += a[2]
+    np.cos(phase, out=out[0, ...])
+    np.sin(phase, out=phase)
+    phase *= -a[0]
+    np.multiply(phase, x, out=out[1, ...])
+    out[3] = 1
+    return out
+
+
 @fitting_function(
     n=4,
     syntax="a[0] * cos(a[1] * x + a[2]) + a[3]",
-    x_derivative=lambda a, x: -a[0] * a[1] * np.sin(a[1] * x + a[2]),
-    a_derivative=lambda a, x: np.stack(
-        [
-            np.cos(a[1] * x + a[2]),
-            -a[0] * x * np.sin(a[1] * x + a[2]),
-            -a[0] * np.sin(a[1] * x + a[2]),
-            np.ones(shape=np.shape(x)),
-        ]
-    ),
+    initial_guess=cos_initial_guess,
+    x_derivative=_cos_x_derivative,
+    a_derivative=_cos_a_derivative,
+    vectorized=True,
+    derivatives_out=True,
 )
 def cos(a: np.ndarray, x: Union[np.ndarray, float]) -> Union[np.ndarray, float]:
     """
@@ -197,18 +389,36 @@ def cos(a: np.ndarray, x: Union[np.ndarray, float]) -> Union[np.ndarray, float]:
     return a[0] * np.cos(a[1] * x + a[2]) + a[3]
 
 
+def _sin_x_derivative(a, x, out=None):
+    out = _derivative_out(out, a, x)
+    np.multiply(a[1], x, out=out)
+    out += a[2]
+    np.cos(out, out=out)
+    out *= a[0] * a[1]
+    return out
+
+
+def _sin_a_derivative(a, x, out=None):
+    out = _derivative_out(out, a, x, rows=4)
+    phase = out[2, ...]
+    np.multiply(a[1], x, out=phase)
+    phase += a[2]
+    np.sin(phase, out=out[0, ...])
+    np.cos(phase, out=phase)
+    phase *= a[0]
+    np.multiply(phase, x, out=out[1, ...])
+    out[3] = 1
+    return out
+
+
 @fitting_function(
     n=4,
     syntax="a[0] * sin(a[1] * x + a[2]) + a[3]",
-    x_derivative=lambda a, x: a[0] * a[1] * np.cos(a[1] * x + a[2]),
-    a_derivative=lambda a, x: np.stack(
-        [
-            np.sin(a[1] * x + a[2]),
-            a[0] * x * np.cos(a[1] * x + a[2]),
-            a[0] * np.cos(a[1] * x + a[2]),
-            np.ones(shape=np.shape(x)),
-        ]
-    ),
+    initial_guess=sin_initial_guess,
+    x_derivative=_sin_x_derivative,
+    a_derivative=_sin_a_derivative,
+    vectorized=True,
+    derivatives_out=True,
 )
 def sin(a: np.ndarray, x: Union[np.ndarray, float]) -> Union[np.ndarray, float]:
     """
@@ -224,20 +434,41 @@ def sin(a: np.ndarray, x: Union[np.ndarray, float]) -> Union[np.ndarray, float]:
     return a[0] * np.sin(a[1] * x + a[2]) + a[3]
 
 
+def _normal_x_derivative(a, x, out=None):
+    out = _derivative_out(out, a, x)
+    np.subtract(x, a[1], out=out)
+    out /= a[2]
+    out *= np.exp(-np.square(out))
+    out *= -2 * a[0] / a[2]
+    return out
+
+
+def _normal_a_derivative(a, x, out=None):
+    out = _derivative_out(out, a, x, rows=4)
+    # With distance = (x - a[1]) / a[2], the derivatives by a[1] and a[2] are
+    # 2 * a[0] * exp(-distance^2) * distance / a[2] and the same multiplied by
+    # the distance.
+    distance, gaussian = out[2, ...], out[0, ...]
+    np.subtract(x, a[1], out=distance)
+    distance /= a[2]
+    np.square(distance, out=gaussian)
+    np.negative(gaussian, out=gaussian)
+    np.exp(gaussian, out=gaussian)
+    np.multiply(gaussian, distance, out=out[1, ...])
+    out[1] *= 2 * a[0] / a[2]
+    distance *= out[1]
+    out[3] = 1
+    return out
+
+
 @fitting_function(
     n=4,
     syntax="a[0] * exp( - ((x - a[1]) / a[2]) ^ 2) + a[3]",
-    x_derivative=lambda a, x: a[0]
-    * np.exp(-(((x - a[1]) / a[2]) ** 2))  # noqa: W503
-    * (-2 * (x - a[1]) / a[2]),  # noqa: W503
-    a_derivative=lambda a, x: np.stack(
-        [
-            np.exp(-(((x - a[1]) / a[2]) ** 2)),
-            a[0] * np.exp(-(((x - a[1]) / a[2]) ** 2)) * (2 * (x - a[1]) / a[2]),
-            a[0] * np.exp(-(((x - a[1]) / a[2]) ** 2)) * (2 * (x - a[1]) / (a[2] ** 2)),
-            np.ones(shape=np.shape(x)),
-        ]
-    ),
+    initial_guess=normal_initial_guess,
+    x_derivative=_normal_x_derivative,
+    a_derivative=_normal_a_derivative,
+    vectorized=True,
+    derivatives_out=True,
 )
 def normal(a: np.ndarray, x: Union[np.ndarray, float]) -> Union[np.ndarray, float]:
     """
@@ -253,21 +484,42 @@ def normal(a: np.ndarray, x: Union[np.ndarray, float]) -> Union[np.ndarray, floa
     return a[0] * np.exp(-(((x - a[1]) / a[2]) ** 2)) + a[3]
 
 
+def _poisson_x_derivative(a, x, out=None):
+    out = _derivative_out(out, a, x)
+    np.add(x, 1, out=out)
+    scipy.special.digamma(out, out=out)
+    np.subtract(np.log(a[1]), out, out=out)
+    out *= np.power(a[1], x)
+    out *= a[0] * np.exp(-a[1])
+    out /= scipy.special.gamma(x + 1)
+    return out
+
+
+def _poisson_a_derivative(a, x, out=None):
+    out = _derivative_out(out, a, x, rows=3)
+    value, factorial = out[0, ...], out[1, ...]
+    np.add(x, 1, out=factorial)
+    scipy.special.gamma(factorial, out=factorial)
+    np.power(a[1], x, out=value)
+    value *= np.exp(-a[1])
+    value /= factorial
+    # The derivative by a[1] is a[0] * value * (x / a[1] - 1).
+    np.divide(x, a[1], out=out[1, ...])
+    out[1] -= 1
+    out[1] *= value
+    out[1] *= a[0]
+    out[2] = 1
+    return out
+
+
 @fitting_function(
     n=3,
     syntax="a[0] * (a[1] ^ x) * exp(-a[1]) / gamma(x+1) + a[2]",
-    x_derivative=lambda a, x: (
-        a[0] * np.power(a[1], x) * np.exp(-a[1]) / scipy.special.gamma(x + 1)
-    )  # noqa: W503
-    * (np.log(a[1]) - scipy.special.digamma(x + 1)),  # noqa: W503
-    a_derivative=lambda a, x: np.stack(
-        [
-            np.power(a[1], x) * np.exp(-a[1]) / scipy.special.gamma(x + 1),
-            (a[0] * np.exp(-a[1]) / scipy.special.gamma(x + 1))
-            * (x * np.power(a[1], x - 1) - np.power(a[1], x)),  # noqa: W503
-            np.ones(shape=np.shape(x)),
-        ]
-    ),
+    initial_guess=poisson_initial_guess,
+    x_derivative=_poisson_x_derivative,
+    a_derivative=_poisson_a_derivative,
+    vectorized=True,
+    derivatives_out=True,
 )
 def poisson(a: np.ndarray, x: Union[np.ndarray, float]) -> Union[np.ndarray, float]:
     """
@@ -307,15 +559,36 @@ def polynomial(n: int) -> FittingFunction:
         [f"a[{i}] * x ^ {i}" for i in arange[1:]]
     )
 
+    def x_derivative(a, x, out=None):
+        # Horner's method over the coefficients of the derivative.
+        out = _derivative_out(out, a, x)
+        out[...] = n * a[n]
+        for i in range(n - 1, 0, -1):
+            out *= x
+            out += i * a[i]
+        return out
+
+    def a_derivative(a, x, out=None):
+        out = _derivative_out(out, a, x, rows=n + 1)
+        out[0] = 1
+        for i in range(1, n + 1):
+            np.multiply(out[i - 1], x, out=out[i, ...])
+        return out
+
     @fitting_function(
         n=n + 1,
         name=f"polynomial_{n}",
         syntax=syntax,
-        x_derivative=lambda a, x: polynomial(n - 1)(arange * a[1:], x),
-        a_derivative=lambda a, x: np.stack([x**i for i in range(n + 1)]),
+        rescale=polynomial_rescale,
+        x_derivative=x_derivative,
+        a_derivative=a_derivative,
+        vectorized=True,
+        derivatives_out=True,
+        linear_in_parameters=True,
         save=False,
     )
     def func(a: np.ndarray, x: Union[np.ndarray, float]) -> Union[np.ndarray, float]:
         return sum(a[i] * x**i for i in range(n + 1))
 
+    func._factory = (polynomial, (n,))  # pylint: disable=protected-access
     return func
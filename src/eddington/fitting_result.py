@@ -1,13 +1,15 @@
 """Fitting result class that will be returned by the fitting algorithm."""
 import json
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
 
 import numpy as np
 from scipy import stats
 
 from eddington.consts import DEFAULT_PRECISION
+from eddington.exceptions import FittingError, FittingFunctionRuntimeError
+from eddington.fitting_function_class import FittingFunction
 from eddington.print_util import (
     order_of_magnitude,
     to_digit_string,
@@ -15,6 +17,87 @@
 )
 
 
+@dataclass
+class FittingDiagnostics:  # pylint: disable=too-many-instance-attributes
+    """
+    Cost and termination of the fitting algorithm.
+
+    :param iterations: Number of iterations of the fitting algorithm.
+    :type iterations: int
+    :param function_evaluations: Number of evaluations of the fitting function.
+    :type function_evaluations: int
+    :param jacobian_evaluations: Number of evaluations of the derivatives of the
+        fitting function. Zero when the derivatives are estimated by finite
+        differences.
+    :type jacobian_evaluations: int
+    :param info: Termination code of the fitting algorithm, as returned by ODR.
+    :type info: int
+    :param stop_reason: Human readable reasons for the termination of the fitting
+        algorithm.
+    :type stop_reason: list of str
+    :param setup_time: Wall time in seconds of preparing the fit, including the
+        initial guess estimation.
+    :type setup_time: float
+    :param run_time: Wall time in seconds of the fitting algorithm.
+    :type run_time: float
+    :param post_processing_time: Wall time in seconds of building the result.
+    :type post_processing_time: float
+    :param timed_out: Whether the fit was stopped by its timeout.
+    :type timed_out: bool
+    :param cache_hits: Number of intermediate values of the fitting function which
+        were reused from its evaluation cache. See
+        :meth:`FittingFunction.evaluation_cache`.
+    :type cache_hits: int
+    :param cache_misses: Number of intermediate values of the fitting function which
+        were computed.
+    :type cache_misses: int
+    """
+
+    iterations: int
+    function_evaluations: int
+    jacobian_evaluations: int
+    info: int
+    stop_reason: List[str]
+    setup_time: float
+    run_time: float
+    post_processing_time: float
+    timed_out: bool = False
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+    @property
+    def converged(self) -> bool:
+        """
+        Whether the fitting algorithm converged.
+
+        :return: True if converged, False if stopped by the iterations limit, the
+            timeout or an error.
+        :rtype: bool
+        """
+        return not self.timed_out and 1 <= self.info % 10 <= 3
+
+    @property
+    def cache_hit_rate(self) -> float:
+        """
+        Fraction of the intermediate values which were reused from the cache.
+
+        :return: hit rate, or 0 when the fitting function has no intermediate values
+        :rtype: float
+        """
+        requests = self.cache_hits + self.cache_misses
+        return self.cache_hits / requests if requests > 0 else 0.0
+
+    @property
+    def total_time(self) -> float:
+        """
+        Total wall time in seconds of the fit.
+
+        :return: total wall time
+        :rtype: float
+        """
+        return self.setup_time + self.run_time + self.post_processing_time
+
+
 @dataclass(repr=False)
 class FittingResult:  # pylint: disable=too-many-instance-attributes
     """
@@ -39,6 +122,8 @@ class FittingResult:  # pylint: disable=too-many-instance-attributes
     :param p_probability: P-probability (p-value) of the fitting, evaluated from
         chi2_reduced.
     :type p_probability: float
+    :param diagnostics: Optional. Cost and termination of the fitting algorithm.
+    :type diagnostics: FittingDiagnostics
     """
 
     a0: Union[List[float], np.ndarray]  # pylint: disable=invalid-name
@@ -51,6 +136,7 @@ class FittingResult:  # pylint: disable=too-many-instance-attributes
     chi2_reduced: float = field(init=False)
     p_probability: float = field(init=False)
     precision: int = field(default=DEFAULT_PRECISION)
+    diagnostics: Optional[FittingDiagnostics] = field(default=None)
     __pretty_string: Optional[str] = field(default=None, init=False)
 
     def __post_init__(self) -> None:
@@ -86,6 +172,91 @@ def save_json(self, file_path: Union[str, Path]) -> None:
         with open(file_path, mode="w", encoding="utf-8") as output_file:
             output_file.write(self.json_string)
 
+    @property
+    def aic(self) -> float:
+        """
+        Akaike information criterion of the fitting, up to an additive constant.
+
+        Evaluated as chi squared plus twice the number of fitted parameters. Lower
+        values indicate a better model.
+
+        :return: Akaike information criterion
+        :rtype: float
+        """
+        return self.chi2 + 2 * len(self.a)
+
+    @property
+    def bic(self) -> float:
+        """
+        Bayesian information criterion of the fitting, up to an additive constant.
+
+        Evaluated as chi squared plus the number of fitted parameters times the
+        logarithm of the number of records. Lower values indicate a better model.
+
+        :return: Bayesian information criterion
+        :rtype: float
+        """
+        number_of_records = self.degrees_of_freedom + len(self.a)
+        return self.chi2 + len(self.a) * np.log(number_of_records)
+
+    def prediction_band(  # pylint: disable=too-many-arguments
+        self,
+        func: FittingFunction,
+        x: Union[List[float], np.ndarray],
+        level: float = 0.95,
+        samples: Optional[int] = None,
+        seed: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Confidence band of the fitted curve.
+
+        By default, the covariance of the parameters is propagated linearly through
+        the a derivative of the function, which is evaluated once over all x values.
+        If samples is given, the band is evaluated instead by sampling parameters from
+        their normal distribution and taking percentiles of the sampled curves.
+
+        :param func: The fitted function.
+        :type func: FittingFunction
+        :param x: X values to evaluate the band at.
+        :type x: list of floats or np.ndarray
+        :param level: Confidence level of the band.
+        :type level: float
+        :param samples: Optional. Number of parameters samples for a Monte Carlo
+            estimation of the band.
+        :type samples: int
+        :param seed: Optional. Seed of the Monte Carlo sampling.
+        :type seed: int
+        :return: lower and upper bounds of the band
+        :rtype: tuple of np.ndarray
+        :raises FittingError: Raised when the confidence level is invalid.
+        :raises FittingFunctionRuntimeError: Raised when the function has no a
+            derivative and samples is not given.
+        """
+        if not 0 < level < 1:
+            raise FittingError(
+                f"Confidence level should be between 0 and 1, got {level}"
+            )
+        x = np.asarray(x, dtype=float)
+        acov = self.acov * self.chi2_reduced
+        if samples is not None:
+            sampled_a = np.random.default_rng(seed).multivariate_normal(
+                self.a, acov, size=samples  # type: ignore
+            )
+            tail = 50 * (1 - level)
+            lower, upper = np.percentile(
+                func.evaluate_batch(sampled_a, x), [tail, 100 - tail], axis=0
+            )
+            return lower, upper
+        if func.a_derivative is None:
+            raise FittingFunctionRuntimeError(
+                f'"{func.name}" has no a derivative. Use samples instead.'
+            )
+        jacobian = np.reshape(func.a_derivative(self.a, x), (len(self.a), -1))
+        variance = np.einsum("in,ij,jn->n", jacobian, acov, jacobian)
+        half_width = stats.norm.ppf(0.5 + level / 2) * np.sqrt(variance)
+        y = np.ravel(func(self.a, x))
+        return (y - half_width).reshape(x.shape), (y + half_width).reshape(x.shape)
+
     @property
     def pretty_string(self) -> str:
         """
@@ -106,20 +277,22 @@ def json_string(self):
         :return: self representing json string
         :rtype: str
         """
-        return json.dumps(
-            dict(
-                a0=self.a0.tolist(),  # type: ignore
-                a=self.a.tolist(),  # type: ignore
-                aerr=self.aerr.tolist(),  # type: ignore
-                arerr=self.arerr.tolist(),  # type: ignore
-                acov=self.acov.tolist(),  # type: ignore
-                degrees_of_freedom=self.degrees_of_freedom,
-                chi2=self.chi2,
-                chi2_reduced=self.chi2_reduced,
-                p_probability=self.p_probability,
-            ),
-            indent=1,
+        json_dict = dict(
+            a0=self.a0.tolist(),  # type: ignore
+            a=self.a.tolist(),  # type: ignore
+            aerr=self.aerr.tolist(),  # type: ignore
+            arerr=self.arerr.tolist(),  # type: ignore
+            acov=self.acov.tolist(),  # type: ignore
+            degrees_of_freedom=self.degrees_of_freedom,
+            chi2=self.chi2,
+            chi2_reduced=self.chi2_reduced,
+            p_probability=self.p_probability,
         )
+        if self.diagnostics is not None:
+            json_dict["diagnostics"] = dict(
+                asdict(self.diagnostics), converged=self.diagnostics.converged
+            )
+        return json.dumps(json_dict, indent=1)
 
     def __repr__(self) -> str:
         """
@@ -153,6 +326,8 @@ def __build_pretty_string(self) -> str:
 Chi squared reduced: {to_relevant_precision_string(self.chi2_reduced, self.precision)}
 P-probability: {to_relevant_precision_string(self.p_probability, self.precision)}
 """
+        if self.diagnostics is not None:
+            repr_string += self.__diagnostics_string(self.diagnostics)
         np.set_printoptions(precision=old_precision)
         return repr_string
 
@@ -163,3 +338,18 @@ def __a_value_string(self, i: int, a: float, aerr: float, arerr: float) -> str:
         aerr_string = to_digit_string(aerr, digit)
         arerr_string = to_relevant_precision_string(arerr, self.precision)
         return f"\ta[{i}] = {a_string} \u00B1 {aerr_string} ({arerr_string}% error)"
+
+    @staticmethod
+    def __diagnostics_string(diagnostics: FittingDiagnostics) -> str:
+        # Wall times differ between runs, so they are left out in order to keep the
+        # string reproducible. They are kept in the diagnostics and the json string.
+        stop_reason = ", ".join(diagnostics.stop_reason)
+        if diagnostics.timed_out:
+            stop_reason += ", timed out"
+        return f"""Diagnostics:
+\tConverged: {"yes" if diagnostics.converged else "no"}
+\tIterations: {diagnostics.iterations}
+\tFunction evaluations: {diagnostics.function_evaluations}
+\tJacobian evaluations: {diagnostics.jacobian_evaluations}
+\tStop reason: {stop_reason} (info {diagnostics.info})
+"""
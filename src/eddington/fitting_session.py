@@ -0,0 +1,185 @@
+"""Repeated fitting of data while records are selected and unselected."""
+from typing import Optional
+
+import numpy as np
+
+from eddington.exceptions import FittingError
+from eddington.fitting import _fit_arrays
+from eddington.fitting_data import FittingData
+from eddington.fitting_function_class import FittingFunction
+from eddington.fitting_result import FittingResult
+from eddington.incremental_fitting import IncrementalLinearFit
+
+
+class FittingSession:
+    """
+    Fitting of data which is refitted whenever a single record is toggled.
+
+    Records should be selected and unselected through the session rather than the
+    data, so that it can update the fit. The values of the records are read once,
+    when the session is created. When the fitting function is linear in its
+    parameters and the x values are exact, the session keeps an
+    :class:`IncrementalLinearFit` which is updated or downdated by the toggled record
+    only, hence the result does not depend on the number of records. Otherwise, each
+    toggle refits the data starting from the parameters of the previous fit, which
+    usually converges in a few iterations.
+
+    X values without errors are treated as exact by both kinds of sessions, unlike
+    :func:`fit` which gives them unit errors unless ``exact_x`` is set.
+    """
+
+    def __init__(
+        self, data: FittingData, func: FittingFunction, linear: Optional[bool] = None
+    ):
+        """
+        Constructor.
+
+        :param data: Fitting data to fit. Its records selection is shared with the
+            session.
+        :type data: FittingData
+        :param func: The fitting function.
+        :type func: FittingFunction
+        :param linear: Optional. Whether to use incremental linear fitting. If None,
+            use it when the data has no x errors and the function is declared linear
+            in its parameters, see :class:`FittingFunction`.
+        :type linear: bool
+        :raises FittingError: Raised when missing information for the fitting
+            algorithm, or when linear fitting is requested for a nonlinear function.
+        """
+        if data.x is None:
+            raise FittingError("Cannot fit data without x values")
+        if data.y is None:
+            raise FittingError("Cannot fit data without y values")
+        self._data = data
+        self._func = func
+        self._records = {
+            name: None
+            if column is None
+            else data.column_data(column, only_selected=False)
+            for name, column in [
+                ("x", data.x_column),
+                ("y", data.y_column),
+                ("yerr", data.yerr_column),
+            ]
+        }
+        if linear is None:
+            linear = (
+                data.xerr is None
+                and func.linear_in_parameters
+                and IncrementalLinearFit.is_linear(func)
+            )
+        self._incremental_fit = IncrementalLinearFit(func) if linear else None
+        if self._incremental_fit is not None:
+            self._incremental_fit.update(x=data.x, y=data.y, yerr=data.yerr)
+        self._result: Optional[FittingResult] = None
+        self._previous_a: Optional[np.ndarray] = None
+
+    @property
+    def data(self) -> FittingData:
+        """
+        The fitted data.
+
+        :return: fitting data
+        :rtype: FittingData
+        """
+        return self._data
+
+    @property
+    def func(self) -> FittingFunction:
+        """
+        The fitting function.
+
+        :return: fitting function
+        :rtype: FittingFunction
+        """
+        return self._func
+
+    @property
+    def linear(self) -> bool:
+        """
+        Whether the session uses incremental linear fitting.
+
+        :return: True if linear, False otherwise
+        :rtype: bool
+        """
+        return self._incremental_fit is not None
+
+    @property
+    def result(self) -> FittingResult:
+        """
+        Fitting result of the currently selected records.
+
+        :return: fitting result
+        :rtype: FittingResult
+        """
+        if self._result is None:
+            self._result = self.__fit()
+        return self._result
+
+    def select_record(self, index: int) -> "FittingSession":
+        """
+        Select a record and update the fit.
+
+        :param index: index of the desired record **starting from 1**.
+        :type index: int
+        :return: self
+        :rtype: FittingSession
+        """
+        if self.__is_valid(index) and self.data.is_selected(index):
+            return self
+        self.data.select_record(index)
+        if self._incremental_fit is not None:
+            self._incremental_fit.update(**self.__record(index))
+        self.__invalidate()
+        return self
+
+    def unselect_record(self, index: int) -> "FittingSession":
+        """
+        Unselect a record and update the fit.
+
+        :param index: index of the desired record **starting from 1**.
+        :type index: int
+        :return: self
+        :rtype: FittingSession
+        :raises FittingError: Raised when the remaining records are not enough for
+            linear fitting.
+        """
+        if self.__is_valid(index) and not self.data.is_selected(index):
+            return self
+        self.data.unselect_record(index)
+        if self._incremental_fit is not None:
+            try:
+                self._incremental_fit.downdate(**self.__record(index))
+            except FittingError:
+                self.data.select_record(index)
+                raise
+        self.__invalidate()
+        return self
+
+    def __fit(self) -> FittingResult:
+        if self._incremental_fit is not None:
+            return self._incremental_fit.result()
+        return _fit_arrays(
+            func=self.func,
+            x=self.data.x,
+            y=self.data.y,
+            xerr=self.data.xerr,
+            yerr=self.data.yerr,
+            a0=self._previous_a,
+            exact_x=self.data.xerr is None,
+        )
+
+    def __invalidate(self):
+        if self._result is not None:
+            self._previous_a = self._result.a
+        self._result = None
+
+    def __is_valid(self, index):
+        # Invalid indices are left for the data to report.
+        return 1 <= index <= self.data.number_of_records
+
+    def __record(self, index):
+        return {
+            name: None if values is None else values[index - 1]
+            for name, values in self._records.items()
+        }
@@ -0,0 +1,323 @@
+"""Simultaneous fitting of several datasets with shared parameters."""
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from prettytable import PrettyTable
+
+from eddington.batch_fitting import (
+    DAMPING_FACTOR,
+    DEFAULT_MAX_ITERATIONS,
+    DEFAULT_TOLERANCE,
+    INITIAL_DAMPING,
+    MAX_DAMPING,
+    MIN_CURVATURE,
+)
+from eddington.evaluation_cache import DEFAULT_EVALUATION_CACHE_SIZE
+from eddington.exceptions import FittingError
+from eddington.fitting import _effective_variance
+from eddington.fitting_data import FittingData
+from eddington.fitting_function_class import FittingFunction
+from eddington.fitting_result import FittingResult
+from eddington.print_util import to_relevant_precision_string
+
+FINITE_DIFFERENCES_STEP = 1.5e-8
+
+GlobalFitEntry = Tuple[FittingData, FittingFunction, Sequence[str]]
+
+
+@dataclass(repr=False)
+class GlobalFitResult:
+    """
+    Result of a simultaneous fit of several datasets.
+
+    :param names: Names of the global parameters, in the order of the parameters of
+        result.
+    :type names: list of str
+    :param result: Fitting result of the global parameters over all the datasets.
+    :type result: FittingResult
+    :param results: Fitting result of each dataset, with the parameters of its
+        function. Their errors and covariances are taken from the global fit.
+    :type results: list of FittingResult
+    :param converged: Whether the fit converged.
+    :type converged: bool
+    :param iterations: Number of iterations of the fit.
+    :type iterations: int
+    :param shared: Names of the parameters which are shared by more than one dataset.
+    :type shared: list of str
+    """
+
+    names: List[str]
+    result: FittingResult
+    results: List[FittingResult]
+    converged: bool
+    iterations: int
+    shared: List[str] = field(default_factory=list)
+
+    @property
+    def parameters(self) -> Dict[str, float]:
+        """
+        Values of the global parameters by name.
+
+        :return: global parameters
+        :rtype: dict from str to float
+        """
+        return dict(zip(self.names, self.result.a))  # type: ignore
+
+    @property
+    def pretty_string(self) -> str:
+        """
+        Pretty representation string.
+
+        :return: self representing pretty string
+        :rtype: str
+        """
+        precision = self.result.precision
+        table = PrettyTable(field_names=["Parameter", "Value", "Error", "Shared"])
+        for name, a, aerr in zip(self.names, self.result.a, self.result.aerr):
+            table.add_row(
+                [
+                    name,
+                    to_relevant_precision_string(a, precision),
+                    to_relevant_precision_string(aerr, precision),
+                    "yes" if name in self.shared else "no",
+                ]
+            )
+        chi2_reduced = to_relevant_precision_string(self.result.chi2_reduced, precision)
+        return (
+            f"Global fit of {len(self.results)} datasets:\n{table}\n"
+            f"Chi squared reduced: {chi2_reduced}\n"
+        )
+
+    def __repr__(self) -> str:
+        """
+        Representation string.
+
+        :return: self representing pretty string
+        :rtype: str
+        """
+        return self.pretty_string
+
+
+@dataclass
+class _Block:
+    func: FittingFunction
+    indices: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    xerr: Optional[np.ndarray]
+    yerr: Optional[np.ndarray]
+
+
+def global_fit(  # pylint: disable=invalid-name,too-many-locals
+    entries: Sequence[GlobalFitEntry],
+    a0: Optional[Dict[str, float]] = None,
+    max_iterations: int = DEFAULT_MAX_ITERATIONS,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> GlobalFitResult:
+    """
+    Fit several datasets simultaneously, with parameters shared between them.
+
+    Each entry is a tuple of a dataset, a fitting function and the names of the
+    global parameters which the active parameters of the function map to. Parameters
+    with the same name are shared. For example, two exponential decays with a common
+    rate can be mapped to ``["amplitude1", "rate", "offset1"]`` and
+    ``["amplitude2", "rate", "offset2"]``.
+
+    The combined problem is solved by a Levenberg-Marquardt algorithm. The Jacobian
+    of each dataset is evaluated separately and accumulated into the normal
+    equations of the global parameters, so the Jacobian of the combined problem is
+    never built. When a dataset has x errors and its function has an x derivative,
+    the x errors are propagated into the y errors (effective variance).
+
+    :param entries: Datasets, their fitting functions and parameters mapping.
+    :type entries: list of tuples
+    :param a0: Optional. Initial guess of the global parameters by name. Parameters
+        which are not given are guessed by the initial guess estimators of the
+        functions, averaged over the datasets sharing them, or 1 if there is none.
+    :type a0: dict from str to float
+    :param max_iterations: Maximum number of iterations.
+    :type max_iterations: int
+    :param tolerance: Relative tolerance of chi squared and of the parameters for
+        convergence.
+    :type tolerance: float
+    :return: global parameters and per dataset results
+    :rtype: GlobalFitResult
+    :raises FittingError: Raised when there are no datasets, when a dataset is
+        missing information or its mapping does not match its function, or when an
+        initial guess is given to an unknown parameter.
+    """
+    if len(entries) == 0:
+        raise FittingError("No datasets to fit")
+    names: List[str] = []
+    for i, (_, func, parameters) in enumerate(entries):
+        if len(parameters) != func.active_parameters:
+            raise FittingError(
+                f"Expected {func.active_parameters} parameter names for dataset {i}, "
+                f"got {len(parameters)}"
+            )
+        names.extend(name for name in parameters if name not in names)
+    blocks = [
+        _build_block(data, func, [names.index(name) for name in parameters])
+        for data, func, parameters in entries
+    ]
+    initial_a = _global_a0(blocks, names, a0)
+    with _evaluation_caches(blocks):
+        a, converged, iterations = _levenberg_marquardt(
+            blocks, initial_a, max_iterations=max_iterations, tolerance=tolerance
+        )
+        hessian = np.zeros((len(names), len(names)))
+        for block in blocks:
+            jacobian = _jacobian(block, a)
+            np.add.at(
+                hessian, np.ix_(block.indices, block.indices), jacobian @ jacobian.T
+            )
+        chi2_values = [np.sum(np.square(_residuals(block, a))) for block in blocks]
+    acov = np.linalg.pinv(hessian)
+    number_of_records = sum(len(block.x) for block in blocks)
+    result = FittingResult(
+        a0=initial_a,
+        a=a,
+        aerr=np.sqrt(
+            np.diag(acov) * sum(chi2_values) / (number_of_records - len(names))
+        ),
+        acov=acov,
+        degrees_of_freedom=number_of_records - len(names),
+        chi2=sum(chi2_values),
+    )
+    results = [
+        FittingResult(
+            a0=initial_a[block.indices],
+            a=a[block.indices],
+            aerr=result.aerr[block.indices],  # type: ignore
+            acov=acov[np.ix_(block.indices, block.indices)],
+            degrees_of_freedom=len(block.x) - len(block.indices),
+            chi2=chi2,
+        )
+        for block, chi2 in zip(blocks, chi2_values)
+    ]
+    usage = np.bincount(
+        np.concatenate([np.unique(block.indices) for block in blocks]),
+        minlength=len(names),
+    )
+    return GlobalFitResult(
+        names=names,
+        result=result,
+        results=results,
+        converged=converged,
+        iterations=iterations,
+        shared=[name for name, count in zip(names, usage) if count > 1],
+    )
+
+
+def _build_block(data, func, indices) -> _Block:
+    x, y = data.x, data.y
+    if x is None:
+        raise FittingError("Cannot fit data without x values")
+    if y is None:
+        raise FittingError("Cannot fit data without y values")
+    return _Block(
+        func=func,
+        indices=np.array(indices, dtype=int),
+        x=np.asarray(x, dtype=float),
+        y=np.asarray(y, dtype=float),
+        xerr=data.xerr,
+        yerr=data.yerr,
+    )
+
+
+def _global_a0(blocks, names, a0) -> np.ndarray:  # pylint: disable=invalid-name
+    sums, counts = np.zeros(len(names)), np.zeros(len(names))
+    for block in blocks:
+        if block.func.initial_guess is None:
+            continue
+        guess = block.func.initial_guess(block.x, block.y)
+        if np.all(np.isfinite(guess)):
+            np.add.at(sums, block.indices, guess)
+            np.add.at(counts, block.indices, 1)
+    initial_a = np.ones(len(names))
+    initial_a[counts > 0] = sums[counts > 0] / counts[counts > 0]
+    for name, value in ({} if a0 is None else a0).items():
+        if name not in names:
+            raise FittingError(f'Unknown global parameter "{name}"')
+        initial_a[names.index(name)] = value
+    return initial_a
+
+
+@contextmanager
+def _evaluation_caches(blocks) -> Iterator[None]:
+    # The Jacobian of each iteration is evaluated for the parameters of the residuals
+    # of the previous one. A function keeps the values of all the datasets it fits.
+    functions = {id(block.func): block.func for block in blocks}
+    with ExitStack() as stack:
+        for func in functions.values():
+            datasets = sum(block.func is func for block in blocks)
+            stack.enter_context(
+                func.evaluation_cache(size=DEFAULT_EVALUATION_CACHE_SIZE * datasets)
+            )
+        yield
+
+
+def _levenberg_marquardt(  # pylint: disable=too-many-locals
+    blocks, a, max_iterations, tolerance
+):
+    chi2 = sum(np.sum(np.square(_residuals(block, a))) for block in blocks)
+    damping = INITIAL_DAMPING
+    for iteration in range(1, max_iterations + 1):
+        hessian, gradient = np.zeros((len(a), len(a))), np.zeros(len(a))
+        for block in blocks:
+            jacobian = _jacobian(block, a)
+            np.add.at(
+                hessian, np.ix_(block.indices, block.indices), jacobian @ jacobian.T
+            )
+            np.add.at(gradient, block.indices, jacobian @ _residuals(block, a))
+        curvature = np.maximum(np.diag(hessian), MIN_CURVATURE)
+        step = np.linalg.solve(hessian + damping * np.diag(curvature), gradient)
+        new_a = a + step
+        new_chi2 = sum(np.sum(np.square(_residuals(block, new_a))) for block in blocks)
+        improved = bool(np.isfinite(new_chi2) and new_chi2 <= chi2)
+        small_step = np.linalg.norm(step) <= tolerance * (np.linalg.norm(a) + tolerance)
+        if improved:
+            decrease = chi2 - new_chi2
+            a, chi2 = new_a, new_chi2
+            damping /= DAMPING_FACTOR
+            if decrease <= tolerance * chi2:
+                return a, True, iteration
+        else:
+            damping *= DAMPING_FACTOR
+        if small_step:
+            return a, True, iteration
+        if damping >= MAX_DAMPING:
+            return a, False, iteration
+    return a, False, max_iterations
+
+
+def _residuals(block: _Block, a: np.ndarray) -> np.ndarray:
+    local_a = a[block.indices]
+    return (block.y - block.func(local_a, block.x)) / _sigma(block, local_a)
+
+
+def _sigma(block: _Block, local_a: np.ndarray) -> np.ndarray:
+    return np.sqrt(
+        _effective_variance(block.func, local_a, block.x, block.xerr, block.yerr)
+    )
+
+
+def _jacobian(block: _Block, a: np.ndarray) -> np.ndarray:
+    local_a = a[block.indices]
+    if block.func.a_derivative is not None:
+        jacobian = np.reshape(
+            block.func.a_derivative(local_a, block.x), (len(local_a), -1)
+        )
+    else:
+        jacobian = _finite_differences_jacobian(block.func, local_a, block.x)
+    return jacobian / _sigma(block, local_a)
+
+
+def _finite_differences_jacobian(func, a, x) -> np.ndarray:
+    steps = FINITE_DIFFERENCES_STEP * np.maximum(np.abs(a), 1)
+    y = func(a, x)
+    return np.stack(
+        [(func(a + step, x) - y) / step[i] for i, step in enumerate(np.diag(steps))]
+    )
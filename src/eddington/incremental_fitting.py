@@ -0,0 +1,294 @@
+"""Incremental fitting of functions which are linear in their parameters."""
+from typing import Optional, Union
+
+import numpy as np
+from scipy.linalg import solve_triangular
+
+from eddington.exceptions import FittingError
+from eddington.fitting_function_class import FittingFunction
+from eddington.fitting_result import FittingResult
+
+LINEARITY_PROBE = np.array([0.5, 1.5, 2.5])
+
+
+class IncrementalLinearFit:
+    """
+    Fitting algorithm for streaming data of linear-in-parameters functions.
+
+    Instead of keeping the data itself, this class keeps an updatable QR
+    factorization of the weighted least squares problem. Each chunk of records is
+    added with :meth:`update` and can later be removed with :meth:`downdate`, which
+    makes sliding windows possible. The fitting result is calculated on demand and its
+    cost does not depend on the number of records accumulated so far.
+
+    Only functions whose derivative according to ``a`` does not depend on ``a`` are
+    supported, such as :func:`linear` and :func:`polynomial`. X values are treated as
+    exact, hence the result is the weighted least squares solution. A
+    :class:`FittingError` is raised when constructed with any other function.
+    """
+
+    def __init__(self, func: FittingFunction):
+        """
+        Constructor.
+
+        :param func: Linear-in-parameters fitting function to fit.
+        :type func: FittingFunction
+        """
+        self.__validate_linear(func)
+        self._func = func
+        parameters = func.active_parameters
+        self._r_matrix = np.zeros(shape=(parameters, parameters))
+        self._qty = np.zeros(shape=parameters)
+        self._residual_norm = 0.0
+        self._number_of_records = 0
+
+    @property
+    def func(self) -> FittingFunction:
+        """
+        The fitted function.
+
+        :return: fitting function
+        :rtype: FittingFunction
+        """
+        return self._func
+
+    @property
+    def number_of_records(self) -> int:
+        """
+        Number of records currently accumulated.
+
+        :return: number of records
+        :rtype: int
+        """
+        return self._number_of_records
+
+    def update(
+        self,
+        x: Union[np.ndarray, float],
+        y: Union[np.ndarray, float],
+        yerr: Optional[Union[np.ndarray, float]] = None,
+    ) -> "IncrementalLinearFit":
+        """
+        Add a chunk of records to the fit.
+
+        :param x: X values of the new records.
+        :type x: float or np.ndarray
+        :param y: Y values of the new records.
+        :type y: float or np.ndarray
+        :param yerr: Optional. Y errors of the new records. If None, all records are
+            weighted equally.
+        :type yerr: float or np.ndarray
+        :return: self
+        :rtype: IncrementalLinearFit
+        """
+        design, values = self.__weighted_problem(x=x, y=y, yerr=yerr)
+        self.__absorb(design, values)
+        self._number_of_records += values.size
+        return self
+
+    def merge(  # pylint: disable=protected-access
+        self, other: "IncrementalLinearFit"
+    ) -> "IncrementalLinearFit":
+        """
+        Add all records accumulated by another fit of the same function.
+
+        Only the factorization of the other fit is used, so partial fits of separate
+        parts of the data can be combined into a fit of all of it (TSQR reduction).
+
+        :param other: Another incremental fit of the same function.
+        :type other: IncrementalLinearFit
+        :return: self
+        :rtype: IncrementalLinearFit
+        :raises FittingError: Raised when the fits have different numbers of
+            parameters.
+        """
+        if other.func.active_parameters != self.func.active_parameters:
+            raise FittingError(
+                f"Cannot merge a fit of {other.func.active_parameters} parameters "
+                f"into a fit of {self.func.active_parameters} parameters"
+            )
+        self.__absorb(other._r_matrix, other._qty)
+        self._residual_norm = float(np.hypot(self._residual_norm, other._residual_norm))
+        self._number_of_records += other.number_of_records
+        return self
+
+    def __absorb(self, design, values):
+        parameters = self.func.active_parameters
+        augmented_r = np.linalg.qr(
+            np.block(
+                [
+                    [self._r_matrix, self._qty[:, np.newaxis]],
+                    [design, values[:, np.newaxis]],
+                ]
+            ),
+            mode="r",
+        )
+        signs = np.where(np.diag(augmented_r)[:parameters] < 0, -1.0, 1.0)
+        self._r_matrix = augmented_r[:parameters, :parameters] * signs[:, np.newaxis]
+        self._qty = augmented_r[:parameters, parameters] * signs
+        self._residual_norm = float(
+            np.hypot(self._residual_norm, augmented_r[parameters, parameters])
+        )
+
+    def downdate(
+        self,
+        x: Union[np.ndarray, float],
+        y: Union[np.ndarray, float],
+        yerr: Optional[Union[np.ndarray, float]] = None,
+    ) -> "IncrementalLinearFit":
+        """
+        Remove a chunk of records that was previously added to the fit.
+
+        :param x: X values of the removed records.
+        :type x: float or np.ndarray
+        :param y: Y values of the removed records.
+        :type y: float or np.ndarray
+        :param yerr: Optional. Y errors of the removed records. Should be the same as
+            the ones given when the records were added.
+        :type yerr: float or np.ndarray
+        :return: self
+        :rtype: IncrementalLinearFit
+        :raises FittingError: Raised when trying to remove more records than were
+            added.
+        """
+        if np.size(x) > self.number_of_records:
+            raise FittingError(
+                f"Cannot remove {np.size(x)} records from a fit "
+                f"of {self.number_of_records} records"
+            )
+        design, values = self.__weighted_problem(x=x, y=y, yerr=yerr)
+        for row, value in zip(design, values):
+            self.__downdate_row(row, value)
+        self._number_of_records -= values.size
+        return self
+
+    def clear(self) -> "IncrementalLinearFit":
+        """
+        Remove all records from the fit.
+
+        :return: self
+        :rtype: IncrementalLinearFit
+        """
+        self._r_matrix.fill(0)
+        self._qty.fill(0)
+        self._residual_norm = 0.0
+        self._number_of_records = 0
+        return self
+
+    def result(self) -> FittingResult:
+        """
+        Calculate the fitting result of all records accumulated so far.
+
+        The initial guess of the result is zeros, since no iterations are needed.
+
+        :return: fitting result
+        :rtype: FittingResult
+        :raises FittingError: Raised when there are not enough records to fit, or
+            when the records do not determine all the parameters.
+        """
+        parameters = self.func.active_parameters
+        if self.number_of_records <= parameters:
+            raise FittingError(
+                f"Cannot fit {parameters} parameters "
+                f"with only {self.number_of_records} records"
+            )
+        try:
+            r_inverse = solve_triangular(self._r_matrix, np.eye(parameters))
+        except np.linalg.LinAlgError as error:
+            raise FittingError(
+                f'Cannot fit "{self.func.name}" since the records do not determine '
+                "all of its parameters"
+            ) from error
+        a = r_inverse @ self._qty
+        acov = r_inverse @ r_inverse.T
+        chi2 = self._residual_norm**2
+        degrees_of_freedom = self.number_of_records - parameters
+        aerr = np.sqrt(np.diag(acov) * chi2 / degrees_of_freedom)
+        return FittingResult(
+            a0=np.zeros(shape=parameters),
+            a=a,
+            aerr=aerr,
+            acov=acov,
+            degrees_of_freedom=degrees_of_freedom,
+            chi2=chi2,
+        )
+
+    def __weighted_problem(self, x, y, yerr):
+        x = np.atleast_1d(np.asarray(x, dtype=float))
+        zeros = np.zeros(shape=self.func.active_parameters)
+        design = np.reshape(self.func.a_derivative(zeros, x), (zeros.size, x.size))
+        values = np.atleast_1d(y) - self.func(zeros, x)
+        if yerr is not None:
+            weights_root = 1 / np.broadcast_to(np.asarray(yerr, dtype=float), x.shape)
+            design = design * weights_root
+            values = values * weights_root
+        return design.T, values
+
+    def __downdate_row(self, row, value):
+        # Port of LINPACK's dchdd routine, which removes a single row from the
+        # factorization using plane rotations.
+        parameters = self.func.active_parameters
+        sines = solve_triangular(self._r_matrix, row, trans="T")
+        norm = np.linalg.norm(sines)
+        if norm >= 1:
+            raise FittingError(
+                "Cannot remove records which leave the fit without enough information"
+            )
+        alpha = np.sqrt(1 - norm**2)
+        cosines = np.empty(shape=parameters)
+        for i in reversed(range(parameters)):
+            scale = alpha + np.abs(sines[i])
+            norm = np.hypot(alpha / scale, sines[i] / scale)
+            cosines[i] = alpha / scale / norm
+            sines[i] = sines[i] / scale / norm
+            alpha = scale * norm
+        carry = np.zeros(shape=parameters)
+        for i in reversed(range(parameters)):
+            rotated = cosines[i] * carry + sines[i] * self._r_matrix[i]
+            self._r_matrix[i] = cosines[i] * self._r_matrix[i] - sines[i] * carry
+            carry = rotated
+        zeta = value
+        for i in range(parameters):
+            self._qty[i] = (self._qty[i] - sines[i] * zeta) / cosines[i]
+            zeta = cosines[i] * zeta - sines[i] * self._qty[i]
+        if np.abs(zeta) >= self._residual_norm:
+            self._residual_norm = 0.0
+        else:
+            self._residual_norm *= np.sqrt(1 - (zeta / self._residual_norm) ** 2)
+
+    @classmethod
+    def is_linear(cls, func: FittingFunction) -> bool:
+        """
+        Whether a function can be fitted incrementally.
+
+        :param func: Fitting function to check.
+        :type func: FittingFunction
+        :return: True if the function is linear in its parameters and has an a
+            derivative, False otherwise.
+        :rtype: bool
+        """
+        try:
+            cls.__validate_linear(func)
+        except FittingError:
+            return False
+        return True
+
+    @classmethod
+    def __validate_linear(cls, func: FittingFunction):
+        if func.a_derivative is None:
+            raise FittingError(
+                f'Cannot fit "{func.name}" incrementally without its a derivative'
+            )
+        parameters = func.active_parameters
+        with np.errstate(all="ignore"):
+            zeros_derivative = func.a_derivative(
+                np.zeros(shape=parameters), LINEARITY_PROBE
+            )
+            ones_derivative = func.a_derivative(
+                np.ones(shape=parameters), LINEARITY_PROBE
+            )
+        if not np.allclose(zeros_derivative, ones_derivative):
+            raise FittingError(
+                f'Cannot fit "{func.name}" incrementally '
+                "since it is not linear in its parameters"
+            )
@@ -0,0 +1,201 @@
+"""Leave-one-out influence diagnostics of fitted records."""
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+from prettytable import PrettyTable
+
+from eddington.exceptions import (
+    EddingtonException,
+    FittingError,
+    FittingFunctionRuntimeError,
+)
+from eddington.fitting import _effective_variance, _fit_arrays
+from eddington.fitting_data import FittingData
+from eddington.fitting_function_class import FittingFunction
+from eddington.fitting_result import FittingResult
+from eddington.parallel_util import get_executor
+from eddington.print_util import to_relevant_precision_string
+
+REFITS_CHUNK_SIZE = 100
+DEFAULT_MOST_INFLUENTIAL = 5
+
+
+@dataclass(repr=False)
+class InfluenceResult:
+    """
+    Influence of each fitted record on the fitting parameters.
+
+    All arrays are ordered as the selected records of the data.
+
+    :param leverages: Diagonal of the weighted hat matrix, of shape (records,).
+    :type leverages: np.ndarray
+    :param delta_a: Change of the parameters when leaving each record out, of shape
+        (records, parameters). Rows of records whose refit failed are NaN.
+    :type delta_a: np.ndarray
+    :param cooks_distance: Cook's distance of each record, of shape (records,).
+    :type cooks_distance: np.ndarray
+    :param exact: Whether the changes were calculated by refitting or by a single
+        linearized step.
+    :type exact: bool
+    """
+
+    leverages: np.ndarray
+    delta_a: np.ndarray
+    cooks_distance: np.ndarray
+    exact: bool
+
+    def most_influential(self, count: int = DEFAULT_MOST_INFLUENTIAL) -> np.ndarray:
+        """
+        Positions of the records with the largest Cook's distance.
+
+        :param count: Number of records to return.
+        :type count: int
+        :return: positions of the records among the selected records, starting from 0,
+            in descending order of Cook's distance
+        :rtype: np.ndarray
+        """
+        order = np.argsort(-np.nan_to_num(self.cooks_distance, nan=-np.inf))
+        return order[:count]
+
+    @property
+    def pretty_string(self) -> str:
+        """
+        Pretty representation string.
+
+        :return: self representing pretty string
+        :rtype: str
+        """
+        table = PrettyTable(field_names=["Record", "Leverage", "Cook's distance"])
+        for i in self.most_influential():
+            table.add_row(
+                [
+                    i + 1,
+                    to_relevant_precision_string(self.leverages[i], 3),
+                    to_relevant_precision_string(self.cooks_distance[i], 3),
+                ]
+            )
+        method = "refits" if self.exact else "linearized step"
+        return f"Most influential records ({method}):\n{table}\n"
+
+    def __repr__(self) -> str:
+        """
+        Representation string.
+
+        :return: self representing pretty string
+        :rtype: str
+        """
+        return self.pretty_string
+
+
+def influence(  # pylint: disable=too-many-locals
+    result: FittingResult,
+    data: FittingData,
+    func: FittingFunction,
+    exact: bool = False,
+    workers: Optional[int] = None,
+) -> InfluenceResult:
+    """
+    Evaluate the influence of each selected record on the fitting parameters.
+
+    The leverages are the diagonal of the hat matrix of the weighted Jacobian at the
+    fitted parameters. By default, the change of the parameters when leaving a record
+    out is evaluated for all the records at once from a single linearized step, which
+    is exact for functions that are linear in their parameters and x values without
+    errors. When exact is True, the data is refitted without each record instead,
+    starting from the fitted parameters, optionally in parallel.
+
+    Cook's distance of each record is the change of the parameters measured by the
+    covariance of the fit, divided by the number of parameters.
+
+    When the data has x errors and the function has an x derivative, they are
+    propagated into the y errors (effective variance).
+
+    :param result: Fitting result of the data.
+    :type result: FittingResult
+    :param data: Fitting data which was fitted.
+    :type data: FittingData
+    :param func: The fitted function. Should have an a derivative.
+    :type func: FittingFunction
+    :param exact: Whether to refit the data without each record.
+    :type exact: bool
+    :param workers: Number of worker processes for exact refits. If None, refit in the
+        calling process.
+    :type workers: int
+    :return: influence of the records
+    :rtype: InfluenceResult
+    :raises FittingError: Raised when missing information for the fitting algorithm.
+    :raises FittingFunctionRuntimeError: Raised when the function has no a
+        derivative.
+    """
+    x, y = data.x, data.y
+    if x is None:
+        raise FittingError("Cannot fit data without x values")
+    if y is None:
+        raise FittingError("Cannot fit data without y values")
+    if func.a_derivative is None:
+        raise FittingFunctionRuntimeError(f'"{func.name}" has no a derivative')
+    a = np.asarray(result.a, dtype=float)
+    sigma = np.sqrt(_effective_variance(func, a, x, data.xerr, data.yerr))
+    jacobian = np.reshape(func.a_derivative(a, x), (a.size, -1)).T / sigma[:, None]
+    residuals = (y - func(a, x)) / sigma
+    fisher = jacobian.T @ jacobian
+    fisher_inverse = np.linalg.pinv(fisher)
+    leverages = np.einsum("ni,ij,nj->n", jacobian, fisher_inverse, jacobian)
+    if exact:
+        delta_a = _refit_deltas(func, (x, data.xerr, y, data.yerr), a, workers) - a
+    else:
+        delta_a = -(jacobian @ fisher_inverse) * (residuals / (1 - leverages))[:, None]
+    scale = a.size * result.chi2 / result.degrees_of_freedom
+    cooks_distance = np.einsum("ni,ij,nj->n", delta_a, fisher, delta_a) / scale
+    return InfluenceResult(
+        leverages=leverages,
+        delta_a=delta_a,
+        cooks_distance=cooks_distance,
+        exact=exact,
+    )
+
+
+def _refit_deltas(func, arrays, a, workers) -> np.ndarray:
+    number_of_records = len(arrays[0])
+    with get_executor(workers) as executor:
+        futures = [
+            executor.submit(
+                _refit_without,
+                func,
+                arrays,
+                list(range(start, min(start + REFITS_CHUNK_SIZE, number_of_records))),
+                a,
+            )
+            for start in range(0, number_of_records, REFITS_CHUNK_SIZE)
+        ]
+        refits: List[np.ndarray] = []
+        for future in futures:
+            refits.extend(future.result())
+    return np.stack(refits)
+
+
+def _refit_without(
+    func: FittingFunction,
+    arrays: Tuple[Optional[np.ndarray], ...],
+    indices: List[int],
+    a0: np.ndarray,  # pylint: disable=invalid-name
+) -> List[np.ndarray]:
+    refits = []
+    for index in indices:
+        x, xerr, y, yerr = [
+            None if array is None else np.delete(array, index) for array in arrays
+        ]
+        try:
+            refit_a = _fit_arrays(
+                func=func,
+                x=x,  # type: ignore
+                y=y,  # type: ignore
+                xerr=xerr,
+                yerr=yerr,
+                a0=a0,
+            ).a
+        except (EddingtonException, ArithmeticError, ValueError):
+            refit_a = np.full(a0.shape, np.nan)
+        refits.append(refit_a)
+    return refits
@@ -0,0 +1,306 @@
+"""Initial guess estimators for the out-of-the-box fitting functions."""
+from typing import Tuple
+
+import numpy as np
+import scipy.signal
+import scipy.special
+
+POWER_EXPONENTS = np.linspace(0.1, 5, 50)
+POWER_SHIFTS = np.geomspace(1e-3, 2, 20)
+# The grid of power candidates is evaluated on at most this number of points, so
+# that the memory of the estimation does not grow with the data.
+POWER_GUESS_MAX_POINTS = 1000
+SPECTRUM_OVERSAMPLING = 10
+REFINEMENT_POINTS = 21
+REFINEMENT_ROUNDS = 3
+
+
+def exponential_initial_guess(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Estimate the parameters of :func:`exponential`.
+
+    Since :math:`y' = a_1 (y - a_2)`, integrating both sides gives a relation which is
+    linear in :math:`a_1` and :math:`a_1 a_2`. The rate is evaluated from this
+    relation and then amplitude and offset are evaluated by linear regression.
+
+    :param x: X values of the data
+    :type x: np.ndarray
+    :param y: Y values of the data
+    :type y: np.ndarray
+    :return: initial guess of the parameters
+    :rtype: np.ndarray
+    """
+    x, y = _sort_by_x(x, y)
+    integral = np.concatenate([[0], np.cumsum(0.5 * (y[1:] + y[:-1]) * np.diff(x))])
+    rate = _linear_regression(
+        np.stack([integral, x - x[0]]), y - y[0], with_offset=False
+    )[0]
+    with np.errstate(over="ignore"):
+        amplitude, offset = _linear_regression(np.exp(rate * x), y)
+    return np.array([amplitude, rate, offset])
+
+
+def hyperbolic_initial_guess(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Estimate the parameters of :func:`hyperbolic`.
+
+    Multiplying both sides by :math:`x + a_1` gives
+    :math:`x y = (a_0 + a_1 a_2) - a_1 y + a_2 x`, which is linear in its
+    coefficients.
+
+    :param x: X values of the data
+    :type x: np.ndarray
+    :param y: Y values of the data
+    :type y: np.ndarray
+    :return: initial guess of the parameters
+    :rtype: np.ndarray
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    y_coefficient, x_coefficient, constant = _linear_regression(np.stack([y, x]), x * y)
+    shift = -y_coefficient
+    return np.array([constant - shift * x_coefficient, shift, x_coefficient])
+
+
+def normal_initial_guess(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Estimate the parameters of :func:`normal`.
+
+    The center and width of the peak are evaluated from its first two moments, and
+    then amplitude and offset are evaluated by linear regression.
+
+    :param x: X values of the data
+    :type x: np.ndarray
+    :param y: Y values of the data
+    :type y: np.ndarray
+    :return: initial guess of the parameters
+    :rtype: np.ndarray
+    """
+    x, y = _sort_by_x(x, y)
+    offset = np.median(y)
+    for _ in range(2):
+        center, variance = _peak_moments(x, y, offset)
+        width = np.sqrt(2 * variance)
+        amplitude, offset = _linear_regression(
+            np.exp(-np.square((x - center) / width)), y
+        )
+    return np.array([amplitude, center, width, offset])
+
+
+def poisson_initial_guess(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Estimate the parameters of :func:`poisson`.
+
+    The mean of the distribution is evaluated from the first moment of the peak, and
+    then amplitude and offset are evaluated by linear regression.
+
+    :param x: X values of the data
+    :type x: np.ndarray
+    :param y: Y values of the data
+    :type y: np.ndarray
+    :return: initial guess of the parameters
+    :rtype: np.ndarray
+    """
+    x, y = _sort_by_x(x, y)
+    offset = np.median(y)
+    for _ in range(2):
+        mean, _ = _peak_moments(x, y, offset)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            distribution = np.exp(
+                x * np.log(mean)
+                - mean
+                - scipy.special.gammaln(x + 1)  # pylint: disable=no-member
+            )
+        amplitude, offset = _linear_regression(distribution, y)
+    return np.array([amplitude, mean, offset])
+
+
+def straight_power_initial_guess(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Estimate the parameters of :func:`straight_power`.
+
+    For each shift and exponent in a grid of candidates, amplitude and offset are
+    evaluated by linear regression. The candidate which explains the data best is
+    chosen.
+
+    :param x: X values of the data
+    :type x: np.ndarray
+    :param y: Y values of the data
+    :type y: np.ndarray
+    :return: initial guess of the parameters
+    :rtype: np.ndarray
+    """
+    amplitude, shift, exponent, offset = _power_guess(x, y, POWER_EXPONENTS)
+    return np.array([amplitude, shift, exponent, offset])
+
+
+def inverse_power_initial_guess(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Estimate the parameters of :func:`inverse_power`.
+
+    For each shift and exponent in a grid of candidates, amplitude and offset are
+    evaluated by linear regression. The candidate which explains the data best is
+    chosen.
+
+    :param x: X values of the data
+    :type x: np.ndarray
+    :param y: Y values of the data
+    :type y: np.ndarray
+    :return: initial guess of the parameters
+    :rtype: np.ndarray
+    """
+    amplitude, shift, exponent, offset = _power_guess(x, y, -POWER_EXPONENTS)
+    return np.array([amplitude, shift, -exponent, offset])
+
+
+def sin_initial_guess(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Estimate the parameters of :func:`sin`.
+
+    The frequency is taken from the peak of the spectrum of the data. The spectrum is
+    evaluated with FFT for evenly sampled data and with Lomb-Scargle periodogram
+    otherwise. Since :code:`a[0] * sin(a[1] * x + a[2])` is a linear combination of
+    :code:`sin(a[1] * x)` and :code:`cos(a[1] * x)`, amplitude, phase and offset are
+    evaluated by linear regression. The frequency is then refined around the peak by
+    choosing the candidate whose regression explains the data best.
+
+    :param x: X values of the data
+    :type x: np.ndarray
+    :param y: Y values of the data
+    :type y: np.ndarray
+    :return: initial guess of the parameters
+    :rtype: np.ndarray
+    """
+    frequency, sin_coefficient, cos_coefficient, offset = _periodic_guess(x, y)
+    return np.array(
+        [
+            np.hypot(sin_coefficient, cos_coefficient),
+            frequency,
+            np.arctan2(cos_coefficient, sin_coefficient),
+            offset,
+        ]
+    )
+
+
+def cos_initial_guess(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Estimate the parameters of :func:`cos`.
+
+    The frequency is taken from the peak of the spectrum of the data. The spectrum is
+    evaluated with FFT for evenly sampled data and with Lomb-Scargle periodogram
+    otherwise. Since :code:`a[0] * cos(a[1] * x + a[2])` is a linear combination of
+    :code:`sin(a[1] * x)` and :code:`cos(a[1] * x)`, amplitude, phase and offset are
+    evaluated by linear regression. The frequency is then refined around the peak by
+    choosing the candidate whose regression explains the data best.
+
+    :param x: X values of the data
+    :type x: np.ndarray
+    :param y: Y values of the data
+    :type y: np.ndarray
+    :return: initial guess of the parameters
+    :rtype: np.ndarray
+    """
+    frequency, sin_coefficient, cos_coefficient, offset = _periodic_guess(x, y)
+    return np.array(
+        [
+            np.hypot(sin_coefficient, cos_coefficient),
+            frequency,
+            np.arctan2(-sin_coefficient, cos_coefficient),
+            offset,
+        ]
+    )
+
+
+def _sort_by_x(x, y) -> Tuple[np.ndarray, np.ndarray]:
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    order = np.argsort(x)
+    return x[order], y[order]
+
+
+def _subsample(x, y, size) -> Tuple[np.ndarray, np.ndarray]:
+    # An evenly spread subsample of sorted values, which keeps the smallest and
+    # largest x.
+    if x.size <= size:
+        return x, y
+    indices = np.round(np.linspace(0, x.size - 1, size)).astype(int)
+    return x[indices], y[indices]
+
+
+def _linear_regression(design, y, with_offset=True) -> np.ndarray:
+    design = np.atleast_2d(design)
+    if with_offset:
+        design = np.concatenate([design, np.ones(shape=(1, y.size))])
+    if not np.all(np.isfinite(design)):
+        return np.full(shape=design.shape[0], fill_value=np.nan)
+    return np.linalg.lstsq(design.T, y, rcond=None)[0]
+
+
+def _peak_moments(x, y, offset) -> Tuple[float, float]:
+    peak_sign = np.sign(y[np.argmax(np.abs(y - offset))] - offset)
+    weights = np.clip(peak_sign * (y - offset), 0, None) * np.gradient(x)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        center = np.sum(weights * x) / np.sum(weights)
+        variance = np.sum(weights * np.square(x - center)) / np.sum(weights)
+    return center, variance
+
+
+def _power_guess(x, y, exponents) -> Tuple[float, float, float, float]:
+    x, y = _subsample(*_sort_by_x(x, y), size=POWER_GUESS_MAX_POINTS)
+    x_min = np.min(x)
+    shifts = POWER_SHIFTS * (np.max(x) - x_min) - x_min
+    with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+        bases = np.power(
+            x + shifts[:, np.newaxis, np.newaxis], exponents[:, np.newaxis]
+        )
+        bases_centered = bases - np.mean(bases, axis=-1, keepdims=True)
+        covariance = bases_centered @ (y - np.mean(y))
+        bases_variance = np.sum(np.square(bases_centered), axis=-1)
+        correlation_score = np.square(covariance) / bases_variance
+    shift_index, exponent_index = np.unravel_index(
+        np.argmax(np.where(np.isfinite(correlation_score), correlation_score, 0)),
+        correlation_score.shape,
+    )
+    best = (shift_index, exponent_index)
+    amplitude = covariance[best] / bases_variance[best]
+    offset = np.mean(y) - amplitude * np.mean(bases[best])
+    return amplitude, shifts[shift_index], exponents[exponent_index], offset
+
+
+def _periodic_guess(x, y) -> Tuple[float, float, float, float]:
+    x, y = _sort_by_x(x, y)
+    if x.size < 2 or x[-1] == x[0]:
+        # The spectrum of a single x value is undefined.
+        return np.nan, np.nan, np.nan, np.nan
+    frequency = _peak_angular_frequency(x, y - np.mean(y))
+    window = 2 * np.pi / (x[-1] - x[0])
+    for _ in range(REFINEMENT_ROUNDS):
+        candidates = frequency + window * np.linspace(-1, 1, REFINEMENT_POINTS)
+        candidates = candidates[candidates > 0]
+        phases = candidates[:, np.newaxis] * x
+        design = np.stack(
+            [np.sin(phases), np.cos(phases), np.ones_like(phases)], axis=1
+        )
+        coefficients = np.linalg.pinv(design @ np.swapaxes(design, 1, 2)) @ (
+            (design @ y)[..., np.newaxis]
+        )
+        residuals = y - np.sum(coefficients * design, axis=1)
+        best = np.argmin(np.sum(np.square(residuals), axis=1))
+        frequency = candidates[best]
+        window = window * 2 / (REFINEMENT_POINTS - 1)
+    sin_coefficient, cos_coefficient, offset = coefficients[best, :, 0]
+    return frequency, sin_coefficient, cos_coefficient, offset
+
+
+def _peak_angular_frequency(x, y) -> float:
+    spacing = np.diff(x)
+    padded_size = SPECTRUM_OVERSAMPLING * x.size
+    if np.allclose(spacing, spacing[0]):
+        spectrum = np.abs(np.fft.rfft(y, n=padded_size))
+        frequencies = 2 * np.pi * np.fft.rfftfreq(padded_size, d=spacing[0])
+    else:
+        frequencies = np.linspace(
+            2 * np.pi / (x[-1] - x[0]),
+            np.pi / np.median(spacing[spacing > 0]),
+            padded_size,
+        )
+        spectrum = scipy.signal.lombscargle(x, y, frequencies)
+    return frequencies[np.argmax(spectrum[1:]) + 1]
@@ -0,0 +1,199 @@
+"""Fit several candidate functions to the same data and rank them."""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+from prettytable import PrettyTable
+
+from eddington.exceptions import EddingtonException, FittingError
+from eddington.fitting import fit
+from eddington.fitting_data import FittingData
+from eddington.fitting_function_class import FittingFunction
+from eddington.fitting_functions_registry import FittingFunctionsRegistry
+from eddington.fitting_result import FittingResult
+from eddington.parallel_util import get_executor
+from eddington.print_util import to_relevant_precision_string
+
+CRITERIA = ["aic", "bic", "chi2_reduced"]
+
+
+@dataclass
+class CandidateFit:
+    """
+    Fitting result of a single candidate function.
+
+    :param func: The candidate fitting function.
+    :type func: FittingFunction
+    :param result: Fitting result of the candidate.
+    :type result: FittingResult
+    """
+
+    func: FittingFunction
+    result: FittingResult
+
+
+@dataclass(repr=False)
+class FitAllResult:
+    """
+    Candidate functions ranked by an information criterion.
+
+    :param candidates: Successfully fitted candidates, from best to worst.
+    :type candidates: list of CandidateFit
+    :param failures: Names of dropped candidates and the reasons they were dropped.
+    :type failures: dict from str to str
+    :param criterion: The criterion used for ranking. One of "aic", "bic" and
+        "chi2_reduced".
+    :type criterion: str
+    """
+
+    candidates: List[CandidateFit]
+    failures: Dict[str, str] = field(default_factory=dict)
+    criterion: str = field(default="aic")
+
+    @property
+    def best(self) -> CandidateFit:
+        """
+        The best candidate according to the ranking criterion.
+
+        :return: best candidate
+        :rtype: CandidateFit
+        :raises FittingError: Raised when all candidates were dropped.
+        """
+        if len(self.candidates) == 0:
+            raise FittingError("All candidate functions were dropped")
+        return self.candidates[0]
+
+    @property
+    def pretty_string(self) -> str:
+        """
+        Pretty representation string of the ranking table.
+
+        :return: self representing pretty string
+        :rtype: str
+        """
+        table = PrettyTable(
+            field_names=[
+                "Rank",
+                "Function",
+                "Chi squared reduced",
+                "AIC",
+                "BIC",
+                "P-probability",
+            ]
+        )
+        for rank, candidate in enumerate(self.candidates, start=1):
+            result = candidate.result
+            table.add_row(
+                [
+                    rank,
+                    candidate.func.name,
+                    *[
+                        to_relevant_precision_string(value, result.precision)
+                        for value in [
+                            result.chi2_reduced,
+                            result.aic,
+                            result.bic,
+                            result.p_probability,
+                        ]
+                    ],
+                ]
+            )
+        pretty_string = f"Ranked by {self.criterion}:\n{table}\n"
+        if len(self.failures) != 0:
+            pretty_string += "Dropped candidates:\n" + "".join(
+                f"\t{name}: {reason}\n" for name, reason in self.failures.items()
+            )
+        return pretty_string
+
+    def __repr__(self) -> str:
+        """
+        Representation string.
+
+        :return: self representing pretty string
+        :rtype: str
+        """
+        return self.pretty_string
+
+
+def fit_all(  # pylint: disable=too-many-arguments,too-many-locals
+    data: FittingData,
+    functions: Optional[List[FittingFunction]] = None,
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    criterion: str = "aic",
+    use_x_derivative: bool = True,
+    use_a_derivative: bool = True,
+) -> FitAllResult:
+    """
+    Fit all candidate functions to the data and rank them.
+
+    The selected records and columns of the data are extracted once and shared by
+    all candidates. Candidates which fail, diverge or exceed the timeout are dropped
+    from the ranking.
+
+    :param data: Fitting data to optimize
+    :type data: FittingData
+    :param functions: Candidate fitting functions. If None, use all the functions in
+        the :class:`FittingFunctionsRegistry`.
+    :type functions: list of FittingFunction
+    :param workers: Number of worker processes. If None, fit in the calling process.
+    :type workers: int
+    :param timeout: Optional. Maximum time in seconds for fitting each candidate.
+    :type timeout: float
+    :param criterion: Criterion to rank candidates by, from lowest to highest. One of
+        "aic", "bic" and "chi2_reduced".
+    :type criterion: str
+    :param use_x_derivative: indicates whether to use x derivative or not.
+    :type use_x_derivative: bool
+    :param use_a_derivative: indicates whether to use a derivative or not.
+    :type use_a_derivative: bool
+    :return: ranked candidates
+    :rtype: FitAllResult
+    :raises FittingError: Raised when the criterion is unknown or missing information
+        for the fitting algorithm.
+    """
+    if criterion not in CRITERIA:
+        raise FittingError(
+            f'Unknown criterion "{criterion}". Should be one of {", ".join(CRITERIA)}'
+        )
+    if data.x is None:
+        raise FittingError("Cannot fit data without x values")
+    if data.y is None:
+        raise FittingError("Cannot fit data without y values")
+    if functions is None:
+        functions = FittingFunctionsRegistry.all()
+    shared_data = data.copy(only_selected_columns=True, only_selected_records=True)
+    failures: Dict[str, str] = {}
+    candidates: List[CandidateFit] = []
+    with get_executor(workers) as executor:
+        futures = []
+        for func in functions:
+            if func.active_parameters >= shared_data.number_of_records:
+                failures[func.name] = "Not enough records"
+                continue
+            future = executor.submit(
+                fit,
+                data=shared_data,
+                func=func,
+                use_x_derivative=use_x_derivative,
+                use_a_derivative=use_a_derivative,
+                timeout=timeout,
+            )
+            futures.append((func, future))
+        for func, future in futures:
+            try:
+                result = future.result()
+            except (EddingtonException, ArithmeticError, ValueError) as error:
+                failures[func.name] = str(error)
+                continue
+            if result.diagnostics.timed_out:
+                failures[
+                    func.name
+                ] = f"Fitting did not converge within {timeout} seconds"
+                continue
+            if not np.isfinite(result.chi2):
+                failures[func.name] = "Diverged"
+                continue
+            candidates.append(CandidateFit(func=func, result=result))
+    candidates.sort(key=lambda candidate: getattr(candidate.result, criterion))
+    return FitAllResult(candidates=candidates, failures=failures, criterion=criterion)
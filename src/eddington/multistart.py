@@ -0,0 +1,199 @@
+"""Global search of the fitting parameters by fitting from multiple starting points."""
+from dataclasses import dataclass, field, replace
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from prettytable import PrettyTable
+
+from eddington.exceptions import FittingError
+from eddington.fitting import fit
+from eddington.fitting_data import FittingData
+from eddington.fitting_function_class import FittingFunction
+from eddington.fitting_result import FittingResult
+from eddington.parallel_util import get_executor
+
+PROBE_ITERATIONS = 10
+
+
+@dataclass
+class Basin:
+    """
+    A minimum of chi squared which was reached by one or more starting points.
+
+    :param a: Parameters at the minimum.
+    :type a: np.ndarray
+    :param chi2: Chi squared at the minimum.
+    :type chi2: float
+    :param starts: Number of starting points which converged to this minimum.
+    :type starts: int
+    """
+
+    a: np.ndarray
+    chi2: float
+    starts: int = 1
+
+
+@dataclass(repr=False)
+class MultistartResult:
+    """
+    Result of a multi-start fit.
+
+    :param best: Fitting result with the lowest chi squared among all starts.
+    :type best: FittingResult
+    :param basins: The different minima found, sorted by chi squared.
+    :type basins: list of Basin
+    :param pruned: Number of starting points which were stopped early since they fell
+        behind the others.
+    :type pruned: int
+    """
+
+    best: FittingResult
+    basins: List[Basin]
+    pruned: int = field(default=0)
+
+    @property
+    def pretty_string(self) -> str:
+        """
+        Pretty representation string of the basins found.
+
+        :return: self representing pretty string
+        :rtype: str
+        """
+        table = PrettyTable(
+            field_names=["Basin", "Parameters", "Chi squared", "Starts"]
+        )
+        for i, basin in enumerate(self.basins, start=1):
+            table.add_row(
+                [
+                    i,
+                    np.array2string(basin.a, precision=self.best.precision),
+                    f"{basin.chi2:.{self.best.precision}g}",
+                    basin.starts,
+                ]
+            )
+        return f"{table}\nPruned starts: {self.pruned}\n"
+
+    def __repr__(self) -> str:
+        """
+        Representation string.
+
+        :return: self representing pretty string
+        :rtype: str
+        """
+        return self.pretty_string
+
+
+def multistart_fit(  # pylint: disable=too-many-arguments,too-many-locals
+    data: FittingData,
+    func: FittingFunction,
+    bounds: Sequence[Tuple[float, float]],
+    starts: int = 10,
+    workers: Optional[int] = None,
+    keep: float = 0.5,
+    probe_iterations: int = PROBE_ITERATIONS,
+    basin_tolerance: float = 1e-3,
+    seed: Optional[int] = None,
+    use_x_derivative: bool = True,
+    use_a_derivative: bool = True,
+) -> MultistartResult:
+    """
+    Fit from multiple starting points in order to find the global minimum.
+
+    The starting points are sampled by a Latin hypercube within the given bounds.
+    Each start is first fitted for a few iterations only, and then only the starts with
+    the lowest chi squared are fitted until convergence. The others are pruned since
+    they fell behind early.
+
+    :param data: Fitting data to optimize
+    :type data: FittingData
+    :param func: a function to fit the data according to.
+    :type func: FittingFunction
+    :param bounds: Lower and upper bound for each active parameter of the function.
+    :type bounds: list of tuples
+    :param starts: Number of starting points.
+    :type starts: int
+    :param workers: Number of worker processes. If None, fit in the calling process.
+    :type workers: int
+    :param keep: Fraction of the starting points to fit until convergence.
+    :type keep: float
+    :param probe_iterations: Number of iterations to fit each starting point before
+        pruning.
+    :type probe_iterations: int
+    :param basin_tolerance: Relative and absolute tolerance of the parameters for
+        results to be considered in the same basin.
+    :type basin_tolerance: float
+    :param seed: Seed of the random sampling of the starting points.
+    :type seed: int
+    :param use_x_derivative: indicates whether to use x derivative or not.
+    :type use_x_derivative: bool
+    :param use_a_derivative: indicates whether to use a derivative or not.
+    :type use_a_derivative: bool
+    :returns: the best fitting result and a summary of the basins found
+    :rtype: MultistartResult
+    :raises FittingError: Raised when the bounds do not match the function
+        parameters.
+    """
+    bounds_array = np.asarray(bounds, dtype=float)
+    if bounds_array.shape != (func.active_parameters, 2):
+        raise FittingError(
+            f"Expected bounds for {func.active_parameters} parameters, "
+            f"got {len(bounds_array)}"
+        )
+    if starts <= 0:
+        raise FittingError(f"Number of starts should be positive, got {starts}")
+    lower, upper = bounds_array.T
+    start_points = lower + (upper - lower) * _latin_hypercube(
+        starts, func.active_parameters, seed=seed
+    )
+    fit_kwargs = dict(
+        data=data,
+        func=func,
+        use_x_derivative=use_x_derivative,
+        use_a_derivative=use_a_derivative,
+    )
+    survivors = max(1, int(np.ceil(keep * starts)))
+    with get_executor(workers) as executor:
+        probes = [
+            executor.submit(fit, a0=a0, max_iterations=probe_iterations, **fit_kwargs)
+            for a0 in start_points
+        ]
+        probe_results = [probe.result() for probe in probes]
+        leading = np.argsort(_chi2_values(probe_results), kind="stable")[:survivors]
+        futures = [
+            executor.submit(fit, a0=probe_results[i].a, **fit_kwargs) for i in leading
+        ]
+        results = [
+            replace(future.result(), a0=start_points[i])
+            for i, future in zip(leading, futures)
+        ]
+    results.sort(key=lambda result: _chi2_values([result])[0])
+    return MultistartResult(
+        best=results[0],
+        basins=_find_basins(results, tolerance=basin_tolerance),
+        pruned=starts - survivors,
+    )
+
+
+def _latin_hypercube(samples, dimensions, seed) -> np.ndarray:
+    generator = np.random.default_rng(seed)
+    strata = np.stack(
+        [generator.permutation(samples) for _ in range(dimensions)], axis=1
+    )
+    return (strata + generator.random(size=(samples, dimensions))) / samples
+
+
+def _chi2_values(results) -> np.ndarray:
+    chi2 = np.array([result.chi2 for result in results], dtype=float)
+    return np.where(np.isfinite(chi2), chi2, np.inf)
+
+
+def _find_basins(results, tolerance) -> List[Basin]:
+    basins: List[Basin] = []
+    for result in results:
+        for basin in basins:
+            if np.allclose(result.a, basin.a, rtol=tolerance, atol=tolerance):
+                basin.starts += 1
+                break
+        else:
+            basins.append(Basin(a=result.a, chi2=result.chi2))
+    return basins
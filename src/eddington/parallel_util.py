@@ -0,0 +1,48 @@
+"""Utilities for running fitting tasks in a pool of workers."""
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Optional
+
+
+class SerialExecutor(Executor):
+    """
+    Executor which runs each task in the calling process once it is submitted.
+
+    Used when no workers are requested, so that the same code path serves both
+    serial and parallel runs without the cost of starting new processes.
+    """
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:  # type: ignore
+        """
+        Run a task and wrap its outcome in a future.
+
+        :param fn: Callable to run
+        :type fn: callable
+        :param args: Positional arguments of the callable
+        :param kwargs: Keyword arguments of the callable
+        :return: A done future with the result or the exception of the task
+        :rtype: Future
+        """
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as error:  # pylint: disable=broad-except
+            future.set_exception(error)
+        return future
+
+
+def get_executor(workers: Optional[int] = None) -> Executor:
+    """
+    Get an executor for fitting tasks.
+
+    Fitting runs are CPU bound, hence tasks are distributed between processes. Tasks
+    and their arguments, including fitting functions, should be picklable.
+
+    :param workers: Number of worker processes. If None or 1, tasks run serially in
+        the calling process.
+    :type workers: int
+    :return: an executor
+    :rtype: Executor
+    """
+    if workers is None or workers <= 1:
+        return SerialExecutor()
+    return ProcessPoolExecutor(max_workers=workers)
@@ -0,0 +1,257 @@
+"""Scanning of chi squared over the fitting parameters."""
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from eddington.exceptions import FittingError
+from eddington.fitting import _effective_variance, fit
+from eddington.fitting_data import FittingData
+from eddington.fitting_function_class import FittingFunction
+from eddington.fitting_result import FittingResult
+
+MAX_CHUNK_ELEMENTS = 2**22
+
+
+@dataclass
+class Chi2ScanResult:
+    """
+    Chi squared evaluated over a grid of parameters.
+
+    :param axes: Values of each active parameter along the grid.
+    :type axes: list of np.ndarray
+    :param chi2: Chi squared on the grid, with one dimension per active parameter,
+        such that ``chi2[i, j]`` corresponds to ``axes[0][i]`` and ``axes[1][j]``.
+    :type chi2: np.ndarray
+    """
+
+    axes: List[np.ndarray]
+    chi2: np.ndarray
+
+    @property
+    def delta_chi2(self) -> np.ndarray:
+        """
+        Chi squared on the grid relative to its minimum.
+
+        :return: chi squared differences, of the same shape as chi2
+        :rtype: np.ndarray
+        """
+        return self.chi2 - np.nanmin(self.chi2)
+
+    @property
+    def minimum(self) -> np.ndarray:
+        """
+        Parameters of the grid point with the lowest chi squared.
+
+        :return: parameters of the minimum
+        :rtype: np.ndarray
+        """
+        indices = np.unravel_index(np.nanargmin(self.chi2), self.chi2.shape)
+        return np.array([axis[i] for axis, i in zip(self.axes, indices)])
+
+
+@dataclass
+class ProfileLikelihoodResult:
+    """
+    Profile of chi squared along a single parameter.
+
+    :param param_index: Index of the profiled parameter among the active parameters.
+    :type param_index: int
+    :param values: Values of the profiled parameter, in ascending order.
+    :type values: np.ndarray
+    :param chi2: Minimal chi squared for each value of the profiled parameter.
+    :type chi2: np.ndarray
+    :param a: All active parameters at each point of the profile, of shape
+        (values, parameters).
+    :type a: np.ndarray
+    :param best_chi2: Chi squared of the unconstrained fit.
+    :type best_chi2: float
+    """
+
+    param_index: int
+    values: np.ndarray
+    chi2: np.ndarray
+    a: np.ndarray
+    best_chi2: float
+
+    @property
+    def delta_chi2(self) -> np.ndarray:
+        """
+        Chi squared of the profile relative to the unconstrained fit.
+
+        :return: chi squared differences
+        :rtype: np.ndarray
+        """
+        return self.chi2 - min(self.best_chi2, np.nanmin(self.chi2))
+
+    def interval(self, delta_chi2: float = 1.0) -> Tuple[float, float]:
+        """
+        Interval of the profiled parameter in which chi squared rises by at most delta.
+
+        The bounds are linearly interpolated between the profile values. A bound which
+        is not crossed within the profile is NaN.
+
+        :param delta_chi2: Rise of chi squared defining the interval. 1 corresponds to
+            a single standard deviation.
+        :type delta_chi2: float
+        :return: lower and upper bounds
+        :rtype: tuple of floats
+        """
+        delta = self.delta_chi2
+        center = int(np.nanargmin(delta))
+        return (
+            _crossing(self.values[center::-1], delta[center::-1], delta_chi2),
+            _crossing(self.values[center:], delta[center:], delta_chi2),
+        )
+
+
+def chi2_scan(
+    data: FittingData,
+    func: FittingFunction,
+    grid: Sequence[np.ndarray],
+    chunk_size: Optional[int] = None,
+) -> Chi2ScanResult:
+    """
+    Evaluate chi squared over a grid of the active parameters.
+
+    The grid points are evaluated in chunks, each by a single call to
+    :meth:`FittingFunction.evaluate_batch`, so that memory is bounded regardless of the
+    size of the grid. In order to scan only some of the parameters, fix the others
+    with :meth:`FittingFunction.fix`.
+
+    When the data has x errors and the function has an x derivative, they are
+    propagated into the y errors (effective variance). Otherwise x errors are ignored.
+
+    :param data: Fitting data to evaluate chi squared on.
+    :type data: FittingData
+    :param func: The fitting function.
+    :type func: FittingFunction
+    :param grid: Values of each active parameter to scan.
+    :type grid: list of np.ndarray
+    :param chunk_size: Optional. Number of grid points to evaluate at once. If None,
+        chosen such that each chunk has about 4 million evaluations.
+    :type chunk_size: int
+    :return: chi squared over the grid
+    :rtype: Chi2ScanResult
+    :raises FittingError: Raised when the grid does not match the function parameters
+        or missing information for the fitting algorithm.
+    """
+    if len(grid) != func.active_parameters:
+        raise FittingError(
+            f"Expected grid for {func.active_parameters} parameters, got {len(grid)}"
+        )
+    x, y = _data_arrays(data)
+    axes = [np.atleast_1d(np.asarray(axis, dtype=float)) for axis in grid]
+    shape = tuple(len(axis) for axis in axes)
+    size = int(np.prod(shape))
+    if chunk_size is None:
+        chunk_size = max(1, MAX_CHUNK_ELEMENTS // len(x))
+    chi2 = np.empty(size)
+    for start in range(0, size, chunk_size):
+        stop = min(start + chunk_size, size)
+        indices = np.unravel_index(np.arange(start, stop), shape)
+        a = np.stack([axis[i] for axis, i in zip(axes, indices)], axis=1)
+        chi2[start:stop] = _chi2_batch(func, a, x, y, data.xerr, data.yerr)
+    return Chi2ScanResult(axes=axes, chi2=chi2.reshape(shape))
+
+
+def profile_likelihood(  # pylint: disable=too-many-arguments,too-many-locals
+    data: FittingData,
+    func: FittingFunction,
+    result: FittingResult,
+    param_index: int,
+    values: Optional[np.ndarray] = None,
+    points: int = 21,
+    width: float = 3.0,
+) -> ProfileLikelihoodResult:
+    """
+    Profile chi squared along a single parameter.
+
+    For each value of the profiled parameter, the parameter is fixed and the other
+    (nuisance) parameters are re-fitted. The values are visited outwards from the
+    fitted one, each fit starting from the parameters of the previous step.
+
+    :param data: Fitting data which was fitted.
+    :type data: FittingData
+    :param func: The fitted function.
+    :type func: FittingFunction
+    :param result: Fitting result of the data.
+    :type result: FittingResult
+    :param param_index: Index of the parameter to profile among the active
+        parameters.
+    :type param_index: int
+    :param values: Optional. Values of the profiled parameter. If None, use evenly
+        spaced values around the fitted value.
+    :type values: np.ndarray
+    :param points: Number of values to profile when values are not given.
+    :type points: int
+    :param width: Width, in standard errors, of the profile on each side of the
+        fitted value when values are not given.
+    :type width: float
+    :return: the profile
+    :rtype: ProfileLikelihoodResult
+    :raises FittingError: Raised when the parameter index is invalid or the function
+        has no nuisance parameters.
+    """
+    if not 0 <= param_index < func.active_parameters:
+        raise FittingError(
+            f"Parameter index should be between 0 and {func.active_parameters - 1}, "
+            f"got {param_index}"
+        )
+    if func.active_parameters < 2:
+        raise FittingError("Cannot profile a function without nuisance parameters")
+    best_a = np.asarray(result.a, dtype=float)
+    if values is None:
+        center, spread = best_a[param_index], width * result.aerr[param_index]
+        values = np.linspace(center - spread, center + spread, points)
+    values = np.sort(np.asarray(values, dtype=float))
+    absolute_index = [i for i in range(func.n) if i not in func.fixed][param_index]
+    best_nuisance_a = np.delete(best_a, param_index)
+    chi2 = np.empty(len(values))
+    profile_a = np.empty((len(values), len(best_a)))
+    start = int(np.searchsorted(values, best_a[param_index]))
+    try:
+        for order in [range(start, len(values)), range(start - 1, -1, -1)]:
+            nuisance_a = best_nuisance_a
+            for i in order:
+                func.fix(absolute_index, values[i])
+                step_result = fit(data, func, a0=nuisance_a)
+                nuisance_a = step_result.a
+                chi2[i] = step_result.chi2
+                profile_a[i] = np.insert(step_result.a, param_index, values[i])
+    finally:
+        func.unfix(absolute_index)
+    return ProfileLikelihoodResult(
+        param_index=param_index,
+        values=values,
+        chi2=chi2,
+        a=profile_a,
+        best_chi2=result.chi2,
+    )
+
+
+def _data_arrays(data: FittingData) -> Tuple[np.ndarray, np.ndarray]:
+    x, y = data.x, data.y
+    if x is None:
+        raise FittingError("Cannot fit data without x values")
+    if y is None:
+        raise FittingError("Cannot fit data without y values")
+    return np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+
+
+def _chi2_batch(  # pylint: disable=too-many-arguments
+    func, a, x, y, xerr, yerr
+) -> np.ndarray:
+    variance = _effective_variance(func, a, x, xerr, yerr, batch=True)
+    return np.sum(np.square(y - func.evaluate_batch(a, x)) / variance, axis=-1)
+
+
+def _crossing(values, delta, level) -> float:
+    above = np.flatnonzero(delta > level)
+    if above.size == 0:
+        return np.nan
+    i = above[0]
+    if i == 0:
+        return np.nan
+    fraction = (level - delta[i - 1]) / (delta[i] - delta[i - 1])
+    return float(values[i - 1] + fraction * (values[i] - values[i - 1]))
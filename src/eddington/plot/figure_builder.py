@@ -4,7 +4,7 @@
 
 import numpy as np
 
-from eddington.consts import DEFAULT_TICKS
+from eddington.consts import DEFAULT_BAND_ALPHA, DEFAULT_TICKS
 from eddington.exceptions import PlottingError
 from eddington.fitting_data import FittingData
 from eddington.fitting_function_class import FittingFunction
@@ -391,6 +391,103 @@ def add_to_figure(self, fig: Figure):
         )
 
 
+class FigureBandInstruction(FigureInstruction):
+    """Add filled band to figure."""
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        x: Union[np.ndarray, List[float]],
+        lower: Union[np.ndarray, List[float]],
+        upper: Union[np.ndarray, List[float]],
+        label: Optional[str] = None,
+        color: Optional[str] = None,
+        alpha: float = DEFAULT_BAND_ALPHA,
+    ):
+        """
+        Instruction constructor.
+
+        :param x: X values of the band
+        :type x: floats list or numpy.ndarray
+        :param lower: Lower bounds of the band
+        :type lower: floats list or numpy.ndarray
+        :param upper: Upper bounds of the band
+        :type upper: floats list or numpy.ndarray
+        :param label: Label of the band to add to the legend.
+        :type label: str
+        :param color: Optional. Color of the band.
+        :type color: str
+        :param alpha: Opacity of the band.
+        :type alpha: float
+        """
+        super().__init__(name="band")
+        self.x = x
+        self.lower = lower
+        self.upper = upper
+        self.label = label
+        self.color = color
+        self.alpha = alpha
+
+    def add_to_figure(self, fig: Figure):
+        """
+        Add this instruction to figure.
+
+        :param fig: Figure to add element to
+        :type fig: Figure
+        """
+        fig.ax.fill_between(
+            self.x,
+            self.lower,
+            self.upper,
+            label=self.label,
+            color=self.color,
+            alpha=self.alpha,
+        )
+
+
+class FigureContourInstruction(FigureInstruction):
+    """Add contour lines to figure."""
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        x: Union[np.ndarray, List[float]],
+        y: Union[np.ndarray, List[float]],
+        z: np.ndarray,
+        levels: Optional[Union[np.ndarray, List[float]]] = None,
+        color: Optional[str] = None,
+    ):
+        """
+        Instruction constructor.
+
+        :param x: X values of the grid
+        :type x: floats list or numpy.ndarray
+        :param y: Y values of the grid
+        :type y: floats list or numpy.ndarray
+        :param z: Values on the grid, of shape (len(x), len(y))
+        :type z: numpy.ndarray
+        :param levels: Optional. Values to draw contour lines at.
+        :type levels: floats list or numpy.ndarray
+        :param color: Optional. Color of the contour lines.
+        :type color: str
+        """
+        super().__init__(name="contour")
+        self.x = x
+        self.y = y
+        self.z = z  # pylint: disable=invalid-name
+        self.levels = levels
+        self.color = color
+
+    def add_to_figure(self, fig: Figure):
+        """
+        Add this instruction to figure.
+
+        :param fig: Figure to add element to
+        :type fig: Figure
+        """
+        fig.ax.contour(
+            self.x, self.y, np.transpose(self.z), levels=self.levels, colors=self.color
+        )
+
+
 @dataclass
 class FigureBuilder:
     """Builder class for creating a figure."""
@@ -663,6 +760,74 @@ def add_plot(  # pylint: disable=too-many-arguments
             )
         )
 
+    def add_band(  # pylint: disable=too-many-arguments
+        self,
+        x: Union[np.ndarray, List[float]],
+        lower: Union[np.ndarray, List[float]],
+        upper: Union[np.ndarray, List[float]],
+        label: Optional[str] = None,
+        color: Optional[str] = None,
+        alpha: float = DEFAULT_BAND_ALPHA,
+    ):
+        """
+        Add filled band to figure.
+
+        Fills the area between the lower and upper bounds, such as the bounds returned
+        by :meth:`FittingResult.prediction_band`:
+        ``add_band(x, *result.prediction_band(func, x))``.
+
+        :param x: X values of the band
+        :type x: floats list or numpy.ndarray
+        :param lower: Lower bounds of the band
+        :type lower: floats list or numpy.ndarray
+        :param upper: Upper bounds of the band
+        :type upper: floats list or numpy.ndarray
+        :param label: Label of the band to add to the legend.
+        :type label: str
+        :param color: Optional. Color of the band.
+        :type color: str
+        :param alpha: Opacity of the band.
+        :type alpha: float
+        :return: self
+        :rtype: FigureBuilder
+        """
+        return self.add_instruction(
+            FigureBandInstruction(
+                x=x, lower=lower, upper=upper, label=label, color=color, alpha=alpha
+            )
+        )
+
+    def add_contour(  # pylint: disable=invalid-name,too-many-arguments
+        self,
+        x: Union[np.ndarray, List[float]],
+        y: Union[np.ndarray, List[float]],
+        z: np.ndarray,
+        levels: Optional[Union[np.ndarray, List[float]]] = None,
+        color: Optional[str] = None,
+    ):
+        """
+        Add contour lines to figure.
+
+        Fits the grids of :func:`chi2_scan`, such as
+        ``add_contour(*scan.axes, scan.delta_chi2, levels=[1, 4])``.
+
+        :param x: X values of the grid
+        :type x: floats list or numpy.ndarray
+        :param y: Y values of the grid
+        :type y: floats list or numpy.ndarray
+        :param z: Values on the grid, of shape (len(x), len(y))
+        :type z: numpy.ndarray
+        :param levels: Optional. Values to draw contour lines at.
+        :type levels: floats list or numpy.ndarray
+        :param color: Optional. Color of the contour lines.
+        :type color: str
+        :return: self
+        :rtype: FigureBuilder
+        """
+        return self.add_instruction(
+            FigureContourInstruction(x=x, y=y, z=z, levels=levels, color=color)
+        )
+
     def add_instruction(self, instruction: FigureInstruction) -> "FigureBuilder":
         """
         Add general instruction to plot building.
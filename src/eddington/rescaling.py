@@ -0,0 +1,183 @@
+"""
+Rescaling of the parameters of the out-of-the-box fitting functions.
+
+Each function here gets parameters ``a`` of a fitting function of x and y and returns
+the parameters of the same function of :math:`X = (x - x_{shift}) / x_{scale}` and
+:math:`Y = (y - y_{shift}) / y_{scale}`, together with their derivative with respect
+to ``a``, of shape (parameters, parameters). Since the inverse mapping is a rescaling
+as well, the same function maps the parameters back.
+"""
+from typing import Tuple
+
+import numpy as np
+import scipy.special
+
+
+def polynomial_rescale(
+    a: np.ndarray, x_shift: float, x_scale: float, y_shift: float, y_scale: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rescale the parameters of :func:`polynomial`, :func:`linear` and :func:`constant`.
+
+    Expanding :math:`(x_{shift} + x_{scale} X) ^ k` by the binomial theorem gives the
+    coefficients of X, which are linear in the parameters.
+
+    :param a: Parameters of the function
+    :type a: np.ndarray
+    :param x_shift: Shift of x
+    :type x_shift: float
+    :param x_scale: Scale of x. Should be positive
+    :type x_scale: float
+    :param y_shift: Shift of y
+    :type y_shift: float
+    :param y_scale: Scale of y. Should be positive
+    :type y_scale: float
+    :return: rescaled parameters and their derivative
+    :rtype: Tuple[np.ndarray, np.ndarray]
+    """
+    powers = np.arange(len(a))
+    exponents = np.maximum(powers - powers[:, np.newaxis], 0)
+    jacobian = (
+        scipy.special.comb(powers, powers[:, np.newaxis])
+        * np.power(float(x_shift), exponents)
+        * np.power(float(x_scale), powers[:, np.newaxis])
+        / y_scale
+    )
+    rescaled_a = jacobian @ a
+    rescaled_a[0] -= y_shift / y_scale
+    return rescaled_a, jacobian
+
+
+def exponential_rescale(
+    a: np.ndarray, x_shift: float, x_scale: float, y_shift: float, y_scale: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rescale the parameters of :func:`exponential`.
+
+    The shift of x is absorbed in the amplitude and the scale of x in the rate.
+
+    :param a: Parameters of the function
+    :type a: np.ndarray
+    :param x_shift: Shift of x
+    :type x_shift: float
+    :param x_scale: Scale of x. Should be positive
+    :type x_scale: float
+    :param y_shift: Shift of y
+    :type y_shift: float
+    :param y_scale: Scale of y. Should be positive
+    :type y_scale: float
+    :return: rescaled parameters and their derivative
+    :rtype: Tuple[np.ndarray, np.ndarray]
+    """
+    growth = np.exp(a[1] * x_shift) / y_scale
+    rescaled_a = np.array([a[0] * growth, a[1] * x_scale, (a[2] - y_shift) / y_scale])
+    jacobian = np.array(
+        [
+            [growth, a[0] * x_shift * growth, 0],
+            [0, x_scale, 0],
+            [0, 0, 1 / y_scale],
+        ]
+    )
+    return rescaled_a, jacobian
+
+
+def straight_power_rescale(
+    a: np.ndarray, x_shift: float, x_scale: float, y_shift: float, y_scale: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rescale the parameters of :func:`straight_power`.
+
+    The shift of x is absorbed in the shift parameter and the scale of x in the
+    amplitude.
+
+    :param a: Parameters of the function
+    :type a: np.ndarray
+    :param x_shift: Shift of x
+    :type x_shift: float
+    :param x_scale: Scale of x. Should be positive
+    :type x_scale: float
+    :param y_shift: Shift of y
+    :type y_shift: float
+    :param y_scale: Scale of y. Should be positive
+    :type y_scale: float
+    :return: rescaled parameters and their derivative
+    :rtype: Tuple[np.ndarray, np.ndarray]
+    """
+    return _power_rescale(a, x_shift, x_scale, y_shift, y_scale, sign=1)
+
+
+def inverse_power_rescale(
+    a: np.ndarray, x_shift: float, x_scale: float, y_shift: float, y_scale: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rescale the parameters of :func:`inverse_power`.
+
+    The shift of x is absorbed in the shift parameter and the scale of x in the
+    amplitude.
+
+    :param a: Parameters of the function
+    :type a: np.ndarray
+    :param x_shift: Shift of x
+    :type x_shift: float
+    :param x_scale: Scale of x. Should be positive
+    :type x_scale: float
+    :param y_shift: Shift of y
+    :type y_shift: float
+    :param y_scale: Scale of y. Should be positive
+    :type y_scale: float
+    :return: rescaled parameters and their derivative
+    :rtype: Tuple[np.ndarray, np.ndarray]
+    """
+    return _power_rescale(a, x_shift, x_scale, y_shift, y_scale, sign=-1)
+
+
+def hyperbolic_rescale(
+    a: np.ndarray, x_shift: float, x_scale: float, y_shift: float, y_scale: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rescale the parameters of :func:`hyperbolic`.
+
+    The shift of x is absorbed in the shift parameter and the scale of x in the
+    amplitude.
+
+    :param a: Parameters of the function
+    :type a: np.ndarray
+    :param x_shift: Shift of x
+    :type x_shift: float
+    :param x_scale: Scale of x. Should be positive
+    :type x_scale: float
+    :param y_shift: Shift of y
+    :type y_shift: float
+    :param y_scale: Scale of y. Should be positive
+    :type y_scale: float
+    :return: rescaled parameters and their derivative
+    :rtype: Tuple[np.ndarray, np.ndarray]
+    """
+    jacobian = np.diag([1 / (x_scale * y_scale), 1 / x_scale, 1 / y_scale])
+    rescaled_a = jacobian @ a + np.array([0, x_shift / x_scale, -y_shift / y_scale])
+    return rescaled_a, jacobian
+
+
+def _power_rescale(  # pylint: disable=too-many-arguments
+    a, x_shift, x_scale, y_shift, y_scale, sign
+):
+    # (x + a[1]) ^ a[2] = x_scale ^ a[2] * (X + (a[1] + x_shift) / x_scale) ^ a[2]
+    # for straight power, and the same with -a[2] for inverse power.
+    amplitude_scale = np.power(float(x_scale), sign * a[2]) / y_scale
+    rescaled_a = np.array(
+        [
+            a[0] * amplitude_scale,
+            (a[1] + x_shift) / x_scale,
+            a[2],
+            (a[3] - y_shift) / y_scale,
+        ]
+    )
+    jacobian = np.array(
+        [
+            [amplitude_scale, 0, sign * a[0] * amplitude_scale * np.log(x_scale), 0],
+            [0, 1 / x_scale, 0, 0],
+            [0, 0, 1, 0],
+            [0, 0, 0, 1 / y_scale],
+        ]
+    )
+    return rescaled_a, jacobian
@@ -0,0 +1,66 @@
+"""Iterative rejection of outlying records."""
+import json
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from eddington.fitting_result import FittingResult
+
+DEFAULT_CLIP_SIGMAS = 3.0
+DEFAULT_CLIP_ITERATIONS = 5
+
+
+@dataclass(frozen=True)
+class SigmaClip:
+    """
+    Configuration of iterative sigma clipping for :func:`fit`.
+
+    :param k: Records whose normalized residual is larger than k are rejected.
+    :type k: float
+    :param max_iterations: Maximum number of refits after the first fit.
+    :type max_iterations: int
+    """
+
+    k: float = DEFAULT_CLIP_SIGMAS
+    max_iterations: int = DEFAULT_CLIP_ITERATIONS
+
+
+@dataclass(repr=False)
+class ClippedFittingResult(FittingResult):
+    """
+    Fitting result of the records which were kept by sigma clipping.
+
+    :param rejected: Indices of the rejected records, **starting from 1**.
+    :type rejected: np.ndarray
+    :param clip_iterations: Number of refits done after the first fit.
+    :type clip_iterations: int
+    """
+
+    rejected: np.ndarray = field(default_factory=lambda: np.array([], dtype=int))
+    clip_iterations: int = field(default=0)
+
+    @property
+    def pretty_string(self) -> str:
+        """
+        Pretty representation string.
+
+        :return: self representing pretty string
+        :rtype: str
+        """
+        rejected_string = " ".join(str(index) for index in self.rejected)
+        return (
+            f"{super().pretty_string}"
+            f"Rejected records: {rejected_string if rejected_string else 'None'}\n"
+        )
+
+    @property
+    def json_string(self):
+        """
+        Json representation string.
+
+        :return: self representing json string
+        :rtype: str
+        """
+        json_dict = json.loads(super().json_string)
+        json_dict["rejected"] = self.rejected.tolist()
+        return json.dumps(json_dict, indent=1)
@@ -0,0 +1,162 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from pytest_cases import parametrize
+
+import eddington.fitting_functions_list
+from eddington import (
+    fit,
+    fitting_function,
+    inverse_power,
+    linear,
+    random_data,
+    straight_power,
+)
+from eddington.batch_fitting import batch_fit
+from eddington.evaluation_cache import EvaluationCache
+from eddington.global_fitting import global_fit
+from tests.util import exact_x_data
+
+A = np.array([2, 0.5, 1.5, 1])
+X = np.linspace(1, 10, 20)
+
+
+@pytest.fixture
+def counted_func(mocker):
+    compute = mocker.Mock(side_effect=lambda a, x: a[0] * x)
+
+    @fitting_function(n=1, save=False)
+    def func(a, x):
+        return func.intermediate("scaled", a, x, compute)
+
+    return func, compute
+
+
+def test_intermediate_without_cache_is_computed_in_each_call(counted_func):
+    func, compute = counted_func
+
+    func(np.array([2]), X)
+    func(np.array([2]), X)
+
+    assert compute.call_count == 2
+
+
+def test_intermediate_with_cache_is_computed_once(counted_func):
+    func, compute = counted_func
+
+    with func.evaluation_cache() as cache:
+        func(np.array([2]), X)
+        func(np.array([2]), X)
+
+    assert compute.call_count == 1
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_nested_evaluation_cache_restores_previous_cache(counted_func):
+    func, compute = counted_func
+
+    with func.evaluation_cache() as outer_cache:
+        with func.evaluation_cache() as inner_cache:
+            func(np.array([2]), X)
+        func(np.array([2]), X)
+    func(np.array([2]), X)
+
+    assert inner_cache.misses == 1
+    assert outer_cache.misses == 1
+    assert compute.call_count == 3
+
+
+def test_evaluation_cache_is_not_used_by_other_threads(counted_func):
+    func, compute = counted_func
+
+    with func.evaluation_cache() as cache:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(func, np.array([2]), X).result()
+            executor.submit(func, np.array([2]), X).result()
+
+    assert compute.call_count == 2
+    assert cache.misses == 0
+
+
+@parametrize("func", [straight_power, inverse_power])
+def test_power_derivatives_with_cache(func):
+    expected_a_derivative = func.a_derivative(A, X)
+    expected_x_derivative = func.x_derivative(A, X)
+
+    with func.evaluation_cache() as cache:
+        value = func(A, X)
+        a_derivative = func.a_derivative(A, X)
+        x_derivative = func.x_derivative(A, X)
+
+    assert value == pytest.approx(func.fit_func(A, X))
+    assert a_derivative == pytest.approx(expected_a_derivative)
+    assert x_derivative == pytest.approx(expected_x_derivative)
+    assert cache.hits == 2
+    assert cache.misses == 1
+
+
+@parametrize("func", [straight_power, inverse_power])
+@parametrize("kwargs", [dict(condition=True), dict(engine="least_squares")])
+def test_fit_with_derivatives_reuses_intermediate_values(func, kwargs):
+    data = exact_x_data(func, A)
+
+    diagnostics = fit(data, func, a0=A, **kwargs).diagnostics
+
+    assert diagnostics.cache_hit_rate >= 0.4
+    assert diagnostics.cache_hit_rate == pytest.approx(
+        diagnostics.cache_hits / (diagnostics.cache_hits + diagnostics.cache_misses)
+    )
+
+
+@parametrize("func", [straight_power, inverse_power])
+@parametrize("exact_x", [True, False])
+def test_fit_with_finite_differences_has_no_cache(func, exact_x):
+    data = exact_x_data(func, A)
+
+    diagnostics = fit(data, func, a0=A, exact_x=exact_x).diagnostics
+
+    assert diagnostics.jacobian_evaluations == 0
+    assert diagnostics.cache_hits == 0
+    assert diagnostics.cache_misses == 0
+    assert diagnostics.cache_hit_rate == 0
+
+
+def test_fit_without_intermediate_values_has_no_cache_hits():
+    data = random_data(fit_func=linear, a=A[:2])
+
+    diagnostics = fit(data, linear).diagnostics
+
+    assert diagnostics.cache_hits == 0
+    assert diagnostics.cache_misses == 0
+    assert diagnostics.cache_hit_rate == 0
+
+
+@pytest.fixture
+def power_computations(mocker):
+    requests = mocker.spy(EvaluationCache, "get")
+    computations = mocker.spy(eddington.fitting_functions_list, "_shifted_power")
+    return requests, computations
+
+
+def test_global_fit_reuses_intermediate_values(power_computations):
+    requests, computations = power_computations
+    entries = [
+        (exact_x_data(straight_power, A + [0, 0, 0, i]), straight_power, names)
+        for i, names in enumerate([["a", "s", "p", "o1"], ["a", "s", "p", "o2"]])
+    ]
+
+    assert global_fit(entries, a0=dict(a=2, s=0.5, p=1.5, o1=1, o2=2)).converged
+    assert 0 < computations.call_count < requests.call_count
+
+
+def test_batch_fit_reuses_intermediate_values(power_computations):
+    requests, computations = power_computations
+    x = np.linspace(1, 10, 30)
+    y = straight_power(A, x) + np.random.default_rng(0).normal(
+        scale=0.05, size=(5, x.size)
+    )
+
+    assert batch_fit(straight_power, x, y, yerr=0.05, a0=A).converged.all()
+    assert 0 < computations.call_count < requests.call_count
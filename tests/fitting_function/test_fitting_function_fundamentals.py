@@ -96,6 +96,29 @@ def test_call_a_derivative_with_fix_value(dummy_func2_fixture):
     ), "a derivative execution result is different than expected"
 
 
+def test_call_x_derivative_into_out_array(dummy_func2_fixture):
+    a = np.array([7, 3, 2, 1])
+    x = np.array([1, 2])
+    out = np.empty(2)
+    result = dummy_func2_fixture.x_derivative(a, x, out=out)
+    assert result is out, "x derivative is not written into the out array"
+    assert out == pytest.approx(
+        np.array([10, 23]), rel=delta
+    ), "x derivative execution result is different than expected"
+
+
+def test_call_a_derivative_with_fix_value_into_out_array(dummy_func2_fixture):
+    a = np.array([7, 2, 1])
+    x = np.array([1, 2])
+    dummy_func2_fixture.fix(1, 3)
+    out = np.empty((3, 2))
+    result = dummy_func2_fixture.a_derivative(a, x, out=out)
+    assert result is out, "a derivative is not written into the out array"
+    assert out == pytest.approx(
+        np.array([[1, 1], [1, 4], [1, 8]]), rel=delta
+    ), "a derivative execution result is different than expected"
+
+
 def test_override_fix_value(dummy_func2_fixture):
     a = np.array([7, 2, 1])
     x = 2
@@ -192,7 +215,85 @@ def test_call_failure_when_trying_to_run_without_arguments(dummy_func2_fixture):
         dummy_func2_fixture()
 
 
+def test_initial_guess(dummy_func2_fixture):
+    x, y = np.arange(5), np.arange(5, 10)
+
+    assert dummy_func2_fixture.initial_guess(x, y) == pytest.approx(
+        [7, 1, 2, 3], rel=delta
+    ), "Initial guess is different than expected"
+
+
+def test_initial_guess_after_fix(dummy_func2_fixture):
+    x, y = np.arange(5), np.arange(5, 10)
+    dummy_func2_fixture.fix(1, 3)
+
+    assert dummy_func2_fixture.initial_guess(x, y) == pytest.approx(
+        [7, 2, 3], rel=delta
+    ), "Initial guess is different than expected"
+
+
+def test_no_initial_guess(dummy_func1_fixture):
+    assert dummy_func1_fixture.initial_guess is None
+
+
 def test_fitting_function_representation(dummy_func1_fixture):
     assert str(dummy_func1_fixture) == (
         "FittingFunction(name='dummy_func1', syntax='a[0] + a[1] * x ** 2')"
     ), "Representation is different than expected"
+
+
+def test_evaluate_batch_without_vectorization(dummy_func1_fixture):
+    a = np.array([[1, 2], [3, 4], [5, 6]])
+    x = np.arange(4)
+    result = dummy_func1_fixture.evaluate_batch(a, x)
+    np.testing.assert_allclose(result, [dummy_func1_fixture(a_row, x) for a_row in a])
+
+
+def test_evaluate_batch_with_x_per_row(dummy_func1_fixture):
+    a = np.array([[1, 2], [3, 4]])
+    x = np.array([[0, 1, 2], [3, 4, 5]])
+    result = dummy_func1_fixture.evaluate_batch(a, x)
+    np.testing.assert_allclose(result, [[1, 3, 9], [39, 67, 103]])
+
+
+def test_evaluate_batch_with_fix_value(dummy_func2_fixture):
+    a = np.array([[7, 2, 1], [1, 0, 0]])
+    dummy_func2_fixture.fix(1, 3)
+    result = dummy_func2_fixture.evaluate_batch(a, np.array([2]))
+    np.testing.assert_allclose(result, [[29], [7]])
+
+
+def test_a_derivative_batch_with_fix_value(dummy_func2_fixture):
+    a = np.array([[7, 2, 1], [1, 0, 0]])
+    dummy_func2_fixture.fix(1, 3)
+    result = dummy_func2_fixture.a_derivative_batch(a, np.array([2]))
+    np.testing.assert_allclose(result, [[[1], [4], [8]], [[1], [4], [8]]])
+
+
+def test_x_derivative_batch_with_fix_value(dummy_func2_fixture):
+    a = np.array([[7, 2, 1], [1, 0, 0]])
+    dummy_func2_fixture.fix(1, 3)
+    result = dummy_func2_fixture.x_derivative_batch(a, np.array([2]))
+    np.testing.assert_allclose(result, [[23], [3]])
+
+
+def test_evaluate_batch_failure_because_of_wrong_shape(dummy_func1_fixture):
+    with pytest.raises(
+        FittingFunctionRuntimeError,
+        match=r"^Input shape should be \(k, 2\), got \(3,\)$",
+    ):
+        dummy_func1_fixture.evaluate_batch(np.array([1, 2, 3]), np.arange(4))
+
+
+def test_a_derivative_batch_failure_without_a_derivative(dummy_func1_fixture):
+    with pytest.raises(
+        FittingFunctionRuntimeError, match='^"dummy_func1" has no a derivative$'
+    ):
+        dummy_func1_fixture.a_derivative_batch(np.ones((3, 2)), np.arange(4))
+
+
+def test_x_derivative_batch_failure_without_x_derivative(dummy_func1_fixture):
+    with pytest.raises(
+        FittingFunctionRuntimeError, match='^"dummy_func1" has no x derivative$'
+    ):
+        dummy_func1_fixture.x_derivative_batch(np.ones((3, 2)), np.arange(4))
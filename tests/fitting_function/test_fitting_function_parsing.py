@@ -60,6 +60,29 @@ def test_fitting_function_parse_linear_a_derivative(clear_functions_registry):
     np.testing.assert_almost_equal(res, expected)
 
 
+def test_fitting_function_parse_is_vectorized(clear_functions_registry):
+    fitting_func = parse_fitting_function(name="linear", syntax="a0 + a1 * x")
+    assert fitting_func.vectorized
+
+
+def test_fitting_function_parse_linear_evaluate_batch(clear_functions_registry):
+    fitting_func = parse_fitting_function(name="linear", syntax="a0 + a1 * x")
+    res = fitting_func.evaluate_batch(np.array([[1.3, 4.2], [0, 1]]), np.array([4, 6]))
+    np.testing.assert_almost_equal(res, np.array([[18.1, 26.5], [4, 6]]))
+
+
+def test_fitting_function_parse_linear_derivatives_batch(clear_functions_registry):
+    fitting_func = parse_fitting_function(name="linear", syntax="a0 + a1 * x")
+    a = np.array([[1.3, 4.7], [0, 1]])
+    x = np.linspace(0, 100, num=100)
+    np.testing.assert_almost_equal(
+        fitting_func.x_derivative_batch(a, x), [[4.7] * 100, [1] * 100]
+    )
+    np.testing.assert_almost_equal(
+        fitting_func.a_derivative_batch(a, x), [[np.ones(shape=100), x]] * 2
+    )
+
+
 def test_fitting_function_parse_with_syntax_error(clear_functions_registry):
     with pytest.raises(
         FittingFunctionParsingError,
@@ -0,0 +1,60 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from eddington import FittingFunctionRuntimeError, linear, polynomial
+from eddington.fitting_function_parser import parse_fitting_function
+from tests.dummy_functions import dummy_func1
+
+A = np.array([1, 2, 3, 4])
+X = np.linspace(-2, 2, 5)
+
+
+@pytest.fixture
+def polynomial_3():
+    func = polynomial(3)
+    yield func
+    func.clear_fixed()
+
+
+def test_pickle_registered_function():
+    assert pickle.loads(pickle.dumps(linear)) is linear
+
+
+def test_pickle_generated_function(polynomial_3):
+    unpickled_func = pickle.loads(pickle.dumps(polynomial_3))
+
+    assert unpickled_func.name == "polynomial_3"
+    assert unpickled_func(A, X) == pytest.approx(polynomial_3(A, X))
+    assert unpickled_func.a_derivative(A, X) == pytest.approx(
+        polynomial_3.a_derivative(A, X)
+    )
+
+
+def test_pickle_function_with_fixed_parameters(polynomial_3):
+    polynomial_3.fix(1, 5)
+
+    unpickled_func = pickle.loads(pickle.dumps(polynomial_3))
+
+    assert unpickled_func.fixed == {1: 5}
+    assert unpickled_func(A[:3], X) == pytest.approx(polynomial_3(A[:3], X))
+
+
+def test_pickle_parsed_function():
+    func = parse_fitting_function(name="parsed", syntax="a0 * x + a1", save=False)
+
+    unpickled_func = pickle.loads(pickle.dumps(func))
+
+    assert unpickled_func.name == "parsed"
+    assert np.array(unpickled_func(A[:2], X), dtype=float) == pytest.approx(
+        np.array(func(A[:2], X), dtype=float)
+    )
+
+
+def test_pickle_fail_for_unsaved_function():
+    with pytest.raises(
+        FittingFunctionRuntimeError,
+        match='^Cannot pickle "dummy_func1" since it is not saved in the registry$',
+    ):
+        pickle.dumps(dummy_func1)
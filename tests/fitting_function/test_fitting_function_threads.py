@@ -0,0 +1,166 @@
+import pickle
+import threading
+
+import numpy as np
+import pytest
+from scipy import sparse
+
+from eddington import (
+    FittingFunctionRuntimeError,
+    fit,
+    fitting_function,
+    polynomial,
+    random_data,
+)
+
+A = np.array([1, 2, 3, 4])
+X = np.linspace(-2, 2, 1001)
+CHUNK_SIZE = 100
+
+
+@pytest.fixture
+def polynomial_3():
+    func = polynomial(3)
+    yield func
+    func.set_threads(None)
+    func.clear_fixed()
+
+
+@pytest.fixture
+def threaded_polynomial_3(polynomial_3):
+    return polynomial_3.set_threads(4, chunk_size=CHUNK_SIZE)
+
+
+def test_threaded_evaluation(threaded_polynomial_3):
+    assert threaded_polynomial_3(A, X) == pytest.approx(polynomial(3)(A, X))
+
+
+def test_threaded_a_derivative(threaded_polynomial_3):
+    assert threaded_polynomial_3.a_derivative(A, X) == pytest.approx(
+        polynomial(3).a_derivative(A, X)
+    )
+
+
+def test_threaded_x_derivative(threaded_polynomial_3):
+    assert threaded_polynomial_3.x_derivative(A, X) == pytest.approx(
+        polynomial(3).x_derivative(A, X)
+    )
+
+
+def test_threaded_a_derivative_into_out_array(threaded_polynomial_3):
+    out = np.empty((4, X.size))
+
+    assert threaded_polynomial_3.a_derivative(A, X, out=out) is out
+    assert out == pytest.approx(polynomial(3).a_derivative(A, X))
+
+
+def test_threaded_x_derivative_without_out_support_into_out_array():
+    @fitting_function(n=2, x_derivative=lambda a, x: a[1] * x, save=False)
+    def half_square(a, x):
+        return a[0] + a[1] * x**2 / 2
+
+    half_square.set_threads(4, chunk_size=CHUNK_SIZE)
+    out = np.empty(X.size)
+
+    assert half_square.x_derivative(A[:2], X, out=out) is out
+    assert out == pytest.approx(2 * X)
+
+
+def test_threaded_a_derivative_with_fixed_parameters(threaded_polynomial_3):
+    threaded_polynomial_3.fix(1, 2)
+
+    assert threaded_polynomial_3.a_derivative(A[[0, 2, 3]], X) == pytest.approx(
+        polynomial(3).a_derivative(A, X)[[0, 2, 3]]
+    )
+
+
+@pytest.mark.parametrize("x", [1.5, X[:CHUNK_SIZE]])
+def test_small_evaluation_runs_in_calling_thread(threaded_polynomial_3, x):
+    assert threaded_polynomial_3(A, x) == pytest.approx(polynomial(3)(A, x))
+    assert threaded_polynomial_3._executor is None  # pylint: disable=protected-access
+
+
+def test_threaded_sparse_a_derivative():
+    @fitting_function(
+        n=2,
+        a_derivative=lambda a, x: sparse.csr_matrix(np.stack([np.ones_like(x), x])),
+        save=False,
+    )
+    def sparse_linear(a, x):
+        return a[0] + a[1] * x
+
+    sparse_linear.set_threads(4, chunk_size=CHUNK_SIZE)
+
+    assert sparse_linear.a_derivative(A[:2], X).toarray() == pytest.approx(
+        np.stack([np.ones_like(X), X])
+    )
+
+
+def test_set_threads_shuts_down_the_pool(threaded_polynomial_3):
+    threaded_polynomial_3(A, X)
+    executor = threaded_polynomial_3._executor  # pylint: disable=protected-access
+
+    threaded_polynomial_3.set_threads(None)
+
+    assert threaded_polynomial_3.threads is None
+    assert threaded_polynomial_3._executor is None  # pylint: disable=protected-access
+    with pytest.raises(RuntimeError):
+        executor.submit(print)
+
+
+def pool_threads(func):
+    return [
+        thread
+        for thread in threading.enumerate()
+        if thread.name.startswith(f"eddington-{func.name}")
+    ]
+
+
+def test_close_releases_the_threads_of_the_pool(threaded_polynomial_3):
+    threaded_polynomial_3(A, X)
+    threads = pool_threads(threaded_polynomial_3)
+
+    threaded_polynomial_3.close()
+
+    assert len(threads) > 0
+    assert not any(thread.is_alive() for thread in threads)
+    assert threaded_polynomial_3.threads == 4
+    assert threaded_polynomial_3(A, X) == pytest.approx(polynomial(3)(A, X))
+
+
+def test_close_without_pool(polynomial_3):
+    polynomial_3.close()
+
+    assert polynomial_3._executor is None  # pylint: disable=protected-access
+
+
+def test_context_releases_the_threads_of_the_pool(threaded_polynomial_3):
+    with threaded_polynomial_3 as func:
+        func(A, X)
+        threads = pool_threads(func)
+
+    assert len(threads) > 0
+    assert not any(thread.is_alive() for thread in threads)
+
+
+def test_set_threads_with_invalid_chunk_size_raises_error(polynomial_3):
+    with pytest.raises(
+        FittingFunctionRuntimeError, match="^Chunk size should be positive, got 0$"
+    ):
+        polynomial_3.set_threads(4, chunk_size=0)
+
+
+def test_pickle_threaded_function(threaded_polynomial_3):
+    unpickled_func = pickle.loads(pickle.dumps(threaded_polynomial_3))
+
+    assert unpickled_func.threads == 4
+    assert unpickled_func.threads_chunk_size == CHUNK_SIZE
+    assert unpickled_func(A, X) == pytest.approx(threaded_polynomial_3(A, X))
+
+
+def test_fit_with_threads(threaded_polynomial_3):
+    data = random_data(fit_func=polynomial(3), a=A, measurements=1000)
+
+    result = fit(data, threaded_polynomial_3)
+
+    assert result.a == pytest.approx(fit(data, polynomial(3)).a)
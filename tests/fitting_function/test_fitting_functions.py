@@ -240,10 +240,10 @@ def case_inverse_power_2():
         x_derivatives=[-4, -0.5, -0.1481481, -0.0625, -0.032],
         a_derivatives=[
             [1, -4, 0, 1],
-            [0.25, -0.5, -5.54518, 1],
-            [0.1111111, -0.1481481, -19.77502, 1],
-            [0.0625, -0.0625, -44.36142, 1],
-            [0.04, -0.032, -80.4719, 1],
+            [0.25, -0.5, -0.3465736, 1],
+            [0.1111111, -0.1481481, -0.2441361, 1],
+            [0.0625, -0.0625, -0.1732868, 1],
+            [0.04, -0.032, -0.128755, 1],
         ],
     )
 
@@ -260,17 +260,17 @@ def case_normal():
         y=[4.0, 3.336402349, 2.103638, 1.316197, 1.054946916],
         x_derivatives=[
             0,
-            -2.3364023492142145,
-            -2.207276647028654,
-            -0.948593021056779,
-            -0.21978766666481014,
+            -1.1682011746071073,
+            -1.103638323514327,
+            -0.4742965105283895,
+            -0.10989383333240507,
         ],
         a_derivatives=[
             [1, 0, 0, 1],
-            [0.7788007830714049, 2.3364023492142145, 1.1682011746071073, 1],
-            [0.36787944117144233, 2.207276647028654, 1.103638323514327, 1],
-            [0.1053992245618643, 0.948593021056779, 0.4742965105283895, 1],
-            [0.018315638888734147, 0.21978766666481014, 0.10989383333240507, 1],
+            [0.7788007830714049, 1.1682011746071073, 0.5841005873035536, 1],
+            [0.36787944117144233, 1.103638323514327, 1.103638323514327, 1],
+            [0.1053992245618643, 0.4742965105283895, 0.7114447657925842, 1],
+            [0.018315638888734147, 0.10989383333240507, 0.21978766666481014, 1],
         ],
     )
 
@@ -428,6 +428,60 @@ def test_execute_a_derivative_on_array(case):
         )
 
 
+@parametrize_with_cases(argnames="case", cases=THIS_MODULE)
+def test_execute_x_derivative_into_out_array(case):
+    out = np.full(len(case["x"]), np.nan)
+    x_derivative = case["func"].x_derivative(case["a"], case["x"], out=out)
+    assert x_derivative is out
+    assert out == pytest.approx(
+        case["x_derivatives"], rel=case.get("eps", 1e-5)
+    ), "X derivative written into out array is different than expected"
+
+
+@parametrize_with_cases(argnames="case", cases=THIS_MODULE)
+def test_execute_a_derivative_into_out_array(case):
+    out = np.full((case["n"], len(case["x"])), np.nan)
+    a_derivative = case["func"].a_derivative(case["a"], case["x"], out=out)
+    assert a_derivative is out
+    for i, (expected_a_derivative, actual_a_derivative) in enumerate(
+        zip(out.T, case["a_derivatives"]), start=1
+    ):
+        assert np.array(expected_a_derivative) == pytest.approx(
+            np.array(actual_a_derivative), rel=case.get("eps", 1e-5)
+        ), f"A derivative written into out array is different on value {i}"
+
+
+@parametrize_with_cases(argnames="case", cases=THIS_MODULE)
+def test_evaluate_batch(case):
+    a = np.stack([case["a"], case["a"] + 0.5])
+    result = case["func"].evaluate_batch(a, case["x"])
+    assert result.shape == (2, len(case["x"]))
+    for a_row, y_row in zip(a, result):
+        np.testing.assert_allclose(y_row, case["func"](a_row, case["x"]))
+
+
+@parametrize_with_cases(argnames="case", cases=THIS_MODULE)
+def test_x_derivative_batch(case):
+    a = np.stack([case["a"], case["a"] + 0.5])
+    result = case["func"].x_derivative_batch(a, case["x"])
+    assert result.shape == (2, len(case["x"]))
+    for a_row, derivative_row in zip(a, result):
+        np.testing.assert_allclose(
+            derivative_row, case["func"].x_derivative(a_row, case["x"])
+        )
+
+
+@parametrize_with_cases(argnames="case", cases=THIS_MODULE)
+def test_a_derivative_batch(case):
+    a = np.stack([case["a"], case["a"] + 0.5])
+    result = case["func"].a_derivative_batch(a, case["x"])
+    assert result.shape == (2, case["n"], len(case["x"]))
+    for a_row, derivative_row in zip(a, result):
+        np.testing.assert_allclose(
+            derivative_row, case["func"].a_derivative(a_row, case["x"])
+        )
+
+
 def test_initialize_polynomial_with_0_degree_raises_error():
     with pytest.raises(FittingFunctionLoadError, match="^n must be positive, got 0$"):
         polynomial(0)
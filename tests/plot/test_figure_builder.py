@@ -537,6 +537,60 @@ def case_add_data_without_errors(mock_figure):
     )
 
 
+def case_add_band(mock_figure):
+    x = np.linspace(0, 1, 5)
+    lower, upper = x - 0.1, x + 0.2
+    figure_builder = FigureBuilder()
+    figure_builder.add_band(x=x, lower=lower, upper=upper)
+    yield figure_builder
+    assert_calls(
+        mock_figure.ax.fill_between,
+        [([x, lower, upper], dict(label=None, color=None, alpha=0.3))],
+        rel=EPSILON,
+    )
+
+
+def case_add_band_with_additional_args(mock_figure):
+    x = np.linspace(0, 1, 5)
+    lower, upper = x - 0.1, x + 0.2
+    figure_builder = FigureBuilder()
+    figure_builder.add_band(
+        x=x, lower=lower, upper=upper, label="band", color="red", alpha=0.5
+    )
+    yield figure_builder
+    assert_calls(
+        mock_figure.ax.fill_between,
+        [([x, lower, upper], dict(label="band", color="red", alpha=0.5))],
+        rel=EPSILON,
+    )
+
+
+def case_add_contour(mock_figure):
+    x, y = np.linspace(0, 1, 5), np.linspace(2, 3, 4)
+    z = np.random.uniform(0, 1, size=(5, 4))
+    figure_builder = FigureBuilder()
+    figure_builder.add_contour(x=x, y=y, z=z)
+    yield figure_builder
+    assert_calls(
+        mock_figure.ax.contour,
+        [([x, y, z.T], dict(levels=None, colors=None))],
+        rel=EPSILON,
+    )
+
+
+def case_add_contour_with_levels_and_color(mock_figure):
+    x, y = np.linspace(0, 1, 5), np.linspace(2, 3, 4)
+    z = np.random.uniform(0, 1, size=(5, 4))
+    figure_builder = FigureBuilder()
+    figure_builder.add_contour(x=x, y=y, z=z, levels=[0.5, 0.9], color="black")
+    yield figure_builder
+    assert_calls(
+        mock_figure.ax.contour,
+        [([x, y, z.T], dict(levels=[0.5, 0.9], colors="black"))],
+        rel=EPSILON,
+    )
+
+
 @parametrize_with_cases(argnames="figure_builder", cases=".")
 def test_figure_builder_build_recipe(mock_figure, figure_builder):
     actual_figure = figure_builder.build()
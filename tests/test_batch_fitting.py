@@ -0,0 +1,187 @@
+import numpy as np
+import pytest
+from pytest_cases import parametrize
+
+from eddington import FittingFunction, exponential, linear, normal, sin
+from eddington.batch_fitting import batch_fit
+from eddington.exceptions import FittingError
+from eddington.fitting import _fit_arrays
+
+BATCH_SIZE = 20
+SIGMA = 0.05
+
+
+def noisy_batch(func, a, x, seed=0):
+    generator = np.random.default_rng(seed)
+    return func(np.asarray(a, dtype=float), x) + generator.normal(
+        scale=SIGMA, size=(BATCH_SIZE, x.size)
+    )
+
+
+@parametrize(
+    "func, a, x",
+    [
+        (linear, [1, 2], np.arange(10.0)),
+        (exponential, [2, 0.7, 1], np.linspace(0, 3, 20)),
+        (normal, [3, 0.5, 1.2, 1], np.linspace(-4, 4, 30)),
+        (sin, [2, 1.3, 0.4, 1], np.linspace(0, 10, 40)),
+    ],
+)
+def test_batch_fit_agrees_with_fit(func, a, x):
+    y = noisy_batch(func, a, x)
+
+    batch_result = batch_fit(func, x, y, yerr=SIGMA)
+
+    assert np.all(batch_result.converged)
+    for i, y_values in enumerate(y):
+        result = _fit_arrays(
+            func,
+            x=x,
+            y=y_values,
+            xerr=np.full(x.size, 1e-10),
+            yerr=np.full(x.size, SIGMA),
+        )
+        np.testing.assert_allclose(batch_result.a[i], result.a, rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(batch_result.aerr[i], result.aerr, rtol=1e-4)
+        np.testing.assert_allclose(
+            batch_result.acov[i], result.acov, rtol=1e-4, atol=1e-10
+        )
+        assert batch_result.chi2[i] == pytest.approx(result.chi2, rel=1e-6)
+
+
+def test_batch_fit_shapes():
+    x = np.linspace(0, 3, 20)
+    y = noisy_batch(exponential, [2, 0.7, 1], x)
+
+    batch_result = batch_fit(exponential, x, y, yerr=SIGMA)
+
+    assert len(batch_result) == BATCH_SIZE
+    assert batch_result.a0.shape == (BATCH_SIZE, 3)
+    assert batch_result.a.shape == (BATCH_SIZE, 3)
+    assert batch_result.aerr.shape == (BATCH_SIZE, 3)
+    assert batch_result.acov.shape == (BATCH_SIZE, 3, 3)
+    assert batch_result.chi2.shape == (BATCH_SIZE,)
+    assert batch_result.iterations.shape == (BATCH_SIZE,)
+    assert batch_result.degrees_of_freedom == 17
+    np.testing.assert_allclose(batch_result.chi2_reduced, batch_result.chi2 / 17)
+
+
+def test_batch_fit_item_is_fitting_result():
+    x = np.linspace(0, 3, 20)
+    y = noisy_batch(exponential, [2, 0.7, 1], x)
+
+    batch_result = batch_fit(exponential, x, y, yerr=SIGMA)
+    result = batch_result[3]
+
+    np.testing.assert_equal(result.a, batch_result.a[3])
+    np.testing.assert_equal(result.aerr, batch_result.aerr[3])
+    assert result.chi2 == batch_result.chi2[3]
+    assert result.degrees_of_freedom == 17
+
+
+def test_batch_fit_with_x_per_dataset():
+    x = np.linspace(0, 3, 20)
+    y = noisy_batch(exponential, [2, 0.7, 1], x)
+
+    shared_result = batch_fit(exponential, x, y)
+    batch_result = batch_fit(exponential, np.tile(x, (BATCH_SIZE, 1)), y)
+
+    np.testing.assert_allclose(batch_result.a, shared_result.a)
+
+
+def test_batch_fit_single_dataset():
+    x = np.arange(10.0)
+    y = linear(np.array([1.0, 2.0]), x)
+
+    batch_result = batch_fit(linear, x, y)
+
+    assert len(batch_result) == 1
+    np.testing.assert_allclose(batch_result.a[0], [1, 2])
+
+
+def test_batch_fit_without_initial_guess_starts_from_ones():
+    x = np.arange(10.0)
+    y = noisy_batch(linear, [1, 2], x)
+
+    batch_result = batch_fit(linear, x, y)
+
+    np.testing.assert_equal(batch_result.a0, np.ones((BATCH_SIZE, 2)))
+
+
+@parametrize(
+    "a0", [np.array([2, 0.7, 1]), np.tile(np.array([2, 0.7, 1]), (BATCH_SIZE, 1))]
+)
+def test_batch_fit_with_a0(a0):
+    x = np.linspace(0, 3, 20)
+    y = noisy_batch(exponential, [2, 0.7, 1], x)
+
+    batch_result = batch_fit(exponential, x, y, a0=a0)
+
+    np.testing.assert_equal(batch_result.a0, np.tile([2, 0.7, 1], (BATCH_SIZE, 1)))
+    assert np.all(batch_result.converged)
+
+
+def test_batch_fit_with_invalid_initial_guess():
+    func = FittingFunction(
+        fit_func=linear.fit_func,
+        n=2,
+        name="nan_guess_linear",
+        a_derivative=linear.a_derivative,
+        initial_guess=lambda x, y: np.array([np.nan, np.nan]),
+        save=False,
+    )
+    x = np.arange(10.0)
+    y = noisy_batch(linear, [1, 2], x)
+
+    batch_result = batch_fit(func, x, y)
+
+    np.testing.assert_equal(batch_result.a0, np.ones((BATCH_SIZE, 2)))
+    np.testing.assert_allclose(batch_result.a, batch_fit(linear, x, y).a)
+
+
+def test_batch_fit_with_fixed_parameter():
+    x = np.linspace(0, 3, 20)
+    func = exponential.fix(2, 1)
+    try:
+        y = noisy_batch(func, [2, 0.7], x)
+
+        batch_result = batch_fit(func, x, y, yerr=SIGMA)
+    finally:
+        func.clear_fixed()
+
+    assert batch_result.a.shape == (BATCH_SIZE, 2)
+    np.testing.assert_allclose(np.mean(batch_result.a, axis=0), [2, 0.7], rtol=1e-2)
+
+
+def test_batch_fit_stops_at_max_iterations():
+    x = np.linspace(0, 3, 20)
+    y = noisy_batch(exponential, [2, 0.7, 1], x)
+
+    batch_result = batch_fit(exponential, x, y, a0=[1, 1, 1], max_iterations=2)
+
+    assert not np.any(batch_result.converged)
+    np.testing.assert_equal(batch_result.iterations, np.full(BATCH_SIZE, 2))
+
+
+def test_batch_fit_without_a_derivative():
+    func = FittingFunction(
+        fit_func=linear.fit_func, n=2, name="no_derivative_linear", save=False
+    )
+
+    with pytest.raises(
+        FittingError,
+        match='^Cannot batch fit "no_derivative_linear" without an a derivative$',
+    ):
+        batch_fit(func, np.arange(10.0), np.zeros((2, 10)))
+
+
+def test_batch_fit_pretty_string():
+    x = np.arange(10.0)
+    y = np.stack([linear(np.array([1.0, 2.0]), x) + SIGMA * (-1) ** np.arange(10)])
+
+    batch_result = batch_fit(linear, x, y, yerr=SIGMA)
+
+    assert str(batch_result) == (
+        f"Batch of 1 fits: 1 converged, median chi2 reduced "
+        f"{batch_result.chi2_reduced[0]:.4g}\n"
+    )
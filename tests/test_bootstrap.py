@@ -0,0 +1,160 @@
+import numpy as np
+import pytest
+
+from eddington import FittingData, exponential, linear
+from eddington.bootstrap import bootstrap
+from eddington.exceptions import FittingError
+
+A = np.array([2, 0.8, -1])
+SEED = 3
+
+
+@pytest.fixture
+def exponential_data():
+    x = np.linspace(0, 3, 50)
+    generator = np.random.default_rng(0)
+    return FittingData(
+        dict(
+            x=x,
+            xerr=np.full(shape=x.size, fill_value=1e-3),
+            y=exponential(A, x) + generator.normal(scale=0.2, size=x.size),
+            yerr=np.full(shape=x.size, fill_value=0.2),
+        )
+    )
+
+
+@pytest.fixture
+def linear_data():
+    x = np.linspace(0, 10, 200)
+    generator = np.random.default_rng(1)
+    return FittingData(
+        dict(
+            x=x,
+            y=linear(np.array([1, 2]), x) + generator.normal(scale=0.5, size=x.size),
+            yerr=np.full(shape=x.size, fill_value=0.5),
+        ),
+        x_column="x",
+        y_column="y",
+        yerr_column="yerr",
+        search=False,
+    )
+
+
+def test_bootstrap_samples(exponential_data):
+    bootstrap_result = bootstrap(
+        exponential_data, exponential, n_resamples=150, seed=SEED
+    )
+
+    assert bootstrap_result.samples.shape == (150, 3)
+    assert bootstrap_result.failed == 0
+    assert bootstrap_result.level == 0.95
+
+
+def test_bootstrap_intervals_contain_full_fit(exponential_data):
+    bootstrap_result = bootstrap(
+        exponential_data, exponential, n_resamples=150, seed=SEED
+    )
+
+    assert np.all(bootstrap_result.lower < bootstrap_result.result.a)
+    assert np.all(bootstrap_result.upper > bootstrap_result.result.a)
+
+
+def test_bootstrap_percentile_intervals(exponential_data):
+    bootstrap_result = bootstrap(
+        exponential_data, exponential, n_resamples=150, level=0.5, seed=SEED
+    )
+
+    assert bootstrap_result.lower == pytest.approx(
+        np.percentile(bootstrap_result.samples, 25, axis=0)
+    )
+    assert bootstrap_result.upper == pytest.approx(
+        np.percentile(bootstrap_result.samples, 75, axis=0)
+    )
+
+
+def test_bootstrap_covariance(exponential_data):
+    bootstrap_result = bootstrap(
+        exponential_data, exponential, n_resamples=150, seed=SEED
+    )
+
+    assert bootstrap_result.acov == pytest.approx(np.cov(bootstrap_result.samples.T))
+    assert bootstrap_result.aerr == pytest.approx(
+        np.std(bootstrap_result.samples, axis=0, ddof=1)
+    )
+
+
+def test_bootstrap_errors_agree_with_linearized_errors(linear_data):
+    bootstrap_result = bootstrap(linear_data, linear, n_resamples=300, seed=SEED)
+
+    assert bootstrap_result.aerr == pytest.approx(bootstrap_result.result.aerr, rel=0.2)
+
+
+def test_bootstrap_is_reproducible(exponential_data):
+    bootstrap_result1 = bootstrap(
+        exponential_data, exponential, n_resamples=150, seed=SEED
+    )
+    bootstrap_result2 = bootstrap(
+        exponential_data, exponential, n_resamples=150, seed=SEED
+    )
+
+    np.testing.assert_array_equal(bootstrap_result1.samples, bootstrap_result2.samples)
+
+
+def test_bootstrap_does_not_depend_on_workers(exponential_data):
+    serial_result = bootstrap(exponential_data, exponential, n_resamples=150, seed=SEED)
+    parallel_result = bootstrap(
+        exponential_data, exponential, n_resamples=150, workers=2, seed=SEED
+    )
+
+    np.testing.assert_array_equal(serial_result.samples, parallel_result.samples)
+
+
+def test_bootstrap_counts_failed_resamples(exponential_data, mocker):
+    fit_arrays = mocker.patch("eddington.bootstrap._fit_arrays")
+    fit_arrays.side_effect = [
+        FittingError("Failed"),
+        mocker.Mock(a=np.array([np.nan, 1, 2])),
+    ] + [mocker.Mock(a=np.array([i, 1, 2])) for i in range(8)]
+
+    bootstrap_result = bootstrap(
+        exponential_data, exponential, n_resamples=10, seed=SEED
+    )
+
+    assert bootstrap_result.failed == 2
+    assert bootstrap_result.samples.shape == (8, 3)
+
+
+def test_bootstrap_pretty_string(exponential_data):
+    bootstrap_result = bootstrap(
+        exponential_data, exponential, n_resamples=150, seed=SEED
+    )
+
+    assert repr(bootstrap_result) == bootstrap_result.pretty_string
+    assert "Resamples: 150 (0 failed)" in bootstrap_result.pretty_string
+    assert "95.00% interval" in bootstrap_result.pretty_string
+
+
+@pytest.mark.parametrize("n_resamples", [-1, 0, 1])
+def test_bootstrap_fail_for_too_few_resamples(exponential_data, n_resamples):
+    with pytest.raises(
+        FittingError,
+        match=f"^Number of resamples should be greater than 1, got {n_resamples}$",
+    ):
+        bootstrap(exponential_data, exponential, n_resamples=n_resamples)
+
+
+@pytest.mark.parametrize("level", [0, 1, 1.5])
+def test_bootstrap_fail_for_invalid_level(exponential_data, level):
+    with pytest.raises(
+        FittingError,
+        match=f"^Confidence level should be between 0 and 1, got {level}$",
+    ):
+        bootstrap(exponential_data, exponential, level=level)
+
+
+def test_bootstrap_fail_when_no_resample_is_fitted(exponential_data, mocker):
+    fit_arrays = mocker.patch("eddington.bootstrap._fit_arrays")
+    fit_arrays.side_effect = FittingError("Failed")
+
+    with pytest.raises(FittingError, match="^Could not fit enough resamples$"):
+        bootstrap(exponential_data, exponential, n_resamples=10)
@@ -0,0 +1,146 @@
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from pytest_cases import parametrize
+
+from eddington import IncrementalLinearFit, polynomial
+from eddington.chunked_fitting import chunked_fit
+from eddington.exceptions import FittingDataColumnExistenceError, FittingDataInvalidFile
+from eddington.parallel_util import SerialExecutor
+from tests.util import assert_results_equal
+
+RECORDS = 100
+FUNC = polynomial(2)
+DELTA = 1e-8
+
+
+@pytest.fixture
+def columns():
+    generator = np.random.default_rng(0)
+    x = generator.uniform(-2, 2, size=RECORDS)
+    yerr = generator.uniform(0.05, 0.2, size=RECORDS)
+    y = FUNC(np.array([1.0, 2.0, -0.5]), x) + generator.normal(scale=yerr)
+    return dict(x=x, y=y, yerr=yerr)
+
+
+@pytest.fixture
+def csv_path(tmp_path, columns):
+    path = tmp_path / "data.csv"
+    lines = ["z,x,y,yerr"] + [
+        f"0,{x.item()!r},{y.item()!r},{yerr.item()!r}"
+        for x, y, yerr in zip(columns["x"], columns["y"], columns["yerr"])
+    ]
+    path.write_text("\n".join(lines) + "\n\n", encoding="utf-8")
+    return path
+
+
+@parametrize("chunk_size", [1, 7, RECORDS, 1000])
+@parametrize("workers", [None, 3])
+def test_chunked_fit_of_csv(csv_path, columns, chunk_size, workers):
+    result = chunked_fit(
+        csv_path,
+        FUNC,
+        x_column="x",
+        y_column="y",
+        yerr_column="yerr",
+        chunk_size=chunk_size,
+        workers=workers,
+    )
+
+    assert_results_equal(
+        result, IncrementalLinearFit(FUNC).update(**columns).result(), rel=DELTA
+    )
+
+
+def test_chunked_fit_of_csv_without_yerr(csv_path, columns):
+    result = chunked_fit(str(csv_path), FUNC, x_column="x", y_column="y")
+
+    assert_results_equal(
+        result,
+        IncrementalLinearFit(FUNC).update(x=columns["x"], y=columns["y"]).result(),
+        rel=DELTA,
+    )
+
+
+def test_chunked_fit_of_csv_with_missing_column(csv_path):
+    with pytest.raises(
+        FittingDataColumnExistenceError, match='^Could not find column "w" in data$'
+    ):
+        chunked_fit(csv_path, FUNC, x_column="x", y_column="w")
+
+
+def test_chunked_fit_of_unsupported_file(tmp_path):
+    with pytest.raises(
+        FittingDataInvalidFile,
+        match=(
+            '^Cannot fit file of type ".txt". Supported types are .csv and .parquet$'
+        ),
+    ):
+        chunked_fit(tmp_path / "data.txt", FUNC, x_column="x", y_column="y")
+
+
+class FakeParquetFile:
+    def __init__(self, columns):
+        self.columns = columns
+        self.schema_arrow = SimpleNamespace(names=list(columns))
+        self.num_row_groups = 4
+
+    def iter_batches(self, batch_size, row_groups, columns):
+        for row_group in row_groups:
+            rows = np.array_split(np.arange(RECORDS), self.num_row_groups)[row_group]
+            for start in range(0, rows.size, batch_size):
+                chunk = rows[start : start + batch_size]
+                yield SimpleNamespace(
+                    column=lambda name, chunk=chunk: SimpleNamespace(
+                        to_numpy=lambda: self.columns[name][chunk]
+                    )
+                )
+
+
+@pytest.fixture
+def fake_pyarrow(mocker, columns):
+    # The fake module exists only in this process, hence ranges run serially.
+    mocker.patch(
+        "eddington.chunked_fitting.get_executor", return_value=SerialExecutor()
+    )
+    parquet = SimpleNamespace(ParquetFile=lambda path: FakeParquetFile(columns))
+    mocker.patch.dict(
+        sys.modules,
+        {"pyarrow": SimpleNamespace(parquet=parquet), "pyarrow.parquet": parquet},
+    )
+
+
+@parametrize("workers", [None, 2, 10])
+def test_chunked_fit_of_parquet(fake_pyarrow, columns, workers):
+    result = chunked_fit(
+        "data.parquet",
+        FUNC,
+        x_column="x",
+        y_column="y",
+        yerr_column="yerr",
+        chunk_size=10,
+        workers=workers,
+    )
+
+    assert_results_equal(
+        result, IncrementalLinearFit(FUNC).update(**columns).result(), rel=DELTA
+    )
+
+
+def test_chunked_fit_of_parquet_with_missing_column(fake_pyarrow):
+    with pytest.raises(
+        FittingDataColumnExistenceError, match='^Could not find column "w" in data$'
+    ):
+        chunked_fit("data.parquet", FUNC, x_column="w", y_column="y")
+
+
+def test_chunked_fit_of_parquet_without_pyarrow(mocker):
+    mocker.patch.dict(sys.modules, {"pyarrow": None})
+
+    with pytest.raises(
+        FittingDataInvalidFile,
+        match="^Reading parquet files requires pyarrow",
+    ):
+        chunked_fit("data.parquet", FUNC, x_column="x", y_column="y")
@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+from pytest_cases import parametrize
+
+from eddington.covariance import BandedCovariance, DenseCovariance, LowRankCovariance
+from eddington.exceptions import FittingError
+
+SIZE = 30
+
+
+def banded_matrix(bandwidth):
+    generator = np.random.default_rng(0)
+    offsets = np.abs(np.subtract.outer(np.arange(SIZE), np.arange(SIZE)))
+    matrix = np.where(offsets <= bandwidth, 0.5 ** (offsets + 1), 0.0)
+    return matrix + np.diag(generator.uniform(1, 2, size=SIZE))
+
+
+def low_rank_parts():
+    generator = np.random.default_rng(1)
+    return generator.uniform(0.5, 2, size=SIZE), generator.normal(size=(SIZE, 2))
+
+
+def whitening_covariance(covariance):
+    whitening = covariance.whiten(np.eye(SIZE)).T
+    return np.linalg.inv(whitening.T @ whitening)
+
+
+def test_dense_covariance_whitening():
+    matrix = banded_matrix(SIZE)
+
+    covariance = DenseCovariance(matrix)
+
+    assert covariance.size == SIZE
+    np.testing.assert_allclose(whitening_covariance(covariance), matrix, atol=1e-12)
+
+
+@parametrize("bandwidth", [0, 1, 3])
+def test_banded_covariance_whitening(bandwidth):
+    matrix = banded_matrix(bandwidth)
+
+    covariance = BandedCovariance.from_matrix(matrix, bandwidth=bandwidth)
+
+    assert covariance.size == SIZE
+    assert covariance.bandwidth == bandwidth
+    np.testing.assert_allclose(whitening_covariance(covariance), matrix, atol=1e-12)
+
+
+def test_banded_covariance_from_matrix_bands():
+    matrix = banded_matrix(1)
+
+    covariance = BandedCovariance.from_matrix(matrix, bandwidth=1)
+
+    np.testing.assert_equal(covariance.bands[0], np.diag(matrix))
+    np.testing.assert_equal(covariance.bands[1, :-1], np.diag(matrix, k=-1))
+
+
+def test_low_rank_covariance_whitening():
+    diagonal, factor = low_rank_parts()
+
+    covariance = LowRankCovariance(diagonal, factor)
+
+    assert covariance.size == SIZE
+    np.testing.assert_allclose(
+        whitening_covariance(covariance),
+        np.diag(diagonal) + factor @ factor.T,
+        atol=1e-10,
+    )
+
+
+def test_low_rank_covariance_with_single_factor():
+    diagonal, factor = low_rank_parts()
+
+    covariance = LowRankCovariance(diagonal, factor[:, 0])
+
+    assert covariance.factor.shape == (SIZE, 1)
+    np.testing.assert_allclose(
+        whitening_covariance(covariance),
+        np.diag(diagonal) + np.outer(factor[:, 0], factor[:, 0]),
+        atol=1e-10,
+    )
+
+
+@parametrize(
+    "covariance",
+    [
+        DenseCovariance(banded_matrix(SIZE)),
+        BandedCovariance.from_matrix(banded_matrix(2), bandwidth=2),
+        LowRankCovariance(*low_rank_parts()),
+    ],
+)
+def test_whiten_multiple_vectors(covariance):
+    values = np.random.default_rng(2).normal(size=(3, SIZE))
+
+    whitened = covariance.whiten(values)
+
+    assert whitened.shape == (3, SIZE)
+    for row, whitened_row in zip(values, whitened):
+        np.testing.assert_allclose(covariance.whiten(row), whitened_row)
+
+
+@parametrize(
+    "build",
+    [
+        lambda: DenseCovariance(-np.eye(SIZE)),
+        lambda: BandedCovariance(-np.ones((1, SIZE))),
+        lambda: LowRankCovariance(np.zeros(SIZE), np.ones((SIZE, 1))),
+    ],
+)
+def test_covariance_not_positive_definite(build):
+    with pytest.raises(
+        FittingError, match="^Covariance matrix is not positive definite$"
+    ):
+        build()
@@ -0,0 +1,150 @@
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+from eddington import FittingData, constant, exponential, fit, linear, parabolic
+from eddington.cross_validation import cross_validate
+from eddington.exceptions import FittingError
+
+RECORDS = 40
+SEED = 3
+
+
+@pytest.fixture
+def parabolic_data():
+    generator = np.random.default_rng(0)
+    x = np.linspace(-3, 3, RECORDS)
+    yerr = np.full(RECORDS, 0.2)
+    y = parabolic(np.array([1.0, -0.5, 0.8]), x) + generator.normal(scale=yerr)
+    return FittingData(OrderedDict(x=x, xerr=np.full(RECORDS, 1e-10), y=y, yerr=yerr))
+
+
+def test_folds_partition_records(parabolic_data):
+    result = cross_validate(parabolic_data, parabolic, k=4, seed=SEED)
+
+    assert result.name == "parabolic"
+    assert result.folds.shape == (RECORDS,)
+    np.testing.assert_equal(np.bincount(result.folds), np.full(4, 10))
+    assert result.scores.shape == (4,)
+    assert result.a.shape == (4, 3)
+
+
+def test_fold_scores_are_held_out_errors(parabolic_data):
+    result = cross_validate(parabolic_data, parabolic, k=4, seed=SEED)
+
+    held_out = result.folds == 2
+    parabolic_data.records_indices = (~held_out).tolist()
+    fold_result = fit(parabolic_data, parabolic)
+    residuals = (
+        parabolic_data.column_data("y", only_selected=False)[held_out]
+        - parabolic(
+            fold_result.a, parabolic_data.column_data("x", only_selected=False)
+        )[held_out]
+    ) / 0.2
+    np.testing.assert_allclose(result.a[2], fold_result.a, rtol=1e-6)
+    assert result.scores[2] == pytest.approx(np.mean(residuals**2), rel=1e-6)
+    assert result.mean_score == pytest.approx(np.mean(result.scores))
+    assert result.score_error == pytest.approx(np.std(result.scores, ddof=1) / 2)
+
+
+def test_same_folds_rank_functions(parabolic_data):
+    result = cross_validate(parabolic_data, parabolic, k=5, seed=SEED)
+    other_results = [
+        cross_validate(parabolic_data, func, folds=result.folds)
+        for func in [constant, linear]
+    ]
+
+    for other_result in other_results:
+        np.testing.assert_equal(other_result.folds, result.folds)
+        assert other_result.mean_score > result.mean_score
+
+
+def test_seed_determines_folds(parabolic_data):
+    result = cross_validate(parabolic_data, linear, seed=SEED)
+    same_result = cross_validate(parabolic_data, linear, seed=SEED)
+
+    np.testing.assert_equal(result.folds, same_result.folds)
+    np.testing.assert_equal(result.scores, same_result.scores)
+
+
+def test_cross_validate_with_workers(parabolic_data):
+    result = cross_validate(parabolic_data, parabolic, k=4, seed=SEED)
+    parallel_result = cross_validate(
+        parabolic_data, parabolic, folds=result.folds, workers=2
+    )
+
+    np.testing.assert_allclose(parallel_result.scores, result.scores)
+
+
+def test_cross_validate_only_selected_records(parabolic_data):
+    parabolic_data.unselect_record(1)
+
+    result = cross_validate(parabolic_data, parabolic, k=3, seed=SEED)
+
+    assert result.folds.shape == (RECORDS - 1,)
+
+
+def test_cross_validate_without_errors(parabolic_data):
+    data = FittingData(
+        OrderedDict(x=parabolic_data.x, y=parabolic_data.y),
+        x_column="x",
+        y_column="y",
+        search=False,
+    )
+
+    result = cross_validate(data, parabolic, k=4, seed=SEED)
+
+    assert np.all(np.isfinite(result.scores))
+
+
+def test_failed_folds_are_nan(parabolic_data, mocker):
+    mocker.patch(
+        "eddington.cross_validation._fit_arrays",
+        side_effect=[FittingError("error"), fit(parabolic_data, parabolic)],
+    )
+
+    result = cross_validate(parabolic_data, parabolic, k=2, seed=SEED)
+
+    assert np.isnan(result.scores[0])
+    assert np.all(np.isnan(result.a[0]))
+    assert result.mean_score == result.scores[1]
+
+
+def test_cross_validation_pretty_string(parabolic_data):
+    result = cross_validate(parabolic_data, exponential, k=2, seed=SEED)
+
+    lines = str(result).split("\n")
+    assert lines[0] == 'Cross-validation of "exponential":'
+    assert lines[4].split("|")[2].strip() == "20"
+    assert lines[-2].startswith("Mean score: ")
+
+
+@pytest.mark.parametrize("k", [1, RECORDS + 1])
+def test_invalid_number_of_folds(parabolic_data, k):
+    with pytest.raises(
+        FittingError,
+        match=f"^Number of folds should be between 2 and {RECORDS}, got {k}$",
+    ):
+        cross_validate(parabolic_data, linear, k=k)
+
+
+def test_invalid_folds(parabolic_data):
+    with pytest.raises(
+        FittingError, match=f"^Expected folds of {RECORDS} records, got 3$"
+    ):
+        cross_validate(parabolic_data, linear, folds=np.array([0, 1, 0]))
+
+
+def test_cross_validate_fail_for_no_x(parabolic_data):
+    parabolic_data.x_column = None
+
+    with pytest.raises(FittingError, match="^Cannot fit data without x values$"):
+        cross_validate(parabolic_data, linear)
+
+
+def test_cross_validate_fail_for_no_y(parabolic_data):
+    parabolic_data.y_column = None
+
+    with pytest.raises(FittingError, match="^Cannot fit data without y values$"):
+        cross_validate(parabolic_data, linear)
@@ -0,0 +1,115 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from eddington import EvaluationCache
+
+A = np.array([1.0, 2.0])
+X = np.linspace(0, 1, 10)
+
+
+@pytest.fixture
+def compute(mocker):
+    return mocker.Mock(side_effect=lambda a, x: a[0] + a[1] * x)
+
+
+def test_evaluation_cache_computes_value_once(compute):
+    cache = EvaluationCache()
+
+    first = cache.get("value", A, X, compute)
+    second = cache.get("value", A, X, compute)
+
+    assert second is first
+    assert first == pytest.approx(A[0] + A[1] * X)
+    assert compute.call_count == 1
+    assert cache.hits == 1
+    assert cache.misses == 1
+    assert cache.hit_rate == pytest.approx(0.5)
+
+
+def test_evaluation_cache_hit_rate_without_requests():
+    assert EvaluationCache().hit_rate == 0
+
+
+@pytest.mark.parametrize(
+    ["name", "a", "x"],
+    [
+        ("other", A, X),
+        ("value", A + 1, X),
+        ("value", A, X + 1),
+        ("value", A, X.astype(np.float32)),
+        ("value", A, X.reshape(2, 5)),
+    ],
+)
+def test_evaluation_cache_computes_different_values(compute, name, a, x):
+    cache = EvaluationCache()
+    cache.get("value", A, X, compute)
+
+    cache.get(name, a, x, compute)
+
+    assert compute.call_count == 2
+    assert cache.hits == 0
+
+
+def test_evaluation_cache_is_keyed_by_contents_of_arrays(compute):
+    cache = EvaluationCache()
+    x = X.copy()
+    cache.get("value", A, x, compute)
+
+    x += 1
+    value = cache.get("value", A, x, compute)
+
+    assert value == pytest.approx(A[0] + A[1] * x)
+    assert compute.call_count == 2
+
+
+def test_evaluation_cache_finds_values_of_nan_parameters(compute):
+    cache = EvaluationCache()
+    cache.get("value", np.array([np.nan, 2.0]), X, compute)
+
+    cache.get("value", np.array([np.nan, 2.0]), X, compute)
+
+    assert compute.call_count == 1
+    assert cache.hits == 1
+
+
+def test_evaluation_cache_does_not_copy_x_values_when_found(compute):
+    x = np.linspace(0, 1, 10**5)
+    cache = EvaluationCache()
+    cache.get("value", A, x, compute)
+
+    tracemalloc.start()
+    cache.get("value", A, x, compute)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert cache.hits == 1
+    assert peak < x.nbytes / 2
+
+
+def test_evaluation_cache_drops_least_recently_used_value(compute):
+    cache = EvaluationCache(size=2)
+    cache.get("value", A, X, compute)
+    cache.get("value", A + 1, X, compute)
+    cache.get("value", A, X, compute)
+
+    cache.get("value", A + 2, X, compute)
+    cache.get("value", A, X, compute)
+    cache.get("value", A + 1, X, compute)
+
+    assert compute.call_count == 4
+    assert cache.hits == 2
+
+
+def test_evaluation_cache_clear(compute):
+    cache = EvaluationCache()
+    cache.get("value", A, X, compute)
+    cache.get("value", A, X, compute)
+
+    cache.clear()
+    cache.get("value", A, X, compute)
+
+    assert compute.call_count == 2
+    assert cache.hits == 0
+    assert cache.misses == 1
@@ -1,10 +1,14 @@
+import time
 from argparse import Namespace
 
 import numpy as np
 import pytest
+from scipy.optimize import curve_fit
 
-from eddington import fit, fitting_function
+from eddington import FittingData, fit, fitting_function, linear
+from eddington.covariance import BandedCovariance, DenseCovariance, LowRankCovariance
 from eddington.exceptions import FittingError
+from eddington.fitting import DEADLINE_CHECK_ITERATIONS
 from eddington.random_util import random_data
 
 a0 = np.array([8, 5])
@@ -12,6 +16,7 @@
 aerr = np.array([0.1, 0.2])
 acov = np.array([[0.1, 0.2], [0.2, 0.3]])
 chi2 = 1.5
+iwork = np.array([0, 0, 0, 50, 7, 36, 0, 0, 0, 0])
 
 
 def dummy_func_x_derivative(a, x):
@@ -53,7 +58,13 @@ def odr_mock(mocker):
     real_data = mocker.patch("eddington.fitting.RealData")
     model = mocker.patch("eddington.fitting.Model")
     odr.return_value.run.return_value = Namespace(
-        beta=a, sum_square=chi2, sd_beta=aerr, cov_beta=acov
+        beta=a,
+        sum_square=chi2,
+        sd_beta=aerr,
+        cov_beta=acov,
+        iwork=iwork,
+        info=1,
+        stopreason=["Sum of squares convergence"],
     )
     return dict(odr=odr, real_data=real_data, model=model)
 
@@ -160,6 +171,69 @@ def test_odr(function_cases):
     assert odr.call_args[1]["data"] == real_data.return_value
     assert odr.call_args[1]["model"] == model.return_value
     assert odr.call_args[1]["beta0"] == pytest.approx(fit_a0)
+    odr.return_value.set_job.assert_not_called()
+
+
+def test_fit_without_xerr_uses_orthogonal_distance_regression(odr_mock):
+    data = random_data(fit_func=dummy_func)
+    data.xerr_column = None
+
+    fit(data=data, func=dummy_func, a0=a0)
+
+    assert odr_mock["real_data"].call_args[1]["sx"] is None
+    odr_mock["odr"].return_value.set_job.assert_not_called()
+
+
+def test_fit_with_exact_x_uses_ordinary_least_squares(odr_mock):
+    data = random_data(fit_func=dummy_func)
+    data.xerr_column = None
+
+    fit(data=data, func=dummy_func, a0=a0, exact_x=True)
+
+    assert odr_mock["real_data"].call_args[1]["sx"] is None
+    odr_mock["odr"].return_value.set_job.assert_called_once_with(fit_type=2)
+
+
+def test_fit_with_exact_x_and_xerr_uses_orthogonal_distance_regression(odr_mock):
+    data = random_data(fit_func=dummy_func)
+
+    fit(data=data, func=dummy_func, a0=a0, exact_x=True)
+
+    odr_mock["odr"].return_value.set_job.assert_not_called()
+
+
+@fitting_function(n=2, initial_guess=lambda x, y: np.array([np.max(y), 2]), save=False)
+def dummy_func_with_initial_guess(a, x):
+    return a[0] * x**2 + a[1]
+
+
+@fitting_function(n=2, initial_guess=lambda x, y: np.array([np.nan, 2]), save=False)
+def dummy_func_with_invalid_initial_guess(a, x):
+    return a[0] * x**2 + a[1]
+
+
+def test_fit_with_initial_guess(odr_mock):
+    data = random_data(fit_func=dummy_func_with_initial_guess)
+
+    fit(data=data, func=dummy_func_with_initial_guess)
+
+    assert odr_mock["odr"].call_args[1]["beta0"] == pytest.approx([np.max(data.y), 2])
+
+
+def test_fit_with_initial_guess_and_explicit_a0(odr_mock):
+    data = random_data(fit_func=dummy_func_with_initial_guess)
+
+    fit(data=data, func=dummy_func_with_initial_guess, a0=a0)
+
+    assert odr_mock["odr"].call_args[1]["beta0"] == pytest.approx(a0)
+
+
+def test_fit_with_invalid_initial_guess_falls_back_to_default(odr_mock):
+    data = random_data(fit_func=dummy_func_with_invalid_initial_guess)
+
+    fit(data=data, func=dummy_func_with_invalid_initial_guess)
+
+    assert odr_mock["odr"].call_args[1]["beta0"] == pytest.approx(np.ones(2))
 
 
 def test_fitting_fail_for_no_x():
@@ -176,3 +250,320 @@ def test_fitting_fail_for_no_y():
 
     with pytest.raises(FittingError, match="^Cannot fit data without y values$"):
         fit(data=fitting_data, func=dummy_func)
+
+
+def test_fit_with_max_iterations(odr_mock):
+    data = random_data(fit_func=dummy_func)
+
+    fit(data=data, func=dummy_func, a0=a0, max_iterations=7)
+
+    assert odr_mock["odr"].call_args[1]["maxit"] == 7
+
+
+def test_fit_with_tolerance(odr_mock):
+    data = random_data(fit_func=dummy_func)
+
+    fit(data=data, func=dummy_func, a0=a0, tolerance=1e-5)
+
+    assert odr_mock["odr"].call_args[1]["sstol"] == 1e-5
+    assert odr_mock["odr"].call_args[1]["partol"] == 1e-5
+
+
+def test_fit_with_exact_x_agrees_with_least_squares():
+    x = np.linspace(0, 5, 50)
+    yerr = np.full(x.size, 0.1)
+    y = dummy_exponential_func(np.array([2, 0.5]), x)
+    y += np.random.default_rng(0).normal(scale=yerr)
+    data = FittingData(
+        dict(x=x, y=y, yerr=yerr),
+        x_column="x",
+        y_column="y",
+        yerr_column="yerr",
+        search=False,
+    )
+
+    result = fit(
+        data=data, func=dummy_exponential_func, a0=np.array([1, 0.1]), exact_x=True
+    )
+    expected_a, _ = curve_fit(
+        lambda x, *a: dummy_exponential_func(np.array(a), x),
+        x,
+        y,
+        p0=np.array([1, 0.1]),
+        sigma=yerr,
+    )
+
+    assert result.a == pytest.approx(expected_a, rel=1e-6)
+
+
+def test_fit_with_loose_tolerance_stops_earlier():
+    x = np.linspace(0, 5, 50)
+    y = dummy_exponential_func(np.array([2, 0.5]), x)
+    y += np.random.default_rng(0).normal(scale=0.1, size=x.size)
+    data = FittingData(
+        dict(x=x, xerr=np.full(x.size, 0.01), y=y, yerr=np.full(x.size, 0.1))
+    )
+
+    result = fit(data=data, func=dummy_exponential_func, a0=np.array([1, 0.1]))
+    loose_result = fit(
+        data=data, func=dummy_exponential_func, a0=np.array([1, 0.1]), tolerance=1e-2
+    )
+
+    assert loose_result.diagnostics.converged
+    assert loose_result.diagnostics.iterations < result.diagnostics.iterations
+    assert loose_result.a == pytest.approx(result.a, rel=1e-5)
+
+
+@fitting_function(n=2, save=False)
+def dummy_exponential_func(a, x):
+    return a[0] * np.exp(a[1] * x)
+
+
+@fitting_function(n=2, save=False)
+def slow_dummy_func(a, x):
+    time.sleep(0.01)
+    return a[0] * np.exp(a[1] * x)
+
+
+def test_fit_diagnostics(function_cases):
+    diagnostics = function_cases["result"].diagnostics
+    assert diagnostics.iterations == 7
+    assert diagnostics.function_evaluations == 36
+    assert diagnostics.jacobian_evaluations == 0
+    assert diagnostics.info == 1
+    assert diagnostics.stop_reason == ["Sum of squares convergence"]
+    assert diagnostics.total_time == pytest.approx(
+        diagnostics.setup_time + diagnostics.run_time + diagnostics.post_processing_time
+    )
+
+
+def test_fit_diagnostics_counts_evaluations():
+    calls = []
+
+    @fitting_function(n=2, save=False)
+    def counted_func(a, x):
+        calls.append(a)
+        return a[0] * np.exp(a[1] * x)
+
+    x = np.linspace(0, 10, 50)
+    y = counted_func(np.array([2, 0.3]), x)
+    y += np.random.default_rng(0).normal(scale=0.1, size=x.size)
+    data = FittingData(
+        dict(x=x, xerr=np.full(x.size, 0.01), y=y, yerr=np.full(x.size, 0.1))
+    )
+    calls.clear()
+    diagnostics = fit(data=data, func=counted_func, a0=np.array([1, 0.1])).diagnostics
+
+    assert diagnostics.iterations > 0
+    # ODR evaluates the function once more before starting.
+    assert diagnostics.function_evaluations == len(calls) - 1
+    assert diagnostics.info < 4
+    assert diagnostics.run_time > 0
+    assert diagnostics.setup_time >= 0
+    assert diagnostics.post_processing_time >= 0
+
+
+@pytest.mark.parametrize("with_xerr", [True, False])
+def test_fit_uses_finite_differences_by_default(with_xerr):
+    data = random_data(fit_func=dummy_func_with_both_derivatives, a=a)
+    if not with_xerr:
+        data.xerr_column = None
+
+    diagnostics = fit(
+        data=data, func=dummy_func_with_both_derivatives, a0=a0
+    ).diagnostics
+
+    assert diagnostics.jacobian_evaluations == 0
+
+
+@pytest.fixture
+def linear_with_out():
+    outs = []
+
+    def x_derivative(a, x, out=None):
+        outs.append(out)
+        if out is None:
+            out = np.empty(np.shape(x))
+        out[...] = a[1]
+        return out
+
+    def a_derivative(a, x, out=None):  # pylint: disable=W0613
+        outs.append(out)
+        if out is None:
+            out = np.empty((2, np.size(x)))
+        out[0] = 1
+        out[1] = x
+        return out
+
+    @fitting_function(
+        n=2,
+        x_derivative=x_derivative,
+        a_derivative=a_derivative,
+        rescale=linear.rescale,
+        derivatives_out=True,
+        save=False,
+    )
+    def func(a, x):
+        return a[0] + a[1] * x
+
+    return func, outs
+
+
+@pytest.mark.parametrize(
+    "with_xerr, kwargs, shapes",
+    [
+        (True, dict(condition=True), {(2,), ()}),
+        (False, dict(condition=True), {(2,), ()}),
+        (False, dict(engine="least_squares"), {(2,)}),
+    ],
+)
+def test_fit_reuses_out_arrays_of_derivatives(
+    linear_with_out, with_xerr, kwargs, shapes
+):
+    func, outs = linear_with_out
+    data = random_data(fit_func=linear, a=a)
+    if not with_xerr:
+        data.xerr_column = None
+
+    result = fit(data=data, func=func, a0=a0, **kwargs)
+
+    assert result.a == pytest.approx(fit(data=data, func=linear, a0=a0, **kwargs).a)
+    assert result.diagnostics.jacobian_evaluations > 1
+    used_outs = [out for out in outs if out is not None]
+    records = data.number_of_records
+    assert {out.shape for out in used_outs} == {(*shape, records) for shape in shapes}
+    assert len({id(out) for out in used_outs}) == len(shapes)
+
+
+@pytest.mark.parametrize("with_xerr", [True, False])
+def test_fit_with_finite_differences_has_no_out_arrays(linear_with_out, with_xerr):
+    func, outs = linear_with_out
+    data = random_data(fit_func=linear, a=a)
+    if not with_xerr:
+        data.xerr_column = None
+
+    fit(data=data, func=func, a0=a0)
+
+    assert outs == [None] * len(outs)
+
+
+def test_fit_with_timeout_gives_same_result_as_without():
+    data = random_data(fit_func=dummy_func, a=a)
+
+    result = fit(data=data, func=dummy_func, a0=a0)
+    result_with_timeout = fit(data=data, func=dummy_func, a0=a0, timeout=10)
+
+    assert result_with_timeout.a == pytest.approx(result.a)
+    assert result_with_timeout.chi2 == pytest.approx(result.chi2)
+    assert result_with_timeout.diagnostics.converged
+    assert not result_with_timeout.diagnostics.timed_out
+
+
+def test_fit_with_timeout_and_max_iterations():
+    data = random_data(fit_func=dummy_func, a=a)
+
+    result = fit(data=data, func=dummy_func, a0=a0, max_iterations=7)
+    result_with_timeout = fit(
+        data=data, func=dummy_func, a0=a0, max_iterations=7, timeout=10
+    )
+
+    assert result_with_timeout.a == pytest.approx(result.a)
+
+
+def test_fit_marks_result_as_timed_out():
+    data = random_data(fit_func=slow_dummy_func, a=np.array([2, 0.5]), xmax=5)
+
+    result = fit(data=data, func=slow_dummy_func, a0=np.array([100, -3]), timeout=0.01)
+
+    assert result.diagnostics.timed_out
+    assert not result.diagnostics.converged
+    assert result.diagnostics.iterations == DEADLINE_CHECK_ITERATIONS
+    assert np.all(np.isfinite(result.a))
+
+
+def test_fit_with_timeout_continues_until_convergence():
+    data = random_data(fit_func=dummy_exponential_func, a=np.array([2, 0.5]), xmax=5)
+
+    result = fit(data=data, func=dummy_exponential_func, a0=np.array([100, -3]))
+    result_with_timeout = fit(
+        data=data, func=dummy_exponential_func, a0=np.array([100, -3]), timeout=10
+    )
+
+    assert result_with_timeout.a == pytest.approx(result.a)
+    assert result_with_timeout.chi2 == pytest.approx(result.chi2)
+
+
+def correlated_data(size=50):
+    generator = np.random.default_rng(0)
+    x = np.linspace(0, 3, size)
+    offsets = np.abs(np.subtract.outer(np.arange(size), np.arange(size)))
+    covariance = np.where(offsets <= 2, 0.01 * 0.5**offsets, 0.0)
+    y = dummy_exponential_func(np.array([2.0, 0.7]), x) + np.linalg.cholesky(
+        covariance
+    ) @ generator.normal(size=size)
+    return x, y, covariance
+
+
+def test_fit_with_diagonal_covariance_agrees_with_yerr():
+    x, y, covariance = correlated_data()
+    yerr = np.sqrt(np.diag(covariance))
+    data = FittingData(
+        dict(x=x, xerr=np.full(x.size, 1e-12), y=y, yerr=yerr),
+    )
+
+    result = fit(data, dummy_exponential_func)
+    covariance_result = fit(data, dummy_exponential_func, ycov=np.diag(yerr**2))
+
+    np.testing.assert_allclose(covariance_result.a, result.a, rtol=1e-6)
+    np.testing.assert_allclose(covariance_result.acov, result.acov, rtol=1e-4)
+    assert covariance_result.chi2 == pytest.approx(result.chi2, rel=1e-6)
+
+
+def test_fit_with_banded_covariance_agrees_with_dense():
+    x, y, covariance = correlated_data()
+    data = FittingData(dict(x=x, y=y), x_column="x", y_column="y", search=False)
+
+    dense_result = fit(data, dummy_exponential_func, ycov=DenseCovariance(covariance))
+    banded_result = fit(
+        data,
+        dummy_exponential_func,
+        ycov=BandedCovariance.from_matrix(covariance, bandwidth=2),
+    )
+
+    residuals = y - dummy_exponential_func(dense_result.a, x)
+    assert dense_result.chi2 == pytest.approx(
+        residuals @ np.linalg.solve(covariance, residuals), rel=1e-6
+    )
+    np.testing.assert_allclose(banded_result.a, dense_result.a, rtol=1e-6)
+    np.testing.assert_allclose(banded_result.aerr, dense_result.aerr, rtol=1e-4)
+    assert banded_result.chi2 == pytest.approx(dense_result.chi2, rel=1e-6)
+
+
+def test_fit_with_low_rank_covariance_and_a_derivative():
+    x, y, _ = correlated_data()
+    diagonal, factor = np.full(x.size, 0.01), np.linspace(0, 0.1, x.size)
+    data = FittingData(dict(x=x, y=y), x_column="x", y_column="y", search=False)
+
+    dense_result = fit(
+        data,
+        dummy_func_with_both_derivatives,
+        ycov=np.diag(diagonal) + np.outer(factor, factor),
+    )
+    low_rank_result = fit(
+        data,
+        dummy_func_with_both_derivatives,
+        ycov=LowRankCovariance(diagonal, factor),
+    )
+
+    np.testing.assert_allclose(low_rank_result.a, dense_result.a, rtol=1e-6)
+    assert low_rank_result.chi2 == pytest.approx(dense_result.chi2, rel=1e-6)
+
+
+def test_fit_fail_for_covariance_size():
+    x, y, covariance = correlated_data()
+    data = FittingData(dict(x=x, y=y), x_column="x", y_column="y", search=False)
+
+    with pytest.raises(
+        FittingError, match=f"^Expected covariance of {x.size} records, got 10$"
+    ):
+        fit(data, dummy_exponential_func, ycov=covariance[:10, :10])
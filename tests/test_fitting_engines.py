@@ -0,0 +1,272 @@
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+from pytest_cases import THIS_MODULE, parametrize_with_cases
+from scipy import sparse
+
+from eddington import (
+    FittingData,
+    SigmaClip,
+    exponential,
+    fit,
+    fitting_function,
+    linear,
+    polynomial,
+    sin,
+)
+from eddington.exceptions import FittingError
+from tests.util import assert_results_equal, exact_x_data
+
+DELTA = 1e-4
+SIGMA = 0.1
+
+
+@fitting_function(
+    n=2, a_derivative=lambda a, x: np.stack([np.ones(np.shape(x)), x]), save=False
+)
+def undeclared_linear(a, x):
+    return a[0] + a[1] * x
+
+
+def case_linear():
+    return linear, np.array([1.0, 2.0])
+
+
+def case_polynomial_3():
+    return polynomial(3), np.array([1.0, 2.0, -0.5, 0.1])
+
+
+def case_exponential():
+    return exponential, np.array([2.0, 0.7, 1.0])
+
+
+def case_sin():
+    return sin, np.array([2.0, 1.5, 0.3, 0.5])
+
+
+@parametrize_with_cases(argnames="func, a", cases=THIS_MODULE)
+@pytest.mark.parametrize("with_yerr", [True, False])
+def test_least_squares_equals_odr(func, a, with_yerr):
+    data = exact_x_data(func, a, with_yerr=with_yerr)
+
+    result = fit(data, func, a0=a, engine="least_squares")
+
+    assert_results_equal(
+        result, fit(data, func, a0=a, engine="odr", exact_x=True), rel=DELTA
+    )
+    assert result.diagnostics.converged
+    assert result.diagnostics.jacobian_evaluations == result.diagnostics.iterations
+
+
+@parametrize_with_cases(argnames="func, a", cases=[case_linear, case_polynomial_3])
+def test_linear_equals_odr(func, a):
+    data = exact_x_data(func, a)
+
+    result = fit(data, func, engine="linear")
+
+    assert_results_equal(
+        result, fit(data, func, a0=a, engine="odr", exact_x=True), rel=DELTA
+    )
+    assert result.diagnostics.converged
+    assert result.diagnostics.stop_reason == ["Closed-form solution"]
+
+
+def test_least_squares_without_a_derivative():
+    data = exact_x_data(exponential, np.array([2.0, 0.7, 1.0]))
+
+    result = fit(data, exponential, engine="least_squares", use_a_derivative=False)
+
+    assert_results_equal(
+        result, fit(data, exponential, engine="least_squares"), rel=DELTA
+    )
+    assert result.diagnostics.jacobian_evaluations == 0
+
+
+def sparse_linear_derivative(a, x):  # pylint: disable=unused-argument
+    return sparse.csr_matrix(np.stack([np.ones_like(x), x]))
+
+
+@fitting_function(n=2, a_derivative=sparse_linear_derivative, save=False)
+def sparse_linear(a, x):
+    return a[0] + a[1] * x
+
+
+def test_least_squares_with_sparse_a_derivative():
+    data = exact_x_data(linear, np.array([1.0, 2.0]))
+
+    result = fit(data, sparse_linear, engine="least_squares")
+
+    assert_results_equal(result, fit(data, linear, engine="least_squares"), rel=DELTA)
+
+
+def test_least_squares_with_y_covariance():
+    data = exact_x_data(exponential, np.array([2.0, 0.7, 1.0]), with_yerr=False)
+    offsets = np.abs(np.subtract.outer(np.arange(100), np.arange(100)))
+    covariance = np.where(offsets <= 2, 0.01 * 0.5**offsets, 0.0)
+
+    result = fit(data, exponential, ycov=covariance, engine="least_squares")
+
+    assert_results_equal(result, fit(data, exponential, ycov=covariance), rel=DELTA)
+
+
+def test_least_squares_with_max_iterations():
+    data = exact_x_data(exponential, np.array([2.0, 0.7, 1.0]))
+
+    result = fit(
+        data,
+        exponential,
+        a0=np.array([1.0, 0.1, 0.0]),
+        engine="least_squares",
+        max_iterations=2,
+    )
+
+    assert result.diagnostics.function_evaluations == 2
+    assert not result.diagnostics.converged
+
+
+def test_least_squares_with_loose_tolerance_stops_earlier():
+    data = exact_x_data(exponential, np.array([2.0, 0.7, 1.0]))
+    a0 = np.array([1.0, 0.1, 0.0])
+
+    result = fit(data, exponential, a0=a0, engine="least_squares")
+    loose_result = fit(data, exponential, a0=a0, engine="least_squares", tolerance=1e-2)
+
+    assert loose_result.diagnostics.converged
+    assert (
+        loose_result.diagnostics.function_evaluations
+        < result.diagnostics.function_evaluations
+    )
+
+
+@fitting_function(n=3, a_derivative=exponential.a_derivative, save=False)
+def slow_exponential(a, x):
+    time.sleep(0.01)
+    return exponential(a, x)
+
+
+@pytest.mark.parametrize("use_a_derivative", [True, False])
+def test_least_squares_marks_result_as_timed_out(use_a_derivative):
+    data = exact_x_data(exponential, np.array([2.0, 0.7, 1.0]))
+
+    result = fit(
+        data,
+        slow_exponential,
+        a0=np.array([1.0, 0.1, 0.0]),
+        engine="least_squares",
+        use_a_derivative=use_a_derivative,
+        timeout=0.05,
+    )
+
+    assert result.diagnostics.timed_out
+    assert not result.diagnostics.converged
+    assert np.all(np.isfinite(result.a))
+    assert np.all(np.isfinite(result.aerr))
+    assert result.chi2 == pytest.approx(
+        np.sum(np.square((exponential(result.a, data.x) - data.y) / SIGMA))
+    )
+
+
+@pytest.mark.parametrize(
+    ["func", "with_xerr", "with_ycov", "exact_x", "expected_engine"],
+    [
+        (linear, True, False, True, "odr"),
+        (linear, False, False, False, "odr"),
+        (linear, False, False, True, "linear"),
+        (linear, False, True, False, "least_squares"),
+        (exponential, False, False, True, "least_squares"),
+        (undeclared_linear, False, False, True, "least_squares"),
+    ],
+)
+def test_auto_engine(mocker, func, with_xerr, with_ycov, exact_x, expected_engine):
+    engines = dict(
+        linear=mocker.patch("eddington.fitting._fit_linear"),
+        least_squares=mocker.patch("eddington.fitting._fit_least_squares"),
+    )
+    data = exact_x_data(func, np.ones(func.n))
+    if with_xerr:
+        data = FittingData(
+            OrderedDict(x=data.x, xerr=np.full(100, 0.01), y=data.y, yerr=data.yerr)
+        )
+
+    fit(
+        data,
+        func,
+        engine="auto",
+        ycov=np.eye(100) if with_ycov else None,
+        exact_x=exact_x,
+    )
+
+    for engine, engine_mock in engines.items():
+        assert engine_mock.called == (engine == expected_engine)
+
+
+@pytest.mark.parametrize("func", [linear, exponential])
+def test_auto_engine_fits_the_model_of_odr(func):
+    data = exact_x_data(func, np.ones(func.n))
+
+    for exact_x in [True, False]:
+        assert_results_equal(
+            fit(data, func, engine="auto", exact_x=exact_x),
+            fit(data, func, exact_x=exact_x),
+            rel=DELTA,
+        )
+
+
+def test_linear_engine_with_undeclared_linear_function():
+    data = exact_x_data(linear, np.array([1.0, 2.0]))
+
+    result = fit(data, undeclared_linear, engine="linear")
+
+    assert_results_equal(result, fit(data, linear, engine="linear"), rel=DELTA)
+
+
+def test_linear_engine_with_sigma_clipping():
+    data = exact_x_data(linear, np.array([1.0, 2.0]))
+    y = data.y
+    y[10] += 10
+    data = FittingData(
+        OrderedDict(x=data.x, y=y, yerr=data.yerr),
+        x_column="x",
+        y_column="y",
+        yerr_column="yerr",
+        search=False,
+    )
+
+    result = fit(data, linear, clip=SigmaClip(), engine="linear")
+
+    assert result.rejected.tolist() == [11]
+    assert result.diagnostics.stop_reason == ["Closed-form solution"]
+
+
+def test_unknown_engine_raises_error():
+    data = exact_x_data(linear, np.array([1.0, 2.0]))
+
+    with pytest.raises(
+        FittingError,
+        match='^Unknown engine "newton". '
+        "Should be one of odr, least_squares, linear, auto$",
+    ):
+        fit(data, linear, engine="newton")
+
+
+def test_linear_engine_with_nonlinear_function_raises_error():
+    data = exact_x_data(exponential, np.array([2.0, 0.7, 1.0]))
+
+    with pytest.raises(
+        FittingError,
+        match='^Cannot fit "exponential" using the linear engine '
+        "since it is not linear in its parameters$",
+    ):
+        fit(data, exponential, engine="linear")
+
+
+def test_linear_engine_with_y_covariance_raises_error():
+    data = exact_x_data(linear, np.array([1.0, 2.0]))
+
+    with pytest.raises(
+        FittingError,
+        match="^Cannot fit data with y covariance using the linear engine$",
+    ):
+        fit(data, linear, engine="linear", ycov=np.eye(100))
@@ -1,3 +1,4 @@
+from dataclasses import asdict
 from typing import Any, Dict
 
 import mock
@@ -5,7 +6,14 @@
 import pytest
 from pytest_cases import THIS_MODULE, parametrize_with_cases
 
-from eddington import FittingResult
+from eddington import (
+    FittingFunction,
+    FittingFunctionRuntimeError,
+    FittingResult,
+    linear,
+)
+from eddington.exceptions import FittingError
+from eddington.fitting_result import FittingDiagnostics
 from tests.util import assert_calls
 
 
@@ -180,6 +188,125 @@ def case_with_small_p_probability():
     )
 
 
+def case_with_diagnostics():
+
+    kwargs = dict(
+        a0=[1.0, 3.0],
+        a=[1.1, 2.98],
+        aerr=[0.1, 0.76],
+        acov=[[0.01, 2.3], [2.3, 0.988]],
+        chi2=8.276,
+        degrees_of_freedom=5,
+        diagnostics=FittingDiagnostics(
+            iterations=8,
+            function_evaluations=43,
+            jacobian_evaluations=0,
+            info=2,
+            stop_reason=["Parameter convergence"],
+            setup_time=1.2e-4,
+            run_time=2.1e-3,
+            post_processing_time=3.4e-4,
+        ),
+    )
+    chi2_reduced = 1.6552
+    p_probability = 0.14167
+    arerr = [9.09091, 25.50336]
+    repr_string = """Results:
+========
+
+Initial parameters' values:
+\t1.0 3.0
+Fitted parameters' values:
+\ta[0] = 1.1000 \u00B1 0.1000 (9.091% error)
+\ta[1] = 2.9800 \u00B1 0.7600 (25.50% error)
+Fitted parameters covariance:
+[[0.01  2.3  ]
+ [2.3   0.988]]
+Chi squared: 8.276
+Degrees of freedom: 5
+Chi squared reduced: 1.655
+P-probability: 0.1417
+Diagnostics:
+\tConverged: yes
+\tIterations: 8
+\tFunction evaluations: 43
+\tJacobian evaluations: 0
+\tStop reason: Parameter convergence (info 2)
+"""
+    fitting_result = FittingResult(**kwargs)
+    return (
+        dict(
+            chi2_reduced=chi2_reduced,
+            p_probability=p_probability,
+            arerr=arerr,
+            repr_string=repr_string,
+            delta=10e-5,
+            **kwargs,
+        ),
+        fitting_result,
+    )
+
+
+def case_with_timed_out_diagnostics():
+
+    kwargs = dict(
+        a0=[1.0, 3.0],
+        a=[1.1, 2.98],
+        aerr=[0.1, 0.76],
+        acov=[[0.01, 2.3], [2.3, 0.988]],
+        chi2=8.276,
+        degrees_of_freedom=5,
+        diagnostics=FittingDiagnostics(
+            iterations=8,
+            function_evaluations=43,
+            jacobian_evaluations=0,
+            info=4,
+            stop_reason=["Iteration limit reached"],
+            setup_time=1.2e-4,
+            run_time=2.1e-3,
+            post_processing_time=3.4e-4,
+            timed_out=True,
+        ),
+    )
+    chi2_reduced = 1.6552
+    p_probability = 0.14167
+    arerr = [9.09091, 25.50336]
+    repr_string = """Results:
+========
+
+Initial parameters' values:
+\t1.0 3.0
+Fitted parameters' values:
+\ta[0] = 1.1000 \u00B1 0.1000 (9.091% error)
+\ta[1] = 2.9800 \u00B1 0.7600 (25.50% error)
+Fitted parameters covariance:
+[[0.01  2.3  ]
+ [2.3   0.988]]
+Chi squared: 8.276
+Degrees of freedom: 5
+Chi squared reduced: 1.655
+P-probability: 0.1417
+Diagnostics:
+\tConverged: no
+\tIterations: 8
+\tFunction evaluations: 43
+\tJacobian evaluations: 0
+\tStop reason: Iteration limit reached, timed out (info 4)
+"""
+    fitting_result = FittingResult(**kwargs)
+    return (
+        dict(
+            chi2_reduced=chi2_reduced,
+            p_probability=p_probability,
+            arerr=arerr,
+            repr_string=repr_string,
+            delta=10e-5,
+            **kwargs,
+        ),
+        fitting_result,
+    )
+
+
 @parametrize_with_cases(argnames="expected, fitting_result", cases=THIS_MODULE)
 def test_a0(expected: Dict[str, Any], fitting_result: FittingResult):
     assert fitting_result.a0 == pytest.approx(
@@ -286,26 +413,134 @@ def test_export_to_json_file(
     with mock.patch("eddington.fitting_result.open", mock_open_obj):
         fitting_result.save_json(path)
         mock_open_obj.assert_called_once_with(path, mode="w", encoding="utf-8")
+        expected_json = dict(
+            a=expected["a"],
+            a0=expected["a0"],
+            aerr=expected["aerr"],
+            arerr=expected["arerr"],
+            acov=expected["acov"],
+            chi2=expected["chi2"],
+            chi2_reduced=expected["chi2_reduced"],
+            degrees_of_freedom=expected["degrees_of_freedom"],
+            p_probability=expected["p_probability"],
+        )
+        if "diagnostics" in expected:
+            expected_json["diagnostics"] = dict(
+                asdict(expected["diagnostics"]),
+                converged=expected["diagnostics"].converged,
+            )
         assert_calls(
             json_dumps_mock,
-            [
-                (
-                    [
-                        dict(
-                            a=expected["a"],
-                            a0=expected["a0"],
-                            aerr=expected["aerr"],
-                            arerr=expected["arerr"],
-                            acov=expected["acov"],
-                            chi2=expected["chi2"],
-                            chi2_reduced=expected["chi2_reduced"],
-                            degrees_of_freedom=expected["degrees_of_freedom"],
-                            p_probability=expected["p_probability"],
-                        ),
-                    ],
-                    dict(indent=1),
-                )
-            ],
+            [([expected_json], dict(indent=1))],
             rel=expected["delta"],
         )
         mock_open_obj.return_value.write.assert_called_once_with(json_string)
+
+
+@pytest.fixture
+def information_criteria_result():
+    return FittingResult(
+        a0=[1.0, 3.0],
+        a=[1.1, 2.98],
+        aerr=[0.1, 0.76],
+        acov=[[0.01, 2.3], [2.3, 0.988]],
+        chi2=8.276,
+        degrees_of_freedom=5,
+    )
+
+
+def test_aic(information_criteria_result):
+    assert information_criteria_result.aic == pytest.approx(
+        12.276
+    ), "AIC is different than expected"
+
+
+def test_bic(information_criteria_result):
+    assert information_criteria_result.bic == pytest.approx(
+        8.276 + 2 * np.log(7)
+    ), "BIC is different than expected"
+
+
+@pytest.fixture
+def linear_result():
+    return FittingResult(
+        a0=[1.0, 1.0],
+        a=[1.0, 2.0],
+        aerr=[0.4, 0.6],
+        acov=[[0.02, 0.005], [0.005, 0.045]],
+        chi2=16.0,
+        degrees_of_freedom=2,
+    )
+
+
+def expected_linear_band(x, z_score):
+    half_width = z_score * np.sqrt(8 * (0.02 + 2 * 0.005 * x + 0.045 * x**2))
+    return 1 + 2 * x - half_width, 1 + 2 * x + half_width
+
+
+def test_prediction_band(linear_result):
+    x = np.linspace(-2, 3, 11)
+
+    lower, upper = linear_result.prediction_band(linear, x)
+
+    expected_lower, expected_upper = expected_linear_band(x, 1.959964)
+    np.testing.assert_allclose(lower, expected_lower, rtol=1e-6)
+    np.testing.assert_allclose(upper, expected_upper, rtol=1e-6)
+
+
+def test_prediction_band_with_level(linear_result):
+    x = np.linspace(-2, 3, 11)
+
+    lower, upper = linear_result.prediction_band(linear, x, level=0.6826895)
+
+    expected_lower, expected_upper = expected_linear_band(x, 1)
+    np.testing.assert_allclose(lower, expected_lower, rtol=1e-6)
+    np.testing.assert_allclose(upper, expected_upper, rtol=1e-6)
+
+
+def test_prediction_band_on_single_value(linear_result):
+    lower, upper = linear_result.prediction_band(linear, 2.0)
+
+    expected_lower, expected_upper = expected_linear_band(2.0, 1.959964)
+    assert lower == pytest.approx(expected_lower)
+    assert upper == pytest.approx(expected_upper)
+
+
+def test_prediction_band_monte_carlo(linear_result):
+    x = np.linspace(-2, 3, 11)
+
+    lower, upper = linear_result.prediction_band(linear, x, samples=20000, seed=0)
+
+    expected_lower, expected_upper = expected_linear_band(x, 1.959964)
+    np.testing.assert_allclose(lower, expected_lower, atol=0.1)
+    np.testing.assert_allclose(upper, expected_upper, atol=0.1)
+
+
+def test_prediction_band_monte_carlo_without_a_derivative(linear_result):
+    func = FittingFunction(fit_func=linear.fit_func, n=2, name="bare", save=False)
+    x = np.linspace(-2, 3, 11)
+
+    band = linear_result.prediction_band(func, x, samples=1000, seed=1)
+
+    np.testing.assert_allclose(
+        band, linear_result.prediction_band(linear, x, samples=1000, seed=1)
+    )
+
+
+def test_prediction_band_without_a_derivative(linear_result):
+    func = FittingFunction(fit_func=linear.fit_func, n=2, name="bare", save=False)
+
+    with pytest.raises(
+        FittingFunctionRuntimeError,
+        match='^"bare" has no a derivative. Use samples instead.$',
+    ):
+        linear_result.prediction_band(func, np.arange(3))
+
+
+@pytest.mark.parametrize("level", [0, 1, 1.5])
+def test_prediction_band_with_invalid_level(linear_result, level):
+    with pytest.raises(
+        FittingError,
+        match=f"^Confidence level should be between 0 and 1, got {level}$",
+    ):
+        linear_result.prediction_band(linear, np.arange(3), level=level)
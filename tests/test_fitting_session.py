@@ -0,0 +1,170 @@
+import numpy as np
+import pytest
+from pytest_cases import parametrize
+
+from eddington import (
+    IncrementalLinearFit,
+    exponential,
+    fit,
+    fitting_function,
+    linear,
+    polynomial,
+)
+from eddington.exceptions import FittingDataRecordIndexError, FittingError
+from eddington.fitting_session import FittingSession
+from tests.util import assert_results_equal, exact_x_data
+
+RECORDS = 30
+DELTA = 1e-4
+
+
+def full_fit(session):
+    data = session.data
+    return fit(data, session.func, exact_x=data.xerr is None)
+
+
+@parametrize(
+    "func, a, with_xerr, linear_session",
+    [
+        (polynomial(2), [1, 2, -0.5], False, True),
+        (linear, [1, 2], True, False),
+        (exponential, [2, 0.7, 1], False, False),
+    ],
+)
+def test_session_follows_records_selection(func, a, with_xerr, linear_session):
+    session = FittingSession(
+        exact_x_data(func, a, records=RECORDS, with_xerr=with_xerr), func
+    )
+
+    assert session.linear == linear_session
+    assert_results_equal(session.result, full_fit(session), rel=DELTA)
+    for index in [3, 10, 17]:
+        session.unselect_record(index)
+        assert not session.data.is_selected(index)
+        assert_results_equal(session.result, full_fit(session), rel=DELTA)
+    session.select_record(10)
+    assert session.data.is_selected(10)
+    assert_results_equal(session.result, full_fit(session), rel=DELTA)
+
+
+def test_linear_and_nonlinear_sessions_agree():
+    data = exact_x_data(polynomial(2), [1, 2, -0.5], records=RECORDS)
+    linear_session = FittingSession(data, polynomial(2), linear=True)
+    nonlinear_session = FittingSession(data, polynomial(2), linear=False)
+
+    assert_results_equal(linear_session.result, nonlinear_session.result, rel=DELTA)
+
+
+def test_session_warm_starts_from_previous_result():
+    session = FittingSession(
+        exact_x_data(exponential, [2, 0.7, 1], records=RECORDS), exponential
+    )
+    previous_a = session.result.a
+
+    session.unselect_record(5)
+
+    np.testing.assert_equal(session.result.a0, previous_a)
+
+
+def test_session_caches_result():
+    session = FittingSession(
+        exact_x_data(exponential, [2, 0.7, 1], records=RECORDS), exponential
+    )
+
+    assert session.result is session.result
+
+
+@parametrize("linear_session", [True, False])
+def test_toggling_record_twice_changes_nothing(linear_session):
+    session = FittingSession(
+        exact_x_data(linear, [1, 2], records=RECORDS), linear, linear=linear_session
+    )
+    result = session.result
+
+    session.select_record(4)
+    session.unselect_record(4)
+    session.unselect_record(4)
+
+    assert session.data.number_of_records - sum(session.data.records_indices) == 1
+    assert session.result is not result
+
+
+def test_selecting_selected_record_keeps_result():
+    session = FittingSession(exact_x_data(linear, [1, 2], records=RECORDS), linear)
+    result = session.result
+
+    session.select_record(4)
+
+    assert session.result is result
+
+
+def test_session_without_yerr():
+    data = exact_x_data(linear, [1, 2], records=RECORDS)
+    data.yerr_column = None
+    session = FittingSession(data, linear)
+
+    session.unselect_record(1)
+
+    assert session.linear
+    assert session.result.degrees_of_freedom == RECORDS - 3
+
+
+def test_session_of_undeclared_linear_function_is_not_linear():
+    @fitting_function(
+        n=2, a_derivative=lambda a, x: np.stack([np.ones(np.shape(x)), x]), save=False
+    )
+    def undeclared_linear(a, x):
+        return a[0] + a[1] * x
+
+    session = FittingSession(
+        exact_x_data(linear, [1, 2], records=RECORDS), undeclared_linear
+    )
+
+    assert not session.linear
+
+
+def test_linear_session_of_nonlinear_function_raises_error():
+    with pytest.raises(FittingError, match="since it is not linear in its parameters"):
+        FittingSession(
+            exact_x_data(exponential, [2, 0.7, 1], records=RECORDS),
+            exponential,
+            linear=True,
+        )
+
+
+def test_failed_downdate_keeps_selection(mocker):
+    session = FittingSession(exact_x_data(linear, [1, 2], records=RECORDS), linear)
+    mocker.patch.object(
+        IncrementalLinearFit, "downdate", side_effect=FittingError("error")
+    )
+
+    with pytest.raises(FittingError, match="^error$"):
+        session.unselect_record(2)
+
+    assert session.data.is_selected(2)
+
+
+@parametrize("index", [0, RECORDS + 1])
+def test_toggle_invalid_record_raises_error(index):
+    session = FittingSession(exact_x_data(linear, [1, 2], records=RECORDS), linear)
+
+    with pytest.raises(FittingDataRecordIndexError):
+        session.select_record(index)
+    with pytest.raises(FittingDataRecordIndexError):
+        session.unselect_record(index)
+
+
+def test_session_fail_for_no_x():
+    data = exact_x_data(linear, [1, 2], records=RECORDS)
+    data.x_column = None
+
+    with pytest.raises(FittingError, match="^Cannot fit data without x values$"):
+        FittingSession(data, linear)
+
+
+def test_session_fail_for_no_y():
+    data = exact_x_data(linear, [1, 2], records=RECORDS)
+    data.y_column = None
+
+    with pytest.raises(FittingError, match="^Cannot fit data without y values$"):
+        FittingSession(data, linear)
@@ -0,0 +1,216 @@
+import numpy as np
+import pytest
+
+from eddington import FittingData, FittingFunction, exponential, linear
+from eddington.exceptions import FittingError
+from eddington.fitting import _fit_arrays
+from eddington.global_fitting import global_fit
+
+SIGMA = 0.05
+
+
+def exponential_data(a, x, seed):
+    generator = np.random.default_rng(seed)
+    return FittingData(
+        dict(
+            x=x,
+            xerr=np.full(shape=x.size, fill_value=1e-12),
+            y=exponential(np.array(a), x) + generator.normal(scale=SIGMA, size=x.size),
+            yerr=np.full(shape=x.size, fill_value=SIGMA),
+        )
+    )
+
+
+def linear_data(a, x):
+    return FittingData(
+        dict(x=x, y=linear(np.array(a), x) + 0.1 * (-1) ** np.arange(x.size)),
+        x_column="x",
+        y_column="y",
+        search=False,
+    )
+
+
+@pytest.fixture
+def decays():
+    return [
+        (
+            exponential_data([2, -0.8, 1], np.linspace(0, 3, 30), seed=0),
+            exponential,
+            ["amplitude1", "rate", "offset1"],
+        ),
+        (
+            exponential_data([5, -0.8, 0], np.linspace(0, 2, 25), seed=1),
+            exponential,
+            ["amplitude2", "rate", "offset2"],
+        ),
+    ]
+
+
+def combined_decays(a, x):
+    first = a[0] * np.exp(a[1] * x) + a[2]
+    second = a[3] * np.exp(a[1] * (x - 100)) + a[4]
+    return np.where(x < 50, first, second)
+
+
+def test_global_fit_agrees_with_combined_function(decays):
+    combined = FittingFunction(
+        fit_func=combined_decays, n=5, name="combined_decays", save=False
+    )
+    x = np.concatenate([decays[0][0].x, decays[1][0].x + 100])
+    expected = _fit_arrays(
+        combined,
+        x=x,
+        y=np.concatenate([decays[0][0].y, decays[1][0].y]),
+        xerr=np.full(x.size, 1e-12),
+        yerr=np.full(x.size, SIGMA),
+        a0=np.array([2, -1, 1, 5, 0]),
+    )
+
+    global_result = global_fit(decays)
+
+    assert global_result.converged
+    assert global_result.names == [
+        "amplitude1",
+        "rate",
+        "offset1",
+        "amplitude2",
+        "offset2",
+    ]
+    np.testing.assert_allclose(global_result.result.a, expected.a, atol=1e-5)
+    np.testing.assert_allclose(global_result.result.aerr, expected.aerr, rtol=1e-4)
+    assert global_result.result.chi2 == pytest.approx(expected.chi2, rel=1e-8)
+    assert global_result.result.degrees_of_freedom == 50
+
+
+def test_global_fit_per_dataset_results(decays):
+    global_result = global_fit(decays)
+
+    first, second = global_result.results
+    np.testing.assert_equal(first.a, global_result.result.a[[0, 1, 2]])
+    np.testing.assert_equal(second.a, global_result.result.a[[3, 1, 4]])
+    np.testing.assert_equal(second.aerr, global_result.result.aerr[[3, 1, 4]])
+    np.testing.assert_equal(
+        second.acov, global_result.result.acov[np.ix_([3, 1, 4], [3, 1, 4])]
+    )
+    assert first.degrees_of_freedom == 27
+    assert second.degrees_of_freedom == 22
+    assert first.chi2 + second.chi2 == pytest.approx(global_result.result.chi2)
+
+
+def test_global_fit_shared_parameters(decays):
+    global_result = global_fit(decays)
+
+    assert global_result.shared == ["rate"]
+    assert global_result.parameters["rate"] == global_result.result.a[1]
+
+
+def test_global_fit_with_a0(decays):
+    global_result = global_fit(decays, a0=dict(rate=-0.5, offset2=0.1))
+
+    assert global_result.result.a0[1] == -0.5
+    assert global_result.result.a0[4] == 0.1
+    assert global_result.converged
+
+
+def test_global_fit_without_initial_guess():
+    x = np.arange(10.0)
+
+    global_result = global_fit(
+        [
+            (linear_data([1, 2], x), linear, ["intercept1", "slope"]),
+            (linear_data([-1, 2], x), linear, ["intercept2", "slope"]),
+        ]
+    )
+
+    np.testing.assert_equal(global_result.result.a0, np.ones(3))
+    np.testing.assert_allclose(global_result.result.a, [1, 2, -1], atol=0.05)
+
+
+def test_global_fit_with_repeated_name_in_dataset():
+    x = np.arange(10.0)
+
+    global_result = global_fit([(linear_data([3, 3], x), linear, ["a", "a"])])
+
+    assert global_result.shared == []
+    assert global_result.result.a[0] == pytest.approx(3, abs=0.05)
+
+
+def test_global_fit_without_a_derivative(decays):
+    bare = FittingFunction(
+        fit_func=exponential.fit_func,
+        n=3,
+        name="bare_exponential",
+        initial_guess=lambda x, y: np.full(3, np.nan),
+        save=False,
+    )
+
+    global_result = global_fit(
+        [(data, bare, parameters) for data, _, parameters in decays],
+        a0=dict(amplitude1=2, amplitude2=5, rate=-1, offset1=1, offset2=0),
+    )
+
+    np.testing.assert_allclose(
+        global_result.result.a, global_fit(decays).result.a, rtol=1e-4
+    )
+
+
+def test_global_fit_stops_at_max_iterations(decays):
+    global_result = global_fit(decays, max_iterations=1)
+
+    assert not global_result.converged
+    assert global_result.iterations == 1
+
+
+def test_global_fit_diverges():
+    x = np.arange(10.0)
+    data = linear_data([1, 2], x)
+    data.data["y"] = np.full(x.size, np.nan)
+
+    global_result = global_fit([(data, linear, ["a", "b"])])
+
+    assert not global_result.converged
+
+
+def test_global_fit_pretty_string(decays):
+    global_result = global_fit(decays)
+
+    pretty_string = str(global_result)
+
+    assert pretty_string.startswith("Global fit of 2 datasets:\n")
+    assert "|    rate    |" in pretty_string
+    assert pretty_string.endswith(
+        "Chi squared reduced: " f"{global_result.result.chi2_reduced:.4}\n"
+    )
+
+
+def test_global_fit_without_datasets():
+    with pytest.raises(FittingError, match="^No datasets to fit$"):
+        global_fit([])
+
+
+def test_global_fit_with_wrong_mapping(decays):
+    with pytest.raises(
+        FittingError, match="^Expected 3 parameter names for dataset 1, got 2$"
+    ):
+        global_fit([decays[0], (decays[1][0], exponential, ["a", "b"])])
+
+
+def test_global_fit_with_unknown_initial_parameter(decays):
+    with pytest.raises(FittingError, match='^Unknown global parameter "amplitude3"$'):
+        global_fit(decays, a0=dict(rate=-1, amplitude3=2))
+
+
+def test_global_fit_without_x():
+    data = linear_data([1, 2], np.arange(10.0))
+    data.x_column = None
+
+    with pytest.raises(FittingError, match="^Cannot fit data without x values$"):
+        global_fit([(data, linear, ["a", "b"])])
+
+
+def test_global_fit_without_y():
+    data = linear_data([1, 2], np.arange(10.0))
+    data.y_column = None
+
+    with pytest.raises(FittingError, match="^Cannot fit data without y values$"):
+        global_fit([(data, linear, ["a", "b"])])
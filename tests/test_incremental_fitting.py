@@ -0,0 +1,215 @@
+import numpy as np
+import pytest
+from pytest_cases import THIS_MODULE, parametrize_with_cases
+
+from eddington import (
+    IncrementalLinearFit,
+    constant,
+    exponential,
+    fit,
+    fitting_function,
+    linear,
+    parabolic,
+    polynomial,
+)
+from eddington.exceptions import FittingError
+from tests.util import assert_results_equal, exact_x_data
+
+DELTA = 1e-4
+
+
+@fitting_function(n=2, save=False)
+def no_derivative_func(a, x):
+    return a[0] + a[1] * x
+
+
+def case_linear():
+    return linear
+
+
+def case_constant():
+    return constant
+
+
+def case_parabolic():
+    return parabolic
+
+
+def case_polynomial_3():
+    return polynomial(3)
+
+
+def actual_a(func):
+    return np.arange(1, func.n + 1, dtype=float)
+
+
+@parametrize_with_cases(argnames="func", cases=THIS_MODULE)
+def test_incremental_fit_equals_full_fit(func):
+    data = exact_x_data(func, actual_a(func), records=50, with_xerr=True)
+    incremental_fit = IncrementalLinearFit(func)
+    for start in range(0, data.number_of_records, 7):
+        chunk = slice(start, start + 7)
+        incremental_fit.update(data.x[chunk], data.y[chunk], data.yerr[chunk])
+
+    assert incremental_fit.number_of_records == data.number_of_records
+    assert_results_equal(
+        incremental_fit.result(), fit(data, func, a0=actual_a(func)), rel=DELTA
+    )
+
+
+@parametrize_with_cases(argnames="func", cases=THIS_MODULE)
+def test_sliding_window_equals_full_fit_of_window(func):
+    data = exact_x_data(func, actual_a(func), records=50, with_xerr=True)
+    incremental_fit = IncrementalLinearFit(func)
+    incremental_fit.update(data.x[:30], data.y[:30], data.yerr[:30])
+    incremental_fit.update(data.x[30:], data.y[30:], data.yerr[30:])
+    incremental_fit.downdate(data.x[:10], data.y[:10], data.yerr[:10])
+    data.records_indices = [i >= 10 for i in range(data.number_of_records)]
+
+    assert incremental_fit.number_of_records == 40
+    assert_results_equal(
+        incremental_fit.result(), fit(data, func, a0=actual_a(func)), rel=DELTA
+    )
+
+
+@parametrize_with_cases(argnames="func", cases=THIS_MODULE)
+def test_merged_fits_equal_full_fit(func):
+    data = exact_x_data(func, actual_a(func), records=50, with_xerr=True)
+    incremental_fit = IncrementalLinearFit(func).update(
+        data.x[:20], data.y[:20], data.yerr[:20]
+    )
+    other_fit = IncrementalLinearFit(func).update(
+        data.x[20:], data.y[20:], data.yerr[20:]
+    )
+
+    incremental_fit.merge(other_fit)
+
+    assert incremental_fit.number_of_records == data.number_of_records
+    assert_results_equal(
+        incremental_fit.result(), fit(data, func, a0=actual_a(func)), rel=DELTA
+    )
+
+
+def test_merge_different_number_of_parameters_raises_error():
+    incremental_fit = IncrementalLinearFit(linear)
+
+    with pytest.raises(
+        FittingError,
+        match="^Cannot merge a fit of 3 parameters into a fit of 2 parameters$",
+    ):
+        incremental_fit.merge(IncrementalLinearFit(parabolic))
+
+
+def test_incremental_fit_without_y_errors():
+    x = np.arange(10, dtype=float)
+    y = 3 + 2 * x + np.tile([0.1, -0.1], 5)
+
+    result = IncrementalLinearFit(linear).update(x, y).result()
+
+    assert result.a == pytest.approx([3, 2], rel=1e-2)
+    assert result.chi2 == pytest.approx(
+        np.sum(np.square(y - linear(result.a, x))), rel=DELTA
+    )
+    assert result.a0 == pytest.approx([0, 0])
+
+
+def test_incremental_fit_with_fixed_parameter():
+    x = np.arange(10, dtype=float)
+    y = 3 + 2 * x
+
+    result = IncrementalLinearFit(polynomial(2).fix(0, 3)).update(x, y).result()
+
+    assert result.a == pytest.approx([2, 0], abs=DELTA)
+    assert result.chi2 == pytest.approx(0, abs=DELTA)
+
+
+def test_clear():
+    incremental_fit = IncrementalLinearFit(linear).update([1, 2, 3], [4, 5, 6])
+
+    incremental_fit.clear()
+
+    assert incremental_fit.number_of_records == 0
+    with pytest.raises(
+        FittingError, match="^Cannot fit 2 parameters with only 0 records$"
+    ):
+        incremental_fit.result()
+
+
+def test_not_enough_records_raises_error():
+    incremental_fit = IncrementalLinearFit(parabolic).update([1, 2, 3], [4, 5, 6])
+
+    with pytest.raises(
+        FittingError, match="^Cannot fit 3 parameters with only 3 records$"
+    ):
+        incremental_fit.result()
+
+
+def test_downdate_too_many_records_raises_error():
+    incremental_fit = IncrementalLinearFit(linear).update([1, 2], [4, 5])
+
+    with pytest.raises(
+        FittingError, match="^Cannot remove 3 records from a fit of 2 records$"
+    ):
+        incremental_fit.downdate([1, 2, 3], [4, 5, 6])
+
+
+def test_downdate_records_which_were_not_added_raises_error():
+    incremental_fit = IncrementalLinearFit(linear).update([1, 2, 3], [4, 5, 6])
+
+    with pytest.raises(
+        FittingError,
+        match="^Cannot remove records which leave the fit without enough information$",
+    ):
+        incremental_fit.downdate([10], [0])
+
+
+@pytest.mark.parametrize(
+    ["func", "x"], [(linear, [2, 2, 2, 2]), (parabolic, [1, 1, 2, 2])]
+)
+def test_rank_deficient_fit_raises_error(func, x):
+    incremental_fit = IncrementalLinearFit(func).update(x, [1, 2, 3, 4])
+
+    with pytest.raises(
+        FittingError,
+        match=f'^Cannot fit "{func.name}" since the records do not determine '
+        "all of its parameters$",
+    ):
+        incremental_fit.result()
+
+
+def test_downdate_to_perfect_fit():
+    incremental_fit = IncrementalLinearFit(linear).update([1, 2, 3, 4], [4, 5, 6, 0])
+
+    result = incremental_fit.downdate([4], [0]).result()
+
+    assert result.a == pytest.approx([3, 1])
+    assert result.chi2 == pytest.approx(0, abs=DELTA)
+
+
+@parametrize_with_cases(argnames="func", cases=THIS_MODULE)
+def test_is_linear(func):
+    assert func.linear_in_parameters
+    assert IncrementalLinearFit.is_linear(func)
+
+
+@pytest.mark.parametrize("func", [exponential, no_derivative_func])
+def test_is_not_linear(func):
+    assert not IncrementalLinearFit.is_linear(func)
+
+
+def test_non_linear_function_raises_error():
+    with pytest.raises(
+        FittingError,
+        match='^Cannot fit "exponential" incrementally '
+        "since it is not linear in its parameters$",
+    ):
+        IncrementalLinearFit(exponential)
+
+
+def test_function_without_a_derivative_raises_error():
+    with pytest.raises(
+        FittingError,
+        match='^Cannot fit "no_derivative_func" incrementally '
+        "without its a derivative$",
+    ):
+        IncrementalLinearFit(no_derivative_func)
@@ -0,0 +1,154 @@
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+from pytest_cases import parametrize
+
+from eddington import FittingData, FittingFunction, exponential, fit, linear
+from eddington.exceptions import FittingError, FittingFunctionRuntimeError
+from eddington.influence import influence
+from tests.util import exact_x_data
+
+RECORDS = 30
+OUTLIER = 7
+
+
+def outlier_data(func, a, outlier=1.0):
+    data = exact_x_data(func, a, records=RECORDS, with_xerr=True)
+    data.set_cell("y", OUTLIER + 1, data.y[OUTLIER] + outlier)
+    return data
+
+
+@parametrize(
+    "func, a, tolerance",
+    [(linear, [1, 2], 1e-6), (exponential, [2, 0.7, 1], 1e-2)],
+)
+def test_linearized_step_agrees_with_refits(func, a, tolerance):
+    data = outlier_data(func, a)
+    result = fit(data, func)
+
+    linearized = influence(result, data, func)
+    refitted = influence(result, data, func, exact=True)
+
+    assert not linearized.exact
+    assert refitted.exact
+    np.testing.assert_allclose(linearized.leverages, refitted.leverages)
+    np.testing.assert_allclose(
+        linearized.delta_a,
+        refitted.delta_a,
+        atol=tolerance * np.max(np.abs(refitted.delta_a)),
+    )
+    assert linearized.most_influential(1)[0] == OUTLIER
+    assert refitted.most_influential(1)[0] == OUTLIER
+
+
+def test_refits_equal_leaving_records_out():
+    data = outlier_data(exponential, [2, 0.7, 1])
+    result = fit(data, exponential)
+
+    refitted = influence(result, data, exponential, exact=True)
+
+    data.unselect_record(OUTLIER + 1)
+    np.testing.assert_allclose(
+        refitted.delta_a[OUTLIER],
+        fit(data, exponential, a0=result.a).a - result.a,
+        rtol=1e-6,
+    )
+
+
+def test_linear_leverages_and_cooks_distance():
+    data = outlier_data(linear, [1, 2])
+    result = fit(data, linear)
+
+    influence_result = influence(result, data, linear)
+
+    design = np.stack([np.ones(RECORDS), data.x], axis=1) / 0.1
+    hat = design @ np.linalg.solve(design.T @ design, design.T)
+    residuals = (data.y - linear(result.a, data.x)) / 0.1
+    leverages = np.diag(hat)
+    np.testing.assert_allclose(influence_result.leverages, leverages)
+    assert np.sum(influence_result.leverages) == pytest.approx(2)
+    np.testing.assert_allclose(
+        influence_result.cooks_distance,
+        residuals**2
+        * leverages
+        / (2 * result.chi2_reduced * np.square(1 - leverages)),
+    )
+
+
+def test_influence_with_workers():
+    data = outlier_data(exponential, [2, 0.7, 1])
+    result = fit(data, exponential)
+
+    serial = influence(result, data, exponential, exact=True)
+    parallel = influence(result, data, exponential, exact=True, workers=2)
+
+    np.testing.assert_allclose(parallel.delta_a, serial.delta_a)
+
+
+def test_failed_refits_are_nan(mocker):
+    data = outlier_data(linear, [1, 2])
+    result = fit(data, linear)
+    mocker.patch("eddington.influence._fit_arrays", side_effect=FittingError)
+
+    influence_result = influence(result, data, linear, exact=True)
+
+    assert np.all(np.isnan(influence_result.delta_a))
+    assert np.all(np.isnan(influence_result.cooks_distance))
+    assert len(influence_result.most_influential()) == 5
+
+
+def test_influence_pretty_string():
+    data = outlier_data(linear, [1, 2])
+    result = fit(data, linear)
+
+    influence_result = influence(result, data, linear)
+
+    lines = str(influence_result).split("\n")
+    assert lines[0] == "Most influential records (linearized step):"
+    assert lines[4].split("|")[1].strip() == str(OUTLIER + 1)
+    assert len(lines) == 11
+
+
+def test_influence_without_a_derivative():
+    func = FittingFunction(
+        fit_func=linear.fit_func, n=2, name="no_derivative_linear", save=False
+    )
+    data = outlier_data(linear, [1, 2])
+
+    with pytest.raises(
+        FittingFunctionRuntimeError,
+        match='^"no_derivative_linear" has no a derivative$',
+    ):
+        influence(fit(data, func), data, func)
+
+
+def test_influence_fail_for_no_x():
+    data = outlier_data(linear, [1, 2])
+    result = fit(data, linear)
+    data.x_column = None
+
+    with pytest.raises(FittingError, match="^Cannot fit data without x values$"):
+        influence(result, data, linear)
+
+
+def test_influence_fail_for_no_y():
+    data = outlier_data(linear, [1, 2])
+    result = fit(data, linear)
+    data.y_column = None
+
+    with pytest.raises(FittingError, match="^Cannot fit data without y values$"):
+        influence(result, data, linear)
+
+
+def test_influence_without_errors():
+    data = outlier_data(linear, [1, 2])
+    data = FittingData(
+        OrderedDict(x=data.x, y=data.y), x_column="x", y_column="y", search=False
+    )
+    result = fit(data, linear)
+
+    influence_result = influence(result, data, linear)
+
+    assert np.sum(influence_result.leverages) == pytest.approx(2)
+    assert influence_result.most_influential(1)[0] == OUTLIER
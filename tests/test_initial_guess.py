@@ -0,0 +1,239 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+from pytest_cases import THIS_MODULE, parametrize_with_cases
+
+from eddington import (
+    cos,
+    exponential,
+    fit,
+    hyperbolic,
+    inverse_power,
+    normal,
+    poisson,
+    random_data,
+    sin,
+    straight_power,
+)
+from eddington.initial_guess import (
+    cos_initial_guess,
+    exponential_initial_guess,
+    hyperbolic_initial_guess,
+    inverse_power_initial_guess,
+    normal_initial_guess,
+    poisson_initial_guess,
+    sin_initial_guess,
+    straight_power_initial_guess,
+)
+
+UNEVEN_X = 10 * np.linspace(0, 1, 80) ** 1.5
+
+
+def case_exponential():
+    return dict(
+        func=exponential,
+        estimator=exponential_initial_guess,
+        a=np.array([2, 0.5, -3]),
+        x=np.linspace(0, 5, 200),
+        rel=1e-3,
+    )
+
+
+def case_exponential_decay():
+    return dict(
+        func=exponential,
+        estimator=exponential_initial_guess,
+        a=np.array([-4, -1.2, 7]),
+        x=np.linspace(-1, 4, 200),
+        rel=1e-3,
+    )
+
+
+def case_hyperbolic():
+    return dict(
+        func=hyperbolic,
+        estimator=hyperbolic_initial_guess,
+        a=np.array([3, 1.5, -2]),
+        x=np.linspace(0, 10, 20),
+        rel=1e-6,
+    )
+
+
+def case_normal():
+    return dict(
+        func=normal,
+        estimator=normal_initial_guess,
+        a=np.array([5, 1, 1.5, 2]),
+        x=np.linspace(-8, 10, 100),
+        rel=1e-2,
+    )
+
+
+def case_normal_negative_peak():
+    return dict(
+        func=normal,
+        estimator=normal_initial_guess,
+        a=np.array([-3, -2, 0.8, 1]),
+        x=np.linspace(-8, 6, 100),
+        rel=1e-2,
+    )
+
+
+def case_poisson():
+    return dict(
+        func=poisson,
+        estimator=poisson_initial_guess,
+        a=np.array([50, 4, 1]),
+        x=np.arange(25, dtype=float),
+        rel=1e-2,
+    )
+
+
+def case_straight_power():
+    return dict(
+        func=straight_power,
+        estimator=straight_power_initial_guess,
+        a=np.array([2, 1, 2, -3]),
+        x=np.linspace(0, 10, 30),
+        curve_rel=0.05,
+    )
+
+
+def case_inverse_power():
+    return dict(
+        func=inverse_power,
+        estimator=inverse_power_initial_guess,
+        a=np.array([3, 1, 2, 0.5]),
+        x=np.linspace(0, 10, 30),
+        curve_rel=0.05,
+    )
+
+
+def case_sin():
+    return dict(
+        func=sin,
+        estimator=sin_initial_guess,
+        a=np.array([3, 2.5, 0.7, 1]),
+        x=np.linspace(0, 10, 60),
+        rel=2e-2,
+    )
+
+
+def case_sin_unevenly_sampled():
+    return dict(
+        func=sin,
+        estimator=sin_initial_guess,
+        a=np.array([2, 1.3, -1.2, -4]),
+        x=UNEVEN_X,
+        rel=2e-2,
+    )
+
+
+def case_cos():
+    return dict(
+        func=cos,
+        estimator=cos_initial_guess,
+        a=np.array([0.5, 4, 2.1, 3]),
+        x=np.linspace(-5, 5, 60),
+        rel=2e-2,
+    )
+
+
+def case_cos_unevenly_sampled():
+    return dict(
+        func=cos,
+        estimator=cos_initial_guess,
+        a=np.array([5, 0.8, -0.3, 0]),
+        x=UNEVEN_X,
+        rel=2e-2,
+        abs=2e-2,
+    )
+
+
+@parametrize_with_cases(argnames="case", cases=THIS_MODULE)
+def test_initial_guess_estimation(case):
+    y = case["func"](case["a"], case["x"])
+
+    guess = case["estimator"](case["x"], y)
+
+    if "rel" in case:
+        assert guess == pytest.approx(case["a"], rel=case["rel"], abs=case.get("abs"))
+    else:
+        residuals = case["func"](guess, case["x"]) - y
+        assert np.sqrt(np.mean(np.square(residuals))) <= case["curve_rel"] * np.std(y)
+
+
+@parametrize_with_cases(argnames="case", cases=THIS_MODULE)
+def test_initial_guess_of_fitting_function(case):
+    y = case["func"](case["a"], case["x"])
+
+    assert case["func"].initial_guess(case["x"], y) == pytest.approx(
+        case["estimator"](case["x"], y)
+    )
+
+
+@parametrize_with_cases(argnames="case", cases=THIS_MODULE)
+def test_initial_guess_is_independent_of_order(case):
+    y = case["func"](case["a"], case["x"])
+    permutation = np.random.permutation(case["x"].size)
+
+    assert case["estimator"](case["x"][permutation], y[permutation]) == pytest.approx(
+        case["estimator"](case["x"], y)
+    )
+
+
+@pytest.mark.parametrize("estimator", [sin_initial_guess, cos_initial_guess])
+@pytest.mark.parametrize("x", [np.array([2.0]), np.full(10, 2.0)])
+def test_periodic_initial_guess_of_single_x_value_is_not_finite(estimator, x):
+    assert not np.all(np.isfinite(estimator(x, np.arange(x.size, dtype=float))))
+
+
+@pytest.mark.parametrize("func", [sin, cos])
+def test_periodic_fit_of_single_x_value_starts_from_default_initial_guess(func):
+    data = random_data(func, x=np.full(10, 2.0), a=np.array([3, 2.5, 0.7, 1]))
+
+    assert fit(data, func).a0 == pytest.approx(np.ones(4))
+
+
+@pytest.mark.parametrize(
+    ["func", "estimator"],
+    [
+        (straight_power, straight_power_initial_guess),
+        (inverse_power, inverse_power_initial_guess),
+    ],
+)
+def test_power_initial_guess_of_large_data_has_bounded_memory(func, estimator):
+    a = np.array([2, 0.5, 1.5, 1])
+    x = np.linspace(1, 10, 10**5)
+    y = func(a, x)
+
+    tracemalloc.start()
+    guess = estimator(x, y)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    residuals = func(guess, x) - y
+    assert np.sqrt(np.mean(np.square(residuals))) <= 0.05 * np.std(y)
+    assert peak < 50 * x.nbytes
+
+
+def test_initial_guess_of_flat_data_is_not_finite():
+    x = np.linspace(0, 10, 30)
+
+    assert not np.all(np.isfinite(normal_initial_guess(x, np.ones_like(x))))
+
+
+@pytest.mark.parametrize(
+    ["func", "a", "x"],
+    [
+        (sin, np.array([3, 2.5, 0.7, 1]), np.linspace(0, 10, 60)),
+        (cos, np.array([5, 0.8, -0.3, 0]), UNEVEN_X),
+    ],
+)
+def test_periodic_fit_converges_without_initial_guess(func, a, x):
+    data = random_data(func, x=x, a=a, xsigma=0.01, ysigma=0.05)
+
+    result = fit(data, func)
+
+    assert result.a == pytest.approx(a, rel=5e-2, abs=5e-2)
@@ -0,0 +1,195 @@
+import time
+
+import numpy as np
+import pytest
+
+from eddington import (
+    FittingData,
+    exponential,
+    fit,
+    fitting_function,
+    linear,
+    parabolic,
+    sin,
+)
+from eddington.exceptions import FittingError
+from eddington.fitting_functions_registry import FittingFunctionsRegistry
+from eddington.model_selection import fit_all
+
+A = np.array([2, 0.8, -1])
+FUNCTIONS = [linear, parabolic, exponential, sin]
+
+
+@pytest.fixture
+def exponential_data():
+    x = np.linspace(0, 3, 100)
+    generator = np.random.default_rng(0)
+    return FittingData(
+        dict(
+            x=x,
+            xerr=np.full(shape=x.size, fill_value=1e-3),
+            y=exponential(A, x) + generator.normal(scale=0.1, size=x.size),
+            yerr=np.full(shape=x.size, fill_value=0.1),
+        )
+    )
+
+
+@pytest.mark.parametrize("criterion", ["aic", "bic", "chi2_reduced"])
+def test_fit_all_ranks_by_criterion(exponential_data, criterion):
+    ranking = fit_all(exponential_data, functions=FUNCTIONS, criterion=criterion)
+
+    values = [getattr(candidate.result, criterion) for candidate in ranking.candidates]
+    assert ranking.best.func == exponential
+    assert values == sorted(values)
+    assert ranking.criterion == criterion
+
+
+def test_fit_all_results_are_the_same_as_fit(exponential_data):
+    ranking = fit_all(exponential_data, functions=FUNCTIONS)
+
+    assert len(ranking.candidates) == len(FUNCTIONS)
+    for candidate in ranking.candidates:
+        result = fit(exponential_data, candidate.func)
+        assert candidate.result.a == pytest.approx(result.a)
+        assert candidate.result.chi2 == pytest.approx(result.chi2)
+
+
+def test_fit_all_shares_selected_records(exponential_data):
+    exponential_data.records_indices = [bool(x < 2) for x in exponential_data.x]
+
+    ranking = fit_all(exponential_data, functions=[exponential])
+
+    assert ranking.best.result.degrees_of_freedom == np.sum(
+        exponential_data.x < 2
+    ) - len(A)
+    assert exponential_data.number_of_records == 100
+
+
+def test_fit_all_uses_registry_by_default(exponential_data):
+    ranking = fit_all(exponential_data)
+
+    assert {candidate.func.name for candidate in ranking.candidates} | set(
+        ranking.failures.keys()
+    ) == set(FittingFunctionsRegistry.names())
+
+
+def test_fit_all_with_workers(exponential_data):
+    serial_ranking = fit_all(exponential_data, functions=FUNCTIONS)
+    parallel_ranking = fit_all(exponential_data, functions=FUNCTIONS, workers=2)
+
+    assert [candidate.func for candidate in parallel_ranking.candidates] == [
+        candidate.func for candidate in serial_ranking.candidates
+    ]
+    for serial, parallel in zip(serial_ranking.candidates, parallel_ranking.candidates):
+        assert parallel.result.a == pytest.approx(serial.result.a)
+
+
+@fitting_function(n=2, save=False)
+def slow_sin(a, x):
+    time.sleep(0.01)
+    return a[0] * np.sin(a[1] * x)
+
+
+def test_fit_all_drops_functions_which_time_out(exponential_data):
+    ranking = fit_all(exponential_data, functions=[linear, slow_sin], timeout=0.01)
+
+    assert [candidate.func for candidate in ranking.candidates] == [linear]
+    assert ranking.failures == dict(
+        slow_sin="Fitting did not converge within 0.01 seconds"
+    )
+
+
+@pytest.fixture
+def saved_slow_sin():
+    # Functions are sent to worker processes by their names in the registry.
+    func = fitting_function(n=2, name="saved_slow_sin")(slow_sin.fit_func)
+    yield func
+    FittingFunctionsRegistry.remove(func.name)
+
+
+def test_fit_all_drops_functions_which_time_out_with_workers(
+    exponential_data, saved_slow_sin
+):
+    ranking = fit_all(
+        exponential_data, functions=[linear, saved_slow_sin], timeout=0.01, workers=2
+    )
+
+    assert [candidate.func for candidate in ranking.candidates] == [linear]
+    assert ranking.failures == dict(
+        saved_slow_sin="Fitting did not converge within 0.01 seconds"
+    )
+
+
+def test_fit_all_drops_functions_with_too_many_parameters():
+    data = FittingData(dict(x=[1, 2, 3], xerr=[0.1] * 3, y=[2, 4, 7], yerr=[0.1] * 3))
+
+    ranking = fit_all(data, functions=[linear, sin])
+
+    assert [candidate.func for candidate in ranking.candidates] == [linear]
+    assert ranking.failures == dict(sin="Not enough records")
+
+
+def test_fit_all_drops_diverged_functions(exponential_data, mocker):
+    fit_mock = mocker.patch("eddington.model_selection.fit")
+    fit_mock.return_value.chi2 = np.nan
+    fit_mock.return_value.diagnostics.timed_out = False
+
+    ranking = fit_all(exponential_data, functions=[linear])
+
+    assert ranking.candidates == []
+    assert ranking.failures == dict(linear="Diverged")
+    with pytest.raises(FittingError, match="^All candidate functions were dropped$"):
+        ranking.best  # pylint: disable=pointless-statement
+
+
+def test_fit_all_drops_functions_which_fail(exponential_data, mocker):
+    fit_mock = mocker.patch("eddington.model_selection.fit")
+    fit_mock.side_effect = FittingError("Something went wrong")
+
+    ranking = fit_all(exponential_data, functions=[linear])
+
+    assert ranking.candidates == []
+    assert ranking.failures == dict(linear="Something went wrong")
+
+
+def test_fit_all_pretty_string(exponential_data):
+    data = exponential_data.copy()
+    data.records_indices = [bool(x < 0.1) for x in data.x]
+
+    ranking = fit_all(data, functions=[linear, exponential, sin])
+
+    assert repr(ranking) == ranking.pretty_string
+    assert ranking.pretty_string.startswith("Ranked by aic:\n")
+    for column in ["Rank", "Function", "Chi squared reduced", "AIC", "BIC"]:
+        assert column in ranking.pretty_string
+    assert ranking.pretty_string.endswith(
+        "Dropped candidates:\n\tsin: Not enough records\n"
+    )
+
+
+def test_fit_all_fail_for_unknown_criterion(exponential_data):
+    with pytest.raises(
+        FittingError,
+        match=('^Unknown criterion "aicc". Should be one of aic, bic, chi2_reduced$'),
+    ):
+        fit_all(exponential_data, criterion="aicc")
+
+
+def test_fit_all_fail_for_no_x(exponential_data):
+    exponential_data.x_column = None
+
+    with pytest.raises(FittingError, match="^Cannot fit data without x values$"):
+        fit_all(exponential_data)
+
+
+def test_fit_all_fail_for_no_y(exponential_data):
+    exponential_data.y_column = None
+
+    with pytest.raises(FittingError, match="^Cannot fit data without y values$"):
+        fit_all(exponential_data)
+
+
+def test_fit_all_pretty_string_without_failures(exponential_data):
+    ranking = fit_all(exponential_data, functions=[linear])
+
+    assert "Dropped" not in ranking.pretty_string
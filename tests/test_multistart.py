@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from eddington import FittingData, fit, sin
+from eddington.exceptions import FittingError
+from eddington.multistart import multistart_fit
+
+A = np.array([3, 2.5, 0.7, 1])
+BOUNDS = [(0.5, 5), (0.1, 5), (-np.pi, np.pi), (-2, 2)]
+SEED = 1
+
+
+@pytest.fixture
+def sin_data():
+    x = np.linspace(0, 10, 100)
+    generator = np.random.default_rng(0)
+    return FittingData(
+        dict(
+            x=x,
+            xerr=np.full(shape=x.size, fill_value=1e-3),
+            y=sin(A, x) + generator.normal(scale=0.1, size=x.size),
+            yerr=np.full(shape=x.size, fill_value=0.1),
+        )
+    )
+
+
+def test_multistart_finds_global_minimum(sin_data):
+    stuck_result = fit(sin_data, sin, a0=np.array([1, 1, 0, 0]))
+
+    result = multistart_fit(sin_data, sin, bounds=BOUNDS, starts=20, seed=SEED)
+
+    assert result.best.chi2 < stuck_result.chi2
+    assert result.best.chi2_reduced == pytest.approx(1, rel=0.5)
+    assert sin(result.best.a, sin_data.x) == pytest.approx(sin(A, sin_data.x), abs=0.1)
+
+
+def test_multistart_starts_within_bounds(sin_data):
+    result = multistart_fit(sin_data, sin, bounds=BOUNDS, starts=20, seed=SEED)
+
+    lower, upper = np.array(BOUNDS).T
+    assert np.all(result.best.a0 >= lower) and np.all(result.best.a0 <= upper)
+
+
+def test_multistart_basins(sin_data):
+    result = multistart_fit(sin_data, sin, bounds=BOUNDS, starts=20, seed=SEED)
+
+    assert result.pruned == 10
+    assert sum(basin.starts for basin in result.basins) == 10
+    assert [basin.chi2 for basin in result.basins] == sorted(
+        basin.chi2 for basin in result.basins
+    )
+    assert result.basins[0].a == pytest.approx(result.best.a)
+    assert result.basins[0].chi2 == pytest.approx(result.best.chi2)
+
+
+def test_multistart_keep_all(sin_data):
+    result = multistart_fit(sin_data, sin, bounds=BOUNDS, starts=5, keep=1, seed=SEED)
+
+    assert result.pruned == 0
+    assert sum(basin.starts for basin in result.basins) == 5
+
+
+def test_multistart_is_reproducible(sin_data):
+    result1 = multistart_fit(sin_data, sin, bounds=BOUNDS, starts=10, seed=SEED)
+    result2 = multistart_fit(sin_data, sin, bounds=BOUNDS, starts=10, seed=SEED)
+
+    assert result1.best.a0 == pytest.approx(result2.best.a0)
+    assert result1.best.a == pytest.approx(result2.best.a)
+
+
+def test_multistart_with_workers(sin_data):
+    serial_result = multistart_fit(sin_data, sin, bounds=BOUNDS, starts=10, seed=SEED)
+    parallel_result = multistart_fit(
+        sin_data, sin, bounds=BOUNDS, starts=10, workers=2, seed=SEED
+    )
+
+    assert parallel_result.best.a == pytest.approx(serial_result.best.a)
+    assert len(parallel_result.basins) == len(serial_result.basins)
+
+
+def test_multistart_pretty_string(sin_data):
+    result = multistart_fit(sin_data, sin, bounds=BOUNDS, starts=4, seed=SEED)
+
+    assert repr(result) == result.pretty_string
+    assert "Chi squared" in result.pretty_string
+    assert result.pretty_string.endswith("Pruned starts: 2\n")
+
+
+def test_multistart_fail_for_wrong_bounds(sin_data):
+    with pytest.raises(FittingError, match="^Expected bounds for 4 parameters, got 2$"):
+        multistart_fit(sin_data, sin, bounds=BOUNDS[:2])
+
+
+def test_multistart_fail_for_no_starts(sin_data):
+    with pytest.raises(
+        FittingError, match="^Number of starts should be positive, got 0$"
+    ):
+        multistart_fit(sin_data, sin, bounds=BOUNDS, starts=0)
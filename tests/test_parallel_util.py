@@ -0,0 +1,35 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from eddington.parallel_util import SerialExecutor, get_executor
+
+
+def divide(a, b):
+    return a / b
+
+
+@pytest.mark.parametrize("workers", [None, 0, 1])
+def test_get_serial_executor(workers):
+    assert isinstance(get_executor(workers), SerialExecutor)
+
+
+def test_get_process_pool_executor():
+    with get_executor(2) as executor:
+        assert isinstance(executor, ProcessPoolExecutor)
+        assert executor.submit(divide, 6, b=3).result() == 2
+
+
+def test_serial_executor_result():
+    future = SerialExecutor().submit(divide, 6, b=3)
+
+    assert future.done()
+    assert future.result() == 2
+
+
+def test_serial_executor_exception():
+    future = SerialExecutor().submit(divide, 6, b=0)
+
+    assert future.done()
+    with pytest.raises(ZeroDivisionError):
+        future.result()
@@ -0,0 +1,184 @@
+import numpy as np
+import pytest
+
+from eddington import FittingData, constant, exponential, fit, linear
+from eddington.exceptions import FittingError
+from eddington.parameter_scan import chi2_scan, profile_likelihood
+
+A = np.array([2, 0.8, -1])
+
+
+@pytest.fixture
+def exponential_data():
+    x = np.linspace(0, 3, 40)
+    generator = np.random.default_rng(0)
+    return FittingData(
+        dict(
+            x=x,
+            xerr=np.full(shape=x.size, fill_value=1e-3),
+            y=exponential(A, x) + generator.normal(scale=0.2, size=x.size),
+            yerr=np.full(shape=x.size, fill_value=0.2),
+        )
+    )
+
+
+@pytest.fixture
+def linear_data():
+    x = np.arange(10.0)
+    return FittingData(
+        dict(x=x, y=linear(np.array([1, 2]), x) + 0.1 * (-1) ** np.arange(10)),
+        x_column="x",
+        y_column="y",
+        search=False,
+    )
+
+
+@pytest.fixture
+def fixed_exponential():
+    yield exponential
+    exponential.clear_fixed()
+
+
+def test_chi2_scan_at_fit_equals_fit_chi2(exponential_data):
+    result = fit(exponential_data, exponential)
+
+    scan = chi2_scan(exponential_data, exponential, [[value] for value in result.a])
+
+    assert scan.chi2.shape == (1, 1, 1)
+    assert scan.chi2[0, 0, 0] == pytest.approx(result.chi2, rel=1e-6)
+
+
+def test_chi2_scan_grid(linear_data):
+    grid = [np.linspace(0, 2, 5), np.linspace(1.5, 2.5, 3)]
+
+    scan = chi2_scan(linear_data, linear, grid)
+
+    assert scan.chi2.shape == (5, 3)
+    for i, a0 in enumerate(grid[0]):
+        for j, a1 in enumerate(grid[1]):
+            expected = np.sum(
+                (linear_data.y - linear(np.array([a0, a1]), linear_data.x)) ** 2
+            )
+            assert scan.chi2[i, j] == pytest.approx(expected)
+    np.testing.assert_equal(scan.minimum, [1, 2])
+    assert np.min(scan.delta_chi2) == 0
+
+
+def test_chi2_scan_chunks_do_not_change_result(exponential_data):
+    grid = [np.linspace(1.5, 2.5, 7), np.linspace(0.7, 0.9, 5), [-1.2, -1, -0.8]]
+
+    scan = chi2_scan(exponential_data, exponential, grid)
+    chunked_scan = chi2_scan(exponential_data, exponential, grid, chunk_size=4)
+
+    np.testing.assert_allclose(chunked_scan.chi2, scan.chi2)
+
+
+def test_chi2_scan_with_fixed_parameter(exponential_data, fixed_exponential):
+    full_scan = chi2_scan(
+        exponential_data, exponential, [np.linspace(1.5, 2.5, 7), [0.8], [-1]]
+    )
+    fixed_exponential.fix(1, 0.8)
+
+    scan = chi2_scan(
+        exponential_data, fixed_exponential, [np.linspace(1.5, 2.5, 7), [-1]]
+    )
+
+    np.testing.assert_allclose(scan.chi2[:, 0], full_scan.chi2[:, 0, 0])
+
+
+def test_chi2_scan_with_wrong_grid(linear_data):
+    with pytest.raises(FittingError, match="^Expected grid for 2 parameters, got 1$"):
+        chi2_scan(linear_data, linear, [np.linspace(0, 1, 3)])
+
+
+def test_chi2_scan_without_x(linear_data):
+    linear_data.x_column = None
+
+    with pytest.raises(FittingError, match="^Cannot fit data without x values$"):
+        chi2_scan(linear_data, linear, [[1], [2]])
+
+
+def test_chi2_scan_without_y(linear_data):
+    linear_data.y_column = None
+
+    with pytest.raises(FittingError, match="^Cannot fit data without y values$"):
+        chi2_scan(linear_data, linear, [[1], [2]])
+
+
+def test_profile_likelihood_minimum_at_fit(exponential_data):
+    result = fit(exponential_data, exponential)
+
+    profile = profile_likelihood(exponential_data, exponential, result, 1)
+
+    assert profile.values.shape == (21,)
+    assert profile.a.shape == (21, 3)
+    np.testing.assert_allclose(profile.a[:, 1], profile.values)
+    assert profile.chi2[10] == pytest.approx(result.chi2, rel=1e-6)
+    np.testing.assert_allclose(profile.a[10], result.a, rtol=1e-5)
+    assert np.all(profile.delta_chi2 >= -1e-6)
+    assert exponential.fixed == {}
+
+
+def test_profile_likelihood_interval_matches_errors(exponential_data):
+    result = fit(exponential_data, exponential)
+    sigma = result.aerr[1] / np.sqrt(result.chi2_reduced)
+
+    lower, upper = profile_likelihood(
+        exponential_data, exponential, result, 1
+    ).interval()
+
+    assert lower == pytest.approx(result.a[1] - sigma, rel=1e-2)
+    assert upper == pytest.approx(result.a[1] + sigma, rel=1e-2)
+
+
+def test_profile_likelihood_interval_not_crossed(exponential_data):
+    result = fit(exponential_data, exponential)
+
+    profile = profile_likelihood(
+        exponential_data, exponential, result, 0, points=5, width=0.1
+    )
+
+    assert np.all(np.isnan(profile.interval()))
+
+
+def test_profile_likelihood_with_values_away_from_fit(exponential_data):
+    result = fit(exponential_data, exponential)
+    values = result.a[0] + np.array([0.5, 0.3, 0.4])
+
+    profile = profile_likelihood(
+        exponential_data, exponential, result, 0, values=values
+    )
+
+    np.testing.assert_allclose(profile.values, np.sort(values))
+    assert np.all(np.diff(profile.chi2) > 0)
+    assert np.isnan(profile.interval(delta_chi2=0)[0])
+
+
+def test_profile_likelihood_with_fixed_parameter(exponential_data, fixed_exponential):
+    fixed_exponential.fix(2, -1)
+    result = fit(exponential_data, fixed_exponential)
+
+    profile = profile_likelihood(exponential_data, fixed_exponential, result, 1)
+
+    assert profile.a.shape == (21, 2)
+    assert fixed_exponential.fixed == {2: -1}
+
+
+@pytest.mark.parametrize("param_index", [-1, 3])
+def test_profile_likelihood_with_invalid_index(exponential_data, param_index):
+    result = fit(exponential_data, exponential)
+
+    with pytest.raises(
+        FittingError,
+        match=f"^Parameter index should be between 0 and 2, got {param_index}$",
+    ):
+        profile_likelihood(exponential_data, exponential, result, param_index)
+
+
+def test_profile_likelihood_without_nuisance_parameters(linear_data):
+    result = fit(linear_data, constant)
+
+    with pytest.raises(
+        FittingError, match="^Cannot profile a function without nuisance parameters$"
+    ):
+        profile_likelihood(linear_data, constant, result, 0)
@@ -0,0 +1,235 @@
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+from pytest_cases import THIS_MODULE, parametrize_with_cases
+
+from eddington import (
+    FittingData,
+    constant,
+    exponential,
+    fit,
+    fitting_function,
+    hyperbolic,
+    inverse_power,
+    linear,
+    parabolic,
+    polynomial,
+    sin,
+    straight_power,
+)
+from eddington.exceptions import FittingError
+from eddington.rescaling import polynomial_rescale
+from tests.util import assert_results_equal
+
+SHIFTS_AND_SCALES = (1.5, 2.5, -3.0, 0.5)
+INVERSE_SHIFTS_AND_SCALES = (-1.5 / 2.5, 1 / 2.5, 3.0 / 0.5, 1 / 0.5)
+X = np.linspace(1, 3, 20)
+DELTA = 1e-5
+# Conditioned fits use the derivatives, while fits without conditioning use finite
+# differences, which agree up to this relative difference.
+FIT_DELTA = 1e-3
+EPSILON = 1e-6
+
+
+def case_constant():
+    return constant, np.array([2.0])
+
+
+def case_linear():
+    return linear, np.array([1.0, -2.0])
+
+
+def case_parabolic():
+    return parabolic, np.array([1.0, -2.0, 0.5])
+
+
+def case_polynomial_5():
+    return polynomial(5), np.array([1.0, -2.0, 0.5, 0.3, -0.1, 0.02])
+
+
+def case_exponential():
+    return exponential, np.array([2.0, 0.7, -1.0])
+
+
+def case_straight_power():
+    return straight_power, np.array([2.0, 0.5, 1.5, -1.0])
+
+
+def case_inverse_power():
+    return inverse_power, np.array([2.0, 0.5, 1.5, -1.0])
+
+
+def case_hyperbolic():
+    return hyperbolic, np.array([2.0, 0.5, -1.0])
+
+
+@parametrize_with_cases(argnames="func, a", cases=THIS_MODULE)
+def test_rescaled_function_evaluates_scaled_values(func, a):
+    x_shift, x_scale, y_shift, y_scale = SHIFTS_AND_SCALES
+
+    rescaled_a, _ = func.rescale(a, *SHIFTS_AND_SCALES)
+
+    assert func(rescaled_a, (X - x_shift) / x_scale) == pytest.approx(
+        (func(a, X) - y_shift) / y_scale
+    )
+
+
+@parametrize_with_cases(argnames="func, a", cases=THIS_MODULE)
+def test_rescale_back(func, a):
+    rescaled_a, jacobian = func.rescale(a, *SHIFTS_AND_SCALES)
+
+    a_back, inverse_jacobian = func.rescale(rescaled_a, *INVERSE_SHIFTS_AND_SCALES)
+
+    assert a_back == pytest.approx(a)
+    assert inverse_jacobian @ jacobian == pytest.approx(np.eye(a.size))
+
+
+@parametrize_with_cases(argnames="func, a", cases=THIS_MODULE)
+def test_rescale_jacobian(func, a):
+    _, jacobian = func.rescale(a, *SHIFTS_AND_SCALES)
+
+    numeric_jacobian = np.stack(
+        [
+            (
+                func.rescale(a + EPSILON * step, *SHIFTS_AND_SCALES)[0]
+                - func.rescale(a - EPSILON * step, *SHIFTS_AND_SCALES)[0]
+            )
+            / (2 * EPSILON)
+            for step in np.eye(a.size)
+        ],
+        axis=1,
+    )
+    for row, numeric_row in zip(jacobian, numeric_jacobian):
+        assert row == pytest.approx(numeric_row, rel=DELTA, abs=DELTA)
+
+
+def build_data(func, a, x, with_xerr=False, with_yerr=True):
+    y = func(a, x)
+    sigma = 0.01 * (np.ptp(y) if np.ptp(y) > 0 else 1)
+    raw_data = OrderedDict(x=x)
+    if with_xerr:
+        raw_data["xerr"] = np.full(x.size, 0.01 * np.std(x))
+    raw_data["y"] = y + np.random.default_rng(0).normal(scale=sigma, size=x.size)
+    if with_yerr:
+        raw_data["yerr"] = np.full(x.size, sigma)
+    return FittingData(
+        raw_data,
+        x_column="x",
+        xerr_column="xerr" if with_xerr else None,
+        y_column="y",
+        yerr_column="yerr" if with_yerr else None,
+        search=False,
+    )
+
+
+@parametrize_with_cases(argnames="func, a", cases=THIS_MODULE)
+@pytest.mark.parametrize(
+    ["with_xerr", "with_yerr", "exact_x"],
+    [(False, True, True), (True, True, False), (False, False, True)],
+)
+def test_conditioned_fit_equals_fit(func, a, with_xerr, with_yerr, exact_x):
+    data = build_data(
+        func, a, np.linspace(0.5, 10, 50), with_xerr=with_xerr, with_yerr=with_yerr
+    )
+
+    result = fit(data, func, a0=a, condition=True, tolerance=1e-12, exact_x=exact_x)
+
+    assert_results_equal(
+        result, fit(data, func, a0=a, tolerance=1e-12, exact_x=exact_x), rel=FIT_DELTA
+    )
+    assert result.a0 == pytest.approx(a)
+    assert result.diagnostics.converged
+    assert result.diagnostics.jacobian_evaluations > 0
+
+
+@pytest.mark.parametrize(
+    ["func", "a"],
+    [(linear, np.array([1.0, -2.0])), (exponential, np.array([2.0, 0.7, -1.0]))],
+)
+def test_conditioned_fit_without_xerr_equals_fit(func, a):
+    data = build_data(func, a, np.linspace(0.5, 10, 50))
+
+    result = fit(data, func, a0=a, condition=True, tolerance=1e-12)
+
+    assert_results_equal(result, fit(data, func, a0=a, tolerance=1e-12), rel=FIT_DELTA)
+    assert result.diagnostics.converged
+
+
+def test_conditioned_fit_without_x_derivative():
+    data = build_data(parabolic, np.array([1.0, -2.0, 0.5]), np.linspace(0.5, 10, 50))
+
+    result = fit(data, parabolic, condition=True, use_x_derivative=False, exact_x=True)
+
+    assert_results_equal(
+        result, fit(data, parabolic, condition=True, exact_x=True), rel=FIT_DELTA
+    )
+    assert result.diagnostics.jacobian_evaluations > 0
+
+
+@pytest.mark.parametrize("engine", ["odr", "least_squares", "linear"])
+def test_conditioned_fit_of_badly_scaled_polynomial(engine):
+    a = np.array([1, -2, 3, -4, 5, -6, 7]) / np.power(1e4, np.arange(7))
+    data = build_data(polynomial(6), a, np.linspace(1e4, 1.1e4, 200))
+
+    result = fit(data, polynomial(6), condition=True, engine=engine)
+
+    assert result.diagnostics.converged
+    assert result.chi2_reduced == pytest.approx(1, rel=0.2)
+    assert np.all(np.abs(result.a - a) < 3 * result.aerr)
+
+
+def test_conditioned_fit_starts_from_rescaled_initial_guess():
+    a = np.array([2.0, 0.7, -1.0])
+    data = build_data(exponential, a, np.linspace(1, 3, 50))
+
+    result = fit(data, exponential, condition=True)
+
+    assert result.a0 == pytest.approx(exponential.initial_guess(data.x, data.y))
+
+
+def test_conditioned_fit_with_constant_values():
+    data = build_data(constant, np.array([2.0]), np.linspace(1, 3, 50))
+    data = FittingData(
+        OrderedDict(x=np.full(50, 2.0), y=data.y, yerr=data.yerr),
+        x_column="x",
+        y_column="y",
+        yerr_column="yerr",
+        search=False,
+    )
+
+    result = fit(data, constant, condition=True)
+
+    assert_results_equal(result, fit(data, constant), rel=FIT_DELTA)
+
+
+def test_conditioned_fit_without_rescaling_raises_error():
+    data = build_data(linear, np.array([1.0, 2.0]), X)
+
+    with pytest.raises(
+        FittingError, match='^Cannot condition "sin" since it has no rescaling$'
+    ):
+        fit(data, sin, condition=True)
+
+
+def test_conditioned_fit_with_fixed_parameters_raises_error():
+    data = build_data(linear, np.array([1.0, 2.0]), X)
+
+    @fitting_function(n=2, rescale=polynomial_rescale, save=False)
+    def fixed_linear(a, x):
+        return linear(a, x)
+
+    fixed_linear.fix(0, 1.0)
+
+    with pytest.raises(
+        FittingError,
+        match='^Cannot condition "fixed_linear" with fixed parameters$',
+    ):
+        fit(data, fixed_linear, condition=True)
+
+
+def test_conditioned_fit_with_y_covariance_raises_error():
+    data = build_data(linear, np.array([1.0, 2.0]), X)
+
+    with pytest.raises(FittingError, match="^Cannot condition data with y covariance$"):
+        fit(data, linear, condition=True, ycov=np.eye(X.size))
@@ -0,0 +1,156 @@
+import json
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+import eddington.fitting
+from eddington import FittingData, fit, linear
+from eddington.exceptions import FittingError
+from eddington.sigma_clipping import ClippedFittingResult, SigmaClip
+
+RECORDS = 50
+OUTLIERS = [5, 20, 33]
+SIGMA = 0.1
+
+
+def data_with_outliers(with_yerr=True):
+    generator = np.random.default_rng(0)
+    x = np.linspace(0, 10, RECORDS)
+    y = linear(np.array([1.0, 2.0]), x) + generator.normal(scale=SIGMA, size=RECORDS)
+    y[OUTLIERS] += [2, -3, 1.5]
+    raw_data = OrderedDict(x=x, xerr=np.full(RECORDS, 1e-10), y=y)
+    if with_yerr:
+        raw_data["yerr"] = np.full(RECORDS, SIGMA)
+        return FittingData(raw_data)
+    return FittingData(
+        raw_data, x_column="x", xerr_column="xerr", y_column="y", search=False
+    )
+
+
+def rejected_indices():
+    return [index + 1 for index in OUTLIERS]
+
+
+@pytest.mark.parametrize("with_yerr", [True, False])
+def test_clip_rejects_outliers(with_yerr):
+    data = data_with_outliers(with_yerr=with_yerr)
+
+    result = fit(data, linear, clip=SigmaClip(k=3))
+
+    assert isinstance(result, ClippedFittingResult)
+    assert result.rejected.tolist() == rejected_indices()
+    assert result.clip_iterations >= 1
+    assert [
+        i + 1 for i, selected in enumerate(data.records_indices) if not selected
+    ] == (rejected_indices())
+    assert result.a == pytest.approx(fit(data, linear).a, rel=1e-6)
+    assert result.degrees_of_freedom == RECORDS - len(OUTLIERS) - 2
+
+
+def test_clip_warm_starts_refits():
+    data = data_with_outliers()
+    first_result = fit(data, linear)
+    data.select_all_records()
+
+    result = fit(data, linear, clip=SigmaClip(k=3, max_iterations=1))
+
+    assert result.clip_iterations == 1
+    np.testing.assert_allclose(result.a0, first_result.a)
+
+
+def test_clip_without_iterations_keeps_selection():
+    data = data_with_outliers()
+
+    result = fit(data, linear, clip=SigmaClip(k=3, max_iterations=0))
+
+    assert result.rejected.tolist() == []
+    assert result.clip_iterations == 0
+    assert data.all_selected()
+
+
+def test_clip_keeps_unselected_records():
+    data = data_with_outliers()
+    data.unselect_record(1)
+    data.unselect_record(OUTLIERS[0] + 1)
+
+    result = fit(data, linear, clip=SigmaClip(k=3))
+
+    assert result.rejected.tolist() == rejected_indices()[1:]
+    assert not data.is_selected(1)
+    assert not data.is_selected(OUTLIERS[0] + 1)
+
+
+def test_clip_does_not_reject_too_many_records():
+    data = data_with_outliers()
+
+    result = fit(data, linear, clip=SigmaClip(k=1e-6))
+
+    assert result.rejected.tolist() == []
+    assert data.all_selected()
+
+
+def test_clip_with_y_covariance_raises_error():
+    data = data_with_outliers()
+
+    with pytest.raises(
+        FittingError, match="^Cannot clip records of data with y covariance$"
+    ):
+        fit(data, linear, clip=SigmaClip(), ycov=np.eye(RECORDS))
+
+
+def test_clipped_result_strings():
+    data = data_with_outliers()
+
+    result = fit(data, linear, clip=SigmaClip(k=3))
+
+    assert str(result).endswith("Rejected records: 6 21 34\n")
+    assert json.loads(result.json_string)["rejected"] == rejected_indices()
+
+
+def test_clipped_result_strings_without_rejected_records():
+    data = data_with_outliers()
+
+    result = fit(data, linear, clip=SigmaClip(k=100))
+
+    assert str(result).endswith("Rejected records: None\n")
+    assert json.loads(result.json_string)["rejected"] == []
+
+
+def test_clip_without_x_errors():
+    data = data_with_outliers()
+    data.xerr_column = None
+
+    result = fit(data, linear, clip=SigmaClip(k=3))
+
+    assert result.rejected.tolist() == rejected_indices()
+
+
+def test_clip_shares_timeout_between_refits(mocker):
+    fit_arrays = mocker.spy(eddington.fitting, "_fit_arrays")
+
+    result = fit(data_with_outliers(), linear, clip=SigmaClip(k=3), timeout=10)
+
+    timeouts = [call.kwargs["timeout"] for call in fit_arrays.call_args_list]
+    assert len(timeouts) == result.clip_iterations + 1
+    assert timeouts == sorted(timeouts, reverse=True)
+    assert timeouts[0] <= 10
+
+
+def test_clip_stops_refitting_when_timed_out(mocker):
+    fit_arrays = eddington.fitting._fit_arrays  # pylint: disable=protected-access
+
+    def timed_out_fit(**kwargs):
+        result = fit_arrays(**kwargs)
+        result.diagnostics.timed_out = True
+        return result
+
+    mocker.patch("eddington.fitting._fit_arrays", side_effect=timed_out_fit)
+    data = data_with_outliers()
+
+    result = fit(data, linear, clip=SigmaClip(k=3), timeout=10)
+
+    assert result.diagnostics.timed_out
+    assert result.clip_iterations == 0
+    assert np.size(result.rejected) == 0
+    assert data.records_indices == [True] * RECORDS
@@ -1,4 +1,5 @@
 import random
+from collections import OrderedDict
 from numbers import Number
 from typing import Any, Dict, List, Optional, Tuple
 from unittest.mock import Mock
@@ -6,7 +7,7 @@
 import numpy as np
 import pytest
 
-from eddington import fitting_function
+from eddington import FittingData, fitting_function
 from eddington.statistics import Statistics
 
 # Assertions
@@ -95,9 +96,41 @@ def assert_statistics(
     ), "Minimum value is different than expected"
 
 
+def assert_results_equal(actual, expected, rel):
+    assert actual.a == pytest.approx(expected.a, rel=rel)
+    assert actual.aerr == pytest.approx(expected.aerr, rel=rel)
+    # Compare the covariance relative to its largest value, so entries which
+    # almost cancel out do not fail the comparison.
+    acov_scale = np.max(np.abs(expected.acov))
+    for actual_row, expected_row in zip(actual.acov, expected.acov):
+        assert actual_row == pytest.approx(expected_row, rel=rel, abs=rel * acov_scale)
+    assert actual.chi2 == pytest.approx(expected.chi2, rel=rel)
+    assert actual.degrees_of_freedom == expected.degrees_of_freedom
+
+
 # Additional methods
 
 
+def exact_x_data(func, a, records=100, with_xerr=False, with_yerr=True, sigma=0.1):
+    x = np.linspace(0, 3, records)
+    y = func(np.asarray(a, dtype=float), x)
+    y += np.random.default_rng(0).normal(scale=sigma, size=records)
+    raw_data = OrderedDict(x=x)
+    if with_xerr:
+        raw_data["xerr"] = np.full(records, 1e-10)
+    raw_data["y"] = y
+    if with_yerr:
+        raw_data["yerr"] = np.full(records, sigma)
+    return FittingData(
+        raw_data,
+        x_column="x",
+        xerr_column="xerr" if with_xerr else None,
+        y_column="y",
+        yerr_column="yerr" if with_yerr else None,
+        search=False,
+    )
+
+
 def random_selected_records(
     records_num: int,
     min_selected: Optional[int] = None,